@@ -0,0 +1,247 @@
+"""
+AcroForm fill engine for participant print copies.
+
+Source PDFs that already carry form fields are filled in place with pypdf. The
+output keeps real, searchable fields, and text lands where the form expects it
+instead of where a builder point was dropped. With appearance streams generated
+it costs about the same as drawing a reportlab overlay per page
+(benchmarks/acroform.py). Layout fields that don't land on a widget are handed
+back so the caller can keep drawing them as overlays.
+"""
+import os
+import re
+from functools import lru_cache
+
+import lazy_imports as lazy
+
+CHECKED_VALUES = ("yes", "true", "1", "on", "checked")
+RADIO_FLAG = 1 << 15
+
+# Same fallbacks the overlay path uses when a layout field's own value is empty.
+LAYOUT_TYPE_DEFAULTS = {
+    "name": "legal_name",
+    "text": "legal_name",
+    "email": "legal_name",
+    "phone": "legal_name",
+    "address": "legal_name",
+    "date": "signature_date",
+    "checkbox": "signature_ack",
+    "signature": "signature_data",
+}
+
+# Slack (as a fraction of the page) when hit-testing a layout point on a widget.
+HIT_TOLERANCE = 0.01
+
+
+def _norm(name) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(name or "").lower()).strip("_")
+
+
+def _qualified_name(annot) -> str:
+    parts = []
+    node = annot
+    while node is not None:
+        if "/T" in node:
+            parts.append(str(node["/T"]))
+        parent = node.get("/Parent")
+        node = parent.get_object() if parent is not None else None
+    return ".".join(reversed(parts))
+
+
+def _inherited(annot, key):
+    node = annot
+    while node is not None:
+        if key in node:
+            return node[key]
+        parent = node.get("/Parent")
+        node = parent.get_object() if parent is not None else None
+    return None
+
+
+def scan_widgets(writer) -> list:
+    """
+    Lists every widget in the document with its qualified field name, field type,
+    1-based page and rect normalised to the layout JSON's top-left 0..1 space.
+    """
+    widgets = []
+    for page_index, page in enumerate(writer.pages, start=1):
+        annots = page.get("/Annots")
+        if not annots:
+            continue
+        box = page.mediabox
+        pw = float(box.width) or 612.0
+        ph = float(box.height) or 792.0
+        ox = float(box.left)
+        oy = float(box.bottom)
+
+        for ref in annots:
+            annot = ref.get_object()
+            if annot.get("/Subtype") != "/Widget":
+                continue
+            name = _qualified_name(annot)
+            if not name:
+                continue
+            field = annot if "/T" in annot else annot["/Parent"].get_object()
+
+            x0, y0, x1, y1 = [float(v) for v in annot.get("/Rect", [0, 0, 0, 0])]
+            on_state = ""
+            ap = annot.get("/AP")
+            if ap is not None:
+                normal = ap.get_object().get("/N")
+                if normal is not None and hasattr(normal.get_object(), "keys"):
+                    states = [k for k in normal.get_object().keys() if k != "/Off"]
+                    on_state = states[0] if states else ""
+
+            widgets.append({
+                "name": name,
+                "key": _norm(name.rsplit(".", 1)[-1]),
+                "alt": _norm(_inherited(annot, "/TU")),
+                "type": str(_inherited(annot, "/FT") or ""),
+                "flags": int(_inherited(annot, "/Ff") or 0),
+                "page": page_index,
+                "x0": (min(x0, x1) - ox) / pw,
+                "x1": (max(x0, x1) - ox) / pw,
+                "y0": 1 - (max(y0, y1) - oy) / ph,
+                "y1": 1 - (min(y0, y1) - oy) / ph,
+                "on_state": on_state,
+                "annot": annot,
+                "field": field,
+            })
+    return widgets
+
+
+def _widget_at(widgets, page, x, y):
+    for w in widgets:
+        if w["page"] != page:
+            continue
+        if (w["x0"] - HIT_TOLERANCE <= x <= w["x1"] + HIT_TOLERANCE
+                and w["y0"] - HIT_TOLERANCE <= y <= w["y1"] + HIT_TOLERANCE):
+            return w
+    return None
+
+
+def plan_fill(widgets, values, form_def, layout_fields):
+    """
+    Maps widgets to participant values.
+
+    Layout fields are matched by position first (the builder placed them on top
+    of the widget); remaining widgets are matched by name against the form
+    definition's field names and labels, then against the raw value keys.
+    Returns ({qualified_name: (value_key, ...)}, [layout fields with no widget]),
+    where the value keys are tried in order until one is non-empty.
+    """
+    assigned = {}
+    leftover = []
+
+    for field in layout_fields or []:
+        field_type = field.get("type", "")
+        value_keys = tuple(k for k in (field.get("field_name"), LAYOUT_TYPE_DEFAULTS.get(field_type)) if k)
+        widget = None
+        if field_type != "signature":
+            try:
+                widget = _widget_at(widgets, int(field.get("page", 1)), float(field.get("x", 0)), float(field.get("y", 0)))
+            except (TypeError, ValueError):
+                widget = None
+        if widget is None or widget["name"] in assigned or not value_keys:
+            leftover.append(field)
+            continue
+        assigned[widget["name"]] = value_keys
+
+    by_name = {}
+    for f in (form_def or {}).get("fields", []):
+        name = f.get("name", "")
+        if not name:
+            continue
+        by_name.setdefault(_norm(name), name)
+        by_name.setdefault(_norm(f.get("label", "")), name)
+    for key in values:
+        by_name.setdefault(_norm(key), key)
+
+    for w in widgets:
+        if w["name"] in assigned:
+            continue
+        value_key = by_name.get(w["key"]) or by_name.get(w["alt"])
+        if value_key:
+            assigned[w["name"]] = (value_key,)
+
+    return assigned, leftover
+
+
+@lru_cache(maxsize=256)
+def _has_acroform(path, mtime_ns, size) -> bool:
+    return "/AcroForm" in lazy.PdfReader(path).root_object
+
+
+def has_acroform(path) -> bool:
+    """
+    Whether the PDF at path has form fields. Cached per file version, so a form
+    with no layout and no fields doesn't parse its source on every print.
+    """
+    st = os.stat(path)
+    return _has_acroform(str(path), st.st_mtime_ns, st.st_size)
+
+
+def fill_acroform(reader, values, form_def, layout_fields):
+    """
+    Clones reader into a PdfWriter and fills any AcroForm fields in one pass.
+
+    Text and choice fields get /V plus a regenerated /N appearance stream, so the
+    stored copy prints the participant's data even in viewers and print drivers
+    that ignore NeedAppearances. Checkboxes and radio groups switch /V and /AS
+    between the appearance states the source already has.
+
+    Returns (writer, overlay_fields). When the source has no fields the writer just
+    holds its pages and every layout field comes back for overlay drawing.
+    """
+    if "/AcroForm" not in reader.root_object:
+        writer = lazy.PdfWriter()
+        for page in reader.pages:
+            writer.add_page(page)
+        return writer, list(layout_fields or [])
+
+    writer = lazy.PdfWriter(clone_from=reader)
+    widgets = scan_widgets(writer)
+    if not widgets:
+        return writer, list(layout_fields or [])
+
+    assigned, leftover = plan_fill(widgets, values, form_def, layout_fields)
+    if not assigned:
+        return writer, leftover
+
+    # Radio kids have no /T of their own, so one field name covers every option.
+    buttons = {}
+    text_by_page = {}
+    for w in widgets:
+        value_keys = assigned.get(w["name"])
+        if not value_keys:
+            continue
+        raw = next((values[k] for k in value_keys if values.get(k)), "")
+        if w["type"] == "/Btn":
+            buttons.setdefault(w["name"], (raw, []))[1].append(w)
+        elif w["type"] in ("/Tx", "/Ch"):
+            text_by_page.setdefault(w["page"], {})[w["name"]] = "" if raw is None else str(raw)
+
+    for raw, kids in buttons.values():
+        state = _button_state(raw, kids)
+        kids[0]["field"][lazy.NameObject("/V")] = lazy.NameObject(state)
+        for w in kids:
+            w["annot"][lazy.NameObject("/AS")] = lazy.NameObject(state if w["on_state"] == state else "/Off")
+
+    for page_index, fields in text_by_page.items():
+        writer.update_page_form_field_values(writer.pages[page_index - 1], fields, auto_regenerate=False)
+
+    return writer, leftover
+
+
+def _button_state(raw, kids) -> str:
+    """
+    The appearance state a button field should be in. A radio group picks the
+    option whose on-state matches the value; a checkbox is on for any CHECKED_VALUES.
+    """
+    states = {w["on_state"] for w in kids if w["on_state"]}
+    if kids[0]["flags"] & RADIO_FLAG or len(states) > 1:
+        wanted = _norm(raw)
+        return next((state for state in states if _norm(state[1:]) == wanted), "/Off")
+    if str(raw).lower() in CHECKED_VALUES and states:
+        return states.pop()
+    return "/Off"
@@ -0,0 +1,25 @@
+"""
+Repeatable benchmarks for the app's hot routes.
+
+    python -m benchmarks run [--scale small|medium|large] [--requests 200]
+    python -m benchmarks compare OLD.json NEW.json [--threshold 10]
+
+`run` builds a scratch directory holding a seeded licenses.db (seed.py) and
+links to the repo's documents, imports app.py from there, and drives the Flask
+test client against each route in ROUTES (run.py). It prints throughput and
+p50/p95/p99 latency per route, then writes the numbers to
+benchmarks/results/<time>-<commit>.json. `compare` diffs two of those files and
+exits with status 1 when a route got slower than the threshold.
+
+The dataset generator also works on its own, for load tests:
+
+    python -m benchmarks.seed --db licenses.db --scale large
+
+acroform.py times the print copy's two fill paths on a synthetic form:
+
+    python -m benchmarks.acroform [--runs 80]
+
+event_log.py compares per-line appends with the batched EventLog:
+
+    python -m benchmarks.event_log [--lines 20000]
+"""
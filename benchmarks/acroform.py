@@ -0,0 +1,113 @@
+"""
+Print-copy fill: reportlab overlay versus native AcroForm fill (acroform_fill.py).
+
+None of the shipped EF/Core PDFs have form fields, so this builds a synthetic
+form in memory: `pages` pages, each with `fields` text fields and one checkbox,
+and a layout field placed on every widget. Each run parses the source, fills it
+and writes the result, the way the print route does:
+- overlay: a reportlab canvas per page with every layout field drawn on it,
+  merged onto the page;
+- acroform: fill_acroform() writes /V (and /AS) into the widgets and
+  regenerates each text widget's appearance stream, leaving nothing to overlay.
+
+    python -m benchmarks.acroform [--runs 80] [--pages 3] [--fields 10]
+"""
+import argparse
+import statistics
+import sys
+import time
+from io import BytesIO
+
+import lazy_imports as lazy
+from acroform_fill import fill_acroform
+
+PAGE_W, PAGE_H = 612, 792
+FIELD_W, FIELD_H = 240, 18
+
+
+def build_form(pages, fields) -> tuple:
+    """(PDF bytes, layout fields, values) for the synthetic form."""
+    buf = BytesIO()
+    c = lazy.canvas.Canvas(buf, pagesize=(PAGE_W, PAGE_H))
+    layout, values = [], {}
+    for page in range(1, pages + 1):
+        c.setFont("Helvetica", 10)
+        for i in range(fields + 1):
+            name = f"p{page}_field_{i}"
+            x, y = 200, PAGE_H - 72 - i * 32
+            c.drawString(72, y + 5, name)
+            if i < fields:
+                c.acroForm.textfield(name=name, x=x, y=y, width=FIELD_W, height=FIELD_H, borderWidth=0)
+                layout.append({"page": page, "type": "text", "field_name": name,
+                               "x": (x + FIELD_W / 2) / PAGE_W, "y": 1 - (y + FIELD_H / 2) / PAGE_H})
+                values[name] = f"Bench Value {page}.{i}"
+            else:
+                c.acroForm.checkbox(name=name, x=x, y=y, size=FIELD_H, borderWidth=0)
+                layout.append({"page": page, "type": "checkbox", "field_name": name,
+                               "x": (x + FIELD_H / 2) / PAGE_W, "y": 1 - (y + FIELD_H / 2) / PAGE_H})
+                values[name] = "yes"
+        c.showPage()
+    c.save()
+    return buf.getvalue(), layout, values
+
+
+def fill_overlay(data, layout, values) -> bytes:
+    writer = lazy.PdfWriter()
+    for page_index, page in enumerate(lazy.PdfReader(BytesIO(data)).pages, start=1):
+        packet = BytesIO()
+        c = lazy.canvas.Canvas(packet, pagesize=(PAGE_W, PAGE_H))
+        c.setFont("Helvetica", 10)
+        for field in layout:
+            if field["page"] != page_index:
+                continue
+            x, y = field["x"] * PAGE_W, (1 - field["y"]) * PAGE_H
+            if field["type"] == "checkbox":
+                c.drawString(x, y, "X")
+            else:
+                c.drawString(x, y, values[field["field_name"]])
+        c.showPage()
+        c.save()
+        packet.seek(0)
+        page.merge_page(lazy.PdfReader(packet).pages[0])
+        writer.add_page(page)
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def fill_native(data, layout, values) -> bytes:
+    writer, leftover = fill_acroform(lazy.PdfReader(BytesIO(data)), values, {}, layout)
+    if leftover:
+        raise AssertionError(f"{len(leftover)} layout fields missed their widget")
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def measure(fn, runs, *args) -> dict:
+    fn(*args)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 1), "min_ms": round(min(samples), 1)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.acroform", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=80)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--fields", type=int, default=10, help="text fields per page (plus one checkbox)")
+    args = parser.parse_args(argv)
+
+    data, layout, values = build_form(args.pages, args.fields)
+    print(f"{args.pages} pages, {len(layout)} fields, {len(data)} bytes, {args.runs} runs")
+    for name, fn in (("overlay path", fill_overlay), ("AcroForm fill", fill_native)):
+        r = measure(fn, args.runs, data, layout, values)
+        print(f"  {name:<14} median {r['median_ms']:.1f} ms, min {r['min_ms']:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Event log writes: open/append/close per line versus EventLog.log() (event_log.py).
+
+`lines` lines are written from `threads` threads, first by opening the file in
+append mode for each line, as the kiosk events used to be, then through one
+EventLog, whose background thread writes them in batches.
+
+    python -m benchmarks.event_log [--lines 20000] [--threads 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from event_log import EventLog
+
+LINE = "Dignity screen shown: 2026-01-01 00:00:00 UTC"
+
+
+def run_threads(fn, lines, threads) -> float:
+    per_thread = lines // threads
+    workers = [threading.Thread(target=lambda: [fn() for _ in range(per_thread)]) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.event_log", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        direct_path = os.path.join(tmp, "direct.txt")
+
+        def direct():
+            with open(direct_path, "a") as f:
+                f.write(LINE + "\n")
+
+        elapsed = run_threads(direct, args.lines, args.threads)
+        print(f"open/append/close per line  {elapsed * 1e6 / args.lines:8.1f} us/line")
+
+        events = EventLog(os.path.join(tmp, "buffered.txt"))
+        elapsed = run_threads(lambda: events.log(LINE), args.lines, args.threads)
+        events.close()
+        with open(events.path) as f:
+            written = sum(1 for _ in f)
+        print(f"EventLog.log()              {elapsed * 1e6 / args.lines:8.1f} us/line  "
+              f"({written} lines written, {events.stats()})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
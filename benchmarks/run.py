@@ -0,0 +1,270 @@
+"""
+Drives the Flask test client against the hot routes and records latency.
+
+Each route gets `warmup` unmeasured requests, then `requests` measured ones, run
+back to back from one thread. The URLs rotate over seeded participants and
+forms. Throughput is measured requests / the time spent in them, which
+includes consuming streamed bodies. A response with status >= 400 counts as an
+error.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+# Scratch-directory name -> zip it is unpacked from when the repo has no copy.
+SOURCE_DIRS = {
+    "EF_v2.2": "Essential_Forms_Independent_Living_Universal.zip",
+    "Core-v2.1": "Core_Docs-NILPF_Store.zip",
+}
+LINKED_DIRS = ("states", "static")
+
+
+def _form_post_data(ctx, form_name):
+    data = {field["name"]: "Bench Value" for field in ctx.form_fields(form_name)}
+    data.update(signature_name="Bench Signer", signature_date="2026-01-01", signature_ack="on", signature_data="")
+    return data
+
+
+# name -> (method, url(ctx, rng), form data(ctx, form_name) or None)
+ROUTES = {
+    "participants": ("GET", lambda ctx, rng: "/participants", None),
+    "participant_workflow": ("GET", lambda ctx, rng: f"/participant-workflow/{rng.choice(ctx.pids)}", None),
+    "participant_form_get": ("GET", lambda ctx, rng: f"/participant-form/{rng.choice(ctx.pids)}/{quote(rng.choice(ctx.forms))}", None),
+    "participant_form_post": ("POST", lambda ctx, rng: f"/participant-form/{rng.choice(ctx.pids)}/{quote(rng.choice(ctx.forms))}", _form_post_data),
+    "participant_form_print": ("GET", lambda ctx, rng: f"/participant-form-print/{rng.choice(ctx.pids)}/{quote(rng.choice(ctx.forms))}", None),
+    "notes": ("GET", lambda ctx, rng: f"/notes?session_id={ctx.session_id}", None),
+    "source_pdf": ("GET", lambda ctx, rng: f"/source-pdf/{quote(rng.choice(ctx.pdf_forms))}", None),
+    "documents": ("GET", lambda ctx, rng: f"/documents?session_id={ctx.session_id}", None),
+}
+
+
+class Context:
+    def __init__(self, pids, forms, form_fields, session_id):
+        from registries import SOURCE_PDFS
+
+        self.pids = pids
+        self.forms = forms
+        self.form_fields = form_fields
+        self.session_id = session_id
+        # Workflow forms whose source PDF is on disk; the rest are 404s on /source-pdf.
+        self.pdf_forms = [f for f in forms if SOURCE_PDFS.resolve_any(f)] or forms
+
+
+def prepare_workdir(work) -> Path:
+    """Scratch directory with the documents the routes read; nothing in the repo is written."""
+    work = Path(work)
+    work.mkdir(parents=True, exist_ok=True)
+    for name, archive in SOURCE_DIRS.items():
+        target = work / name
+        if target.exists():
+            continue
+        if (REPO_ROOT / name).is_dir():
+            target.symlink_to(REPO_ROOT / name)
+        elif (REPO_ROOT / archive).is_file():
+            with zipfile.ZipFile(REPO_ROOT / archive) as zf:
+                zf.extractall(target)
+    for name in LINKED_DIRS:
+        if not (work / name).exists() and (REPO_ROOT / name).is_dir():
+            (work / name).symlink_to(REPO_ROOT / name)
+    return work
+
+
+def enter_workdir(work):
+    """Makes the scratch directory the working directory, with the repo's modules importable."""
+    os.chdir(work)
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+
+def load_app(work):
+    """Imports app.py and preloads it against the (already seeded) scratch directory."""
+    # Every /participants request trips the N+1 warning; keep the request log quiet.
+    os.environ.setdefault("REQUEST_LOG_LEVEL", "ERROR")
+    import app as app_module
+
+    app_module.app.root_path = str(work)
+    app_module.preload(app_module.app)
+    return app_module.app
+
+
+def percentile(sorted_ms, pct) -> float:
+    if len(sorted_ms) == 1:
+        return sorted_ms[0]
+    return statistics.quantiles(sorted_ms, n=100, method="inclusive")[pct - 1]
+
+
+def bench_route(client, ctx, name, requests, warmup, seed) -> dict:
+    method, url_for, data_for = ROUTES[name]
+    rng = random.Random(seed)
+    calls = []
+    for _ in range(warmup + requests):
+        url = url_for(ctx, rng)
+        form_name = unquote(url.rsplit("/", 1)[-1])
+        calls.append((url, data_for(ctx, form_name) if data_for else None))
+
+    errors = 0
+    samples = []
+    for i, (url, data) in enumerate(calls):
+        start = time.perf_counter()
+        resp = client.open(url, method=method, data=data)
+        resp.get_data()
+        resp.close()
+        elapsed = time.perf_counter() - start
+        if i < warmup:
+            continue
+        samples.append(elapsed * 1000)
+        if resp.status_code >= 400:
+            errors += 1
+
+    samples.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / (sum(samples) / 1000), 1),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def git_revision() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, timeout=30).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown", "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def run(args) -> dict:
+    from benchmarks.seed import SCALES, app_forms, seed, seed_layouts
+
+    work = Path(args.work) if args.work else Path(tempfile.mkdtemp(prefix="nilpf-bench-"))
+    prepare_workdir(work)
+    enter_workdir(work)
+    from database import DB_PATH
+    from instrumentation import connect_db
+    from registries import LAYOUT_DIR
+
+    forms, form_fields = app_forms()
+
+    sizes = dict(SCALES[args.scale])
+    for key in sizes:
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+    dataset = {"scale": args.scale, "seed": args.seed, **sizes}
+    # Seed before loading the app: preload() creates the schema in an empty licenses.db.
+    db = work / DB_PATH
+    if not db.exists():
+        dataset["load"] = seed(db, forms, form_fields, seed=args.seed, **sizes)
+        dataset["layouts"] = seed_layouts(work / LAYOUT_DIR, forms, form_fields, seed=args.seed)
+    else:
+        dataset["reused"] = str(db)
+    app = load_app(work)
+
+    conn = connect_db(str(db))
+    pids = [row[0] for row in conn.execute("SELECT id FROM participants ORDER BY id")]
+    session_id = conn.execute("SELECT session_id FROM licenses ORDER BY id LIMIT 1").fetchone()[0]
+    conn.close()
+    ctx = Context(pids, forms, form_fields, session_id)
+
+    names = args.routes or list(ROUTES)
+    client = app.test_client()
+    routes = {}
+    for name in names:
+        routes[name] = bench_route(client, ctx, name, args.requests, args.warmup, args.seed)
+        r = routes[name]
+        print(f"{name:<24} {r['throughput_rps']:>8.1f} req/s  p50 {r['p50_ms']:>8.2f}  p95 {r['p95_ms']:>8.2f}  "
+              f"p99 {r['p99_ms']:>8.2f} ms  errors {r['errors']}", flush=True)
+
+    if not args.work and not args.keep:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(work, ignore_errors=True)
+    else:
+        print(f"scratch directory: {work}")
+
+    return {
+        **git_revision(),
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dataset": dataset,
+        "requests_per_route": args.requests,
+        "routes": routes,
+    }
+
+
+def compare(old, new, threshold) -> int:
+    """Prints per-route changes; returns the number of routes whose p50 or p95 rose by more than threshold %."""
+    regressions = 0
+    print(f"{'route':<24} {'p50 ms':>19} {'p95 ms':>19} {'req/s':>17}")
+    for name, after in new["routes"].items():
+        before = old["routes"].get(name)
+        if before is None:
+            print(f"{name:<24} (new)")
+            continue
+        cells, slower = [], False
+        for key in ("p50_ms", "p95_ms", "throughput_rps"):
+            change = 100.0 * (after[key] - before[key]) / before[key] if before[key] else 0.0
+            cells.append(f"{before[key]:>7.1f} -> {after[key]:<7.1f}{change:+5.0f}%")
+            if key != "throughput_rps" and change > threshold:
+                slower = True
+        regressions += slower
+        print(f"{name:<24} {'  '.join(cells)}{'  SLOWER' if slower else ''}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Hot-route benchmarks.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_run = sub.add_parser("run", help="seed a scratch database and benchmark the routes")
+    p_run.add_argument("--scale", choices=["small", "medium", "large"], default="small", help="dataset preset (benchmarks/seed.py)")
+    p_run.add_argument("--licenses", type=int)
+    p_run.add_argument("--participants", type=int)
+    p_run.add_argument("--notes", type=int)
+    p_run.add_argument("--seed", type=int, default=1)
+    p_run.add_argument("--requests", type=int, default=200, help="measured requests per route")
+    p_run.add_argument("--warmup", type=int, default=10)
+    p_run.add_argument("--routes", nargs="*", choices=list(ROUTES), help="default: all")
+    p_run.add_argument("--work", help="scratch directory to use (and keep); a seeded licenses.db there is reused")
+    p_run.add_argument("--keep", action="store_true", help="keep the temporary scratch directory")
+    p_run.add_argument("--out", help=f"result file (default: {RESULTS_DIR.relative_to(REPO_ROOT)}/<time>-<commit>.json)")
+    p_cmp = sub.add_parser("compare", help="compare two result files")
+    p_cmp.add_argument("old")
+    p_cmp.add_argument("new")
+    p_cmp.add_argument("--threshold", type=float, default=10.0, help="percent slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    # run() changes into the scratch directory; paths given on the command line are relative to here.
+    for attr in ("work", "out"):
+        if getattr(args, attr, None):
+            setattr(args, attr, str(Path(getattr(args, attr)).resolve()))
+
+    if args.cmd == "compare":
+        old, new = (json.loads(Path(p).read_text(encoding="utf-8")) for p in (args.old, args.new))
+        return 1 if compare(old, new, args.threshold) else 0
+
+    result = run(args)
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{time.strftime('%Y%m%dT%H%M%S')}-{result['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=1) + "\n", encoding="utf-8")
+    print(f"results: {out}")
+    return 0
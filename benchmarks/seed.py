@@ -0,0 +1,459 @@
+"""
+Synthetic licenses.db for benchmarks and load tests.
+
+seed() creates the production schema (including the tables and columns that
+only exist in deployed databases, such as participant_form_data and the
+participant demographics) and fills it from one seeded random.Random, so the
+same arguments always produce the same database. Every participant is assigned
+every workflow form. A share of the forms are completed, with a value for each
+field of the form's definition, and most completed forms are signed with a
+real PNG signature data URL like the signature pad posts.
+
+The load is built for speed:
+- journal, fsync and locking are off (PRAGMAs below) while loading;
+- rows are generated lazily and inserted with one executemany() per table,
+  all in one transaction;
+- indexes, the notes FTS index and the incident rollups are built once,
+  after the notes are in, by the same ensure_* functions the app runs.
+
+    python -m benchmarks.seed --db licenses.db --scale large [--seed 1] [--layouts form_builder_layouts]
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import sqlite3
+import struct
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from incident_rollups import ensure_rollup_schema
+from notes_store import ensure_notes_schema
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS licenses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TEXT NOT NULL,
+        session_id TEXT NOT NULL UNIQUE,
+        payer_email TEXT,
+        payer_name TEXT,
+        property_address TEXT,
+        property_state TEXT,
+        license_key TEXT,
+        product_sku TEXT,
+        transaction_id TEXT,
+        price_paid TEXT
+    );
+    CREATE TABLE IF NOT EXISTS participants (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        legal_name TEXT,
+        preferred_name TEXT,
+        dob TEXT,
+        gender TEXT,
+        phone TEXT,
+        email TEXT,
+        address TEXT,
+        city TEXT,
+        state TEXT,
+        zip_code TEXT,
+        emergency_contact_name TEXT,
+        emergency_contact_phone TEXT,
+        move_in_date TEXT,
+        room_unit TEXT,
+        created_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS participant_forms (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        participant_id TEXT NOT NULL,
+        form_name TEXT NOT NULL,
+        is_complete INTEGER NOT NULL DEFAULT 0,
+        completed_at TEXT,
+        created_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS participant_form_data (
+        participant_id TEXT,
+        form_name TEXT,
+        field_name TEXT,
+        field_value TEXT,
+        updated_at TEXT,
+        UNIQUE(participant_id, form_name, field_name)
+    );
+    CREATE TABLE IF NOT EXISTS participant_notes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        participant_name TEXT NOT NULL,
+        staff_name TEXT,
+        note_text TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        participant_id TEXT,
+        incident_type TEXT
+    );
+"""
+
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA locking_mode = EXCLUSIVE",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",
+)
+
+# Row counts per preset; --licenses/--participants/--notes override them.
+SCALES = {
+    "small": {"licenses": 50, "participants": 200, "notes": 20_000},
+    "medium": {"licenses": 1_000, "participants": 5_000, "notes": 500_000},
+    "large": {"licenses": 5_000, "participants": 20_000, "notes": 2_000_000},
+}
+
+STATES = (
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS",
+    "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC",
+    "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+)
+FIRST_NAMES = ("James", "Maria", "Robert", "Linda", "Michael", "Patricia", "David", "Barbara", "Daniel", "Angela",
+               "Thomas", "Rosa", "Kevin", "Denise", "Marcus", "Tamika", "Luis", "Carol", "Andre", "Janet")
+LAST_NAMES = ("Smith", "Johnson", "Garcia", "Williams", "Brown", "Jones", "Miller", "Davis", "Rodriguez", "Wilson",
+              "Martinez", "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "White", "Harris", "Clark", "Lewis")
+STREETS = ("Main St", "Oak Ave", "Maple Dr", "Cedar Ln", "Pine St", "Elm St", "Lakeview Rd", "Washington Ave")
+CITIES = ("Springfield", "Riverside", "Fairview", "Greenville", "Madison", "Georgetown", "Salem", "Clinton")
+STAFF = ("J. Ortiz", "K. Lee", "M. Brooks", "S. Patel", "D. Nguyen", "R. Hall", "T. Young", "A. King")
+# (incident type, weight): most notes are routine status updates.
+INCIDENT_TYPES = (
+    ("General Status", 55), ("Behavioral Concern", 8), ("Mental Status Observation", 6),
+    ("Fighting / Aggression", 2), ("Verbal Conflict", 6), ("Intoxication / Suspected Alcohol", 3),
+    ("Fall / Found Down", 2), ("Missing / Elopement", 1), ("Noncompliance with Program Rules", 8),
+    ("Property Damage", 2), ("Visitor Issue", 4), ("Other", 3),
+)
+NOTE_WORDS = ("resident", "reported", "calm", "room", "staff", "checked", "visitor", "kitchen", "medication",
+              "declined", "agreed", "curfew", "house", "meeting", "quiet", "noise", "complaint", "resolved",
+              "appointment", "laundry", "chores", "transport", "doctor", "family", "call", "rent", "payment")
+SKUS = ("FIRST_PROPERTY", "ADDITIONAL_PROPERTY", "PROPERTY_MONTHLY")
+
+NOW = datetime(2026, 1, 1)
+
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _phone(rng):
+    return f"555-{rng.randrange(100, 1000)}-{rng.randrange(1000, 10000)}"
+
+
+def _date(rng, start, days):
+    return (start + timedelta(days=rng.randrange(days))).strftime("%Y-%m-%d")
+
+
+def _png(width, height, pixels) -> bytes:
+    """Greyscale + alpha PNG; pixels is a bytearray of width * height * 2."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    stride = width * 2
+    raw = b"".join(b"\x00" + bytes(pixels[y * stride:(y + 1) * stride]) for y in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 4, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b""))
+
+
+def signature_data_url(rng, width=400, height=100) -> str:
+    """A few pen strokes on a transparent canvas, as data:image/png;base64,..."""
+    pixels = bytearray(width * height * 2)
+    for _ in range(rng.randrange(2, 5)):
+        x, y = rng.uniform(10, width * 0.3), rng.uniform(height * 0.3, height * 0.7)
+        dx, dy = rng.uniform(1.0, 2.5), 0.0
+        for _ in range(rng.randrange(80, 220)):
+            dy = max(-3.0, min(3.0, dy + rng.uniform(-0.8, 0.8)))
+            x, y = x + dx, min(height - 3.0, max(2.0, y + dy))
+            if x >= width - 3:
+                break
+            for py in (int(y), int(y) + 1):
+                for px in (int(x), int(x) + 1):
+                    pixels[(py * width + px) * 2 + 1] = 255
+    return "data:image/png;base64," + base64.b64encode(_png(width, height, pixels)).decode("ascii")
+
+
+class _Values:
+    """Pools of field values; picking from a list is several times cheaper than building each value."""
+
+    def __init__(self, rng):
+        self.random = rng.random
+        self.names = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+        self.dates = [(NOW - timedelta(days=d)).strftime("%Y-%m-%d") for d in range(1, 731)]
+        self.phones = [_phone(rng) for _ in range(1000)]
+        self.emails = [f"{rng.choice(FIRST_NAMES).lower()}{n}@example.com" for n in range(1000)]
+        self.texts = [
+            " ".join(rng.choice(NOTE_WORDS) for _ in range(rng.randrange(5, 40))).capitalize() + "."
+            for _ in range(4096)
+        ]
+
+    def pick(self, pool):
+        return pool[int(self.random() * len(pool))]
+
+    def field(self, field):
+        kind = field.get("type")
+        if kind == "date":
+            return self.pick(self.dates)
+        if kind == "textarea":
+            return self.pick(self.texts)
+        name = field.get("name", "")
+        if "phone" in name:
+            return self.pick(self.phones)
+        if "email" in name:
+            return self.pick(self.emails)
+        return self.pick(self.names)
+
+
+def seed(db_path, forms, form_fields, licenses=50, participants=200, notes=20000,
+         completed=0.6, signed=0.8, seed=1, log=None) -> dict:
+    """
+    Builds a new database at db_path. forms is the list of form names every
+    participant is assigned; form_fields(form_name) gives the fields stored for a
+    completed one. Returns the row counts and the time each step took.
+    """
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists")
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    stats = {}
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    for pragma in LOAD_PRAGMAS:
+        conn.execute(pragma)
+    conn.executescript(SCHEMA)
+
+    def step(name, fn):
+        started = time.perf_counter()
+        rows = fn()
+        seconds = round(time.perf_counter() - started, 2)
+        if rows is not None:
+            stats[name] = rows
+        stats[f"{name}_seconds"] = seconds
+        log(f"{name:<24} {rows if rows is not None else '':>10} {seconds:8.2f}s")
+
+    conn.execute("BEGIN")
+
+    def load_licenses():
+        def rows():
+            for i in range(licenses):
+                state = STATES[i % len(STATES)] if i < len(STATES) else rng.choice(STATES)
+                yield (
+                    (NOW - timedelta(seconds=rng.randrange(730 * 86400))).isoformat(),
+                    f"bench-{i:06d}",
+                    f"owner{i}@example.com",
+                    _name(rng),
+                    f"{rng.randrange(100, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}",
+                    state,
+                    f"NILPF-{state}-BENCH{i:06d}",
+                    rng.choice(SKUS),
+                    f"TX{seed}{i:08d}",
+                    "1.00",
+                )
+        conn.executemany(
+            """
+            INSERT INTO licenses (created_at, session_id, payer_email, payer_name, property_address,
+                                  property_state, license_key, product_sku, transaction_id, price_paid)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows(),
+        )
+        return licenses
+
+    names = []
+
+    def load_participants():
+        def rows():
+            for i in range(participants):
+                legal = _name(rng)
+                names.append(legal)
+                yield (
+                    legal,
+                    legal.split()[0] if rng.random() < 0.3 else "",
+                    _date(rng, datetime(1950, 1, 1), 365 * 50),
+                    rng.choice(("Male", "Female", "")),
+                    _phone(rng),
+                    f"p{i}@example.com",
+                    f"{rng.randrange(100, 9999)} {rng.choice(STREETS)}",
+                    rng.choice(CITIES),
+                    rng.choice(STATES),
+                    f"{rng.randrange(10000, 99999)}",
+                    _name(rng),
+                    _phone(rng),
+                    _date(rng, NOW - timedelta(days=730), 730),
+                    f"{rng.randrange(1, 4)}{rng.randrange(1, 20):02d}",
+                    NOW.isoformat(),
+                )
+        conn.executemany(
+            """
+            INSERT INTO participants (legal_name, preferred_name, dob, gender, phone, email, address, city, state,
+                                      zip_code, emergency_contact_name, emergency_contact_phone, move_in_date,
+                                      room_unit, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows(),
+        )
+        return participants
+
+    step("licenses", load_licenses)
+    step("participants", load_participants)
+
+    # Which forms each participant finished, decided up front so both tables agree.
+    done = [[rng.random() < completed for _ in forms] for _ in range(participants)]
+    fields = {form_name: form_fields(form_name) for form_name in forms}
+    signatures = [signature_data_url(rng) for _ in range(64)]
+    stamp = NOW.isoformat()
+    pool = _Values(rng)
+
+    def load_forms():
+        conn.executemany(
+            "INSERT INTO participant_forms (participant_id, form_name, is_complete, completed_at, created_at) VALUES (?, ?, ?, ?, ?)",
+            (
+                (str(pid), form_name, int(finished), stamp if finished else None, stamp)
+                for pid, row in enumerate(done, 1)
+                for form_name, finished in zip(forms, row)
+            ),
+        )
+        return participants * len(forms)
+
+    def load_form_data():
+        count = 0
+
+        def rows():
+            nonlocal count
+            for pid, row in enumerate(done, 1):
+                for form_name, finished in zip(forms, row):
+                    if not finished:
+                        continue
+                    values = {field["name"]: pool.field(field) for field in fields[form_name]}
+                    if pool.random() < signed:
+                        signed_on = pool.pick(pool.dates)
+                        values.update(
+                            signature_name=names[pid - 1],
+                            signature_date=signed_on,
+                            signature_ack="yes",
+                            signature_data=pool.pick(signatures),
+                            signed_at=f"{signed_on} 12:00:00 UTC",
+                        )
+                    for field_name, value in values.items():
+                        count += 1
+                        yield (str(pid), form_name, field_name, value, stamp)
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO participant_form_data (participant_id, form_name, field_name, field_value, updated_at) VALUES (?, ?, ?, ?, ?)",
+            rows(),
+        )
+        return count
+
+    def load_notes():
+        texts, n_texts = pool.texts, len(pool.texts)
+        types = [name for name, weight in INCIDENT_TYPES for _ in range(weight)]
+        pid_text = [str(pid) for pid in range(participants + 1)]
+        clock = [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in range(86400)]
+        start = int((NOW - timedelta(days=365) - datetime(1970, 1, 1)).total_seconds())
+        days = {}
+        step_seconds = 2 * 365 * 86400 / max(notes, 1)
+        random_ = rng.random
+
+        def rows():
+            t = float(start)
+            for _ in range(notes):
+                # Chronological, like the live table; participants with low ids get more notes.
+                t += random_() * step_seconds
+                pid = int(participants * random_() ** 2) + 1
+                secs = int(t)
+                day = days.get(secs // 86400)
+                if day is None:
+                    day = days[secs // 86400] = time.strftime("%Y-%m-%d ", time.gmtime(secs))
+                yield (
+                    names[pid - 1],
+                    STAFF[int(random_() * len(STAFF))],
+                    texts[int(random_() * n_texts)],
+                    day + clock[secs % 86400],
+                    pid_text[pid],
+                    types[int(random_() * len(types))],
+                )
+
+        conn.executemany(
+            """
+            INSERT INTO participant_notes (participant_name, staff_name, note_text, created_at, participant_id, incident_type)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            rows(),
+        )
+        return notes
+
+    step("participant_forms", load_forms)
+    step("participant_form_data", load_form_data)
+    if participants:
+        step("notes", load_notes)
+    conn.execute("COMMIT")
+
+    # Indexes, FTS and rollups in one pass each over the loaded notes.
+    step("notes_indexes_and_fts", lambda: ensure_notes_schema(conn))
+    step("incident_rollups", lambda: ensure_rollup_schema(conn))
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.close()
+    stats["bytes"] = os.path.getsize(db_path)
+    return stats
+
+
+def seed_layouts(layout_dir, forms, form_fields, seed=1) -> int:
+    """One form builder layout per form: its fields stacked down page 1."""
+    rng = random.Random(seed)
+    layout_dir = Path(layout_dir)
+    layout_dir.mkdir(parents=True, exist_ok=True)
+    for form_name in forms:
+        fields = [
+            {"page": 1, "type": "text", "field_name": field["name"], "x": 0.12, "y": 0.15 + 0.06 * i, "width": 0.4}
+            for i, field in enumerate(form_fields(form_name))
+        ]
+        fields.append({"page": 1, "type": "signature", "field_name": "signature_data", "x": 0.12, "y": 0.85, "width": 0.3})
+        fields.append({"page": 1, "type": "text", "field_name": "signature_date", "x": 0.6, "y": 0.87, "width": 0.2 + rng.random() / 10})
+        (layout_dir / f"{form_name}.json").write_text(json.dumps(fields), encoding="utf-8")
+    return len(forms)
+
+
+def app_forms():
+    """(workflow form names, form_fields) from the app's form catalog (participant_forms.py)."""
+    from participant_forms import get_form_definition, get_grouped_participant_forms
+
+    forms = [f["form_name"] for group in get_grouped_participant_forms().values() for f in group]
+    return forms, lambda form_name: get_form_definition(form_name)["fields"]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.seed", description="Generate a synthetic licenses.db.")
+    parser.add_argument("--db", default="licenses.db")
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--licenses", type=int)
+    parser.add_argument("--participants", type=int)
+    parser.add_argument("--notes", type=int)
+    parser.add_argument("--completed", type=float, default=0.6, help="share of assigned forms that are completed")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--layouts", help="also write one form builder layout per form into this directory")
+    parser.add_argument("--force", action="store_true", help="replace an existing database")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.db):
+        if not args.force:
+            print(f"{args.db} exists; pass --force to replace it", file=sys.stderr)
+            return 1
+        os.remove(args.db)
+
+    sizes = dict(SCALES[args.scale])
+    for key in sizes:
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+
+    forms, form_fields = app_forms()
+    started = time.perf_counter()
+    seed(args.db, forms, form_fields, completed=args.completed, seed=args.seed, log=print, **sizes)
+    if args.layouts:
+        seed_layouts(args.layouts, forms, form_fields, seed=args.seed)
+    print(f"{args.db}: {os.path.getsize(args.db) / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
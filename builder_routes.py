@@ -0,0 +1,733 @@
+"""
+The form builder: place fields over an uploaded image or PDF and save the
+layout that the print route fills in (layout_registry.py).
+"""
+from flask import Blueprint, redirect, render_template_string, request, session
+
+from registries import LAYOUTS, LAYOUT_DIR, get_source_pdf_url
+
+bp = Blueprint("builder", __name__)
+
+
+@bp.route("/form-builder", methods=["GET", "POST"])
+def form_builder():
+    from pathlib import Path
+
+    session_id = session.get("licensed_session_id") or request.args.get("session_id") or "public_builder"
+
+    image_dir = Path("static/uploads/images")
+    doc_dir = Path("static/uploads/documents")
+
+    image_dir.mkdir(parents=True, exist_ok=True)
+    doc_dir.mkdir(parents=True, exist_ok=True)
+
+    Path(LAYOUT_DIR).mkdir(parents=True, exist_ok=True)
+
+    if request.method == "POST":
+        return redirect("/documents?tab=builder")
+
+    current_doc_value = request.args.get("pdf", "").strip()
+    current_source = ""
+    current_image = ""
+    if current_doc_value:
+        if "|" in current_doc_value:
+            current_source, current_image = current_doc_value.split("|", 1)
+            current_source = Path(current_source).name.strip()
+            current_image = Path(current_image).name.strip()
+            current_doc_value = f"{current_source}|{current_image}"
+        else:
+            current_image = Path(current_doc_value).name
+            current_doc_value = current_image
+
+    source_pdf_url = get_source_pdf_url(current_doc_value) if current_doc_value else ""
+    current_path = None
+    current_image_url = source_pdf_url
+    current_ext = Path(current_image).suffix.lower() if current_image else ""
+    current_is_image = False
+    current_is_pdf = current_ext == ".pdf"
+
+    initial_fields = LAYOUTS.get(current_image) if current_image else []
+
+    form_options = []
+    seen = set()
+
+    source_groups = [
+        ("Essential Forms (EF v2.2)", Path("EF_v2.2")),
+        ("Core Docs (Core v2.1)", Path("Core-v2.1")),
+    ]
+
+    def pretty_label(filename: str) -> str:
+        import re as _re
+        name = Path(filename).stem
+        name = _re.sub(r"[\ud800-\udfff]", "", name)
+        name = "".join(ch for ch in name if ch.isprintable())
+        name = name.replace("_", " ").replace("-", " ")
+        name = _re.sub(r"^\d+[ ._-]*", "", name)
+        name = _re.sub(r"\bv\d+(?:\.\d+)?\b", "", name, flags=_re.I)
+        name = _re.sub(r"\s+", " ", name).strip()
+        return name or "Unnamed Form"
+
+    for group_label, folder in source_groups:
+        items = []
+        if folder.exists():
+            for fp in sorted(folder.glob("*.pdf")):
+                fname = fp.name
+                if fname in seen:
+                    continue
+                seen.add(fname)
+                items.append({
+                    "value": f"{folder.name}|{fname}",
+                    "label": pretty_label(fname),
+                })
+        if items:
+            form_options.append({
+                "group": group_label,
+                "items": items,
+            })
+
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>Custom Form App</title>
+        <style>
+          * { box-sizing: border-box; }
+          body { margin: 0; font-family: Arial, sans-serif; background: #f4f6f8; color: #111; }
+          .wrap { max-width: 1180px; margin: 0 auto; padding: 20px; }
+          .card { background: #fff; border: 2px solid #111; border-radius: 18px; padding: 18px; margin-bottom: 16px; }
+          .toolbar { display: flex; gap: 10px; flex-wrap: wrap; margin-top: 12px; }
+          .toolbtn, .btn {
+            display: inline-block;
+            text-decoration: none;
+            border: 2px solid #111;
+            background: #fff;
+            color: #111;
+            padding: 10px 14px;
+            border-radius: 12px;
+            font-weight: 700;
+            cursor: pointer;
+          }
+          .toolbtn.active, .btn.primary { background: #111; color: #fff; }
+          .note { font-size: 14px; color: #444; margin: 8px 0 0 0; }
+          .stage-wrap {
+            background: #fff;
+            border: 2px solid #111;
+            border-radius: 18px;
+            padding: 14px;
+            overflow: auto;
+          }
+          .stage {
+            position: relative;
+            display: inline-block;
+            max-width: 100%;
+            border: 1px solid #ccc;
+            background: #fafafa;
+            min-height: 300px;
+          }
+          .stage img {
+            display: block;
+            max-width: 100%;
+            height: auto;
+          }
+          .placeholder {
+            width: 800px;
+            max-width: 100%;
+            min-height: 500px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            padding: 30px;
+            text-align: center;
+            color: #666;
+          }
+          .pdf-pages {
+            width: 100%;
+            max-width: 1000px;
+            margin: 0 auto;
+          }
+          .pdf-page-wrap {
+            position: relative;
+            width: fit-content;
+            margin: 0 auto 22px auto;
+            background: #fff;
+            box-shadow: 0 2px 10px rgba(0,0,0,.08);
+          }
+          .pdf-page-wrap.active-tool {
+            outline: 3px solid #111;
+            outline-offset: 4px;
+            cursor: crosshair;
+          }
+          .pdf-page-label {
+            font-size: 13px;
+            font-weight: 700;
+            color: #333;
+            margin: 0 0 6px 0;
+          }
+          .pdf-canvas {
+            display: block;
+            max-width: 100%;
+            height: auto;
+            background: #fff;
+          }
+          .marker {
+            position: absolute;
+            transform: translate(-50%, -50%);
+            background: rgba(255,255,255,.92);
+            border: 2px solid #111;
+            border-radius: 10px;
+            padding: 4px 8px;
+            font-size: 13px;
+            font-weight: 700;
+            white-space: nowrap;
+            cursor: pointer;
+            z-index: 20;
+          }
+          .marker small {
+            font-size: 11px;
+            font-weight: 700;
+            color: #444;
+            margin-left: 6px;
+          }
+          .row { display: flex; gap: 10px; flex-wrap: wrap; align-items: center; }
+          input[type=file] { padding: 10px; border: 2px solid #111; border-radius: 12px; background: #fff; }
+          .status { margin-top: 10px; font-size: 14px; font-weight: 700; }
+        </style>
+      </head>
+      <body>
+        <div class="wrap">
+          <div class="card">
+            <h1 style="margin:0 0 8px 0;">Custom Form App</h1>
+            <p style="margin:0 0 10px 0;">Simple version: upload a page image, click a tool, then click the image to place the field.</p>
+
+<div style="margin:12px 0;">
+  <select id="doc-selector" style="width:100%;padding:10px;border:2px solid #111;border-radius:10px;">
+    <option value="">Select Form</option>
+    {% for section in form_options %}
+      <optgroup label="{{ section.group }}">
+        {% for item in section["items"] %}
+          <option value="{{ item.value }}" {% if current_doc_value == item.value %}selected{% endif %}>{{ item.label }}</option>
+        {% endfor %}
+      </optgroup>
+    {% endfor %}
+  </select>
+</div>
+
+<script>
+const d = document.getElementById("doc-selector");
+if (d) {
+  d.addEventListener("change", () => {
+    if (d.value) {
+      window.location = "/form-builder?pdf=" + encodeURIComponent(d.value);
+    }
+  });
+}
+</script>
+
+            <form method="POST" enctype="multipart/form-data" class="row">
+              <input type="file" name="form_image" accept=".png,.jpg,.jpeg,.webp,.pdf" disabled style="display:none;">
+              <button class="btn primary" type="submit">Upload Page Image</button>
+              <a class="btn" href="/documents?tab=dashboard">Back to Dashboard</a>
+            </form>
+
+            <div class="toolbar">
+              <button type="button" class="toolbtn" data-tool="name">Text</button>
+              <button type="button" class="toolbtn" data-tool="checkbox">Checkmark</button>
+              <button type="button" class="toolbtn" data-tool="realcheckbox">Checkbox</button>
+                            <button type="button" class="toolbtn" data-tool="date">Date</button>
+              <button type="button" class="toolbtn" data-tool="signature">Signature</button>
+              <button type="button" class="toolbtn" id="snapToggle">Snap: OFF</button>
+              <button type="button" class="toolbtn" id="clearLast">Delete Last</button>
+              <button type="button" class="btn primary" id="saveLayout">Save Layout</button>
+<button type="button" class="btn" id="autoSuggest">Auto-Suggest Fields</button>
+            </div>
+
+            <p class="note">Images place directly on the builder. PDFs now render page-by-page inside the app so fields can save with the correct page number. Only images and PDFs are supported. PDFs render page-by-page for accurate field placement.</p>
+            <div class="status" id="status"></div>
+          </div>
+
+          <div class="stage-wrap">
+            <div class="stage" id="stage">
+              {% if current_image_url and current_is_image %}
+                <img id="docImage" src="{{ current_image_url }}" alt="Uploaded form page">
+              {% elif current_image_url and current_is_pdf %}
+                <div id="pdfPages" class="pdf-pages"></div>
+              {% elif current_image_url %}
+                <div class="placeholder" id="docImage">Unsupported file type. Please upload a PNG, JPG, WEBP, or PDF.</div>
+              {% else %}
+                <div class="placeholder" id="docImage">Upload a page image, PDF, or document first, then choose Checkbox, Date, or Signature.</div>
+              {% endif %}
+            </div>
+          </div>
+        </div>
+
+        {% if current_is_pdf and current_image_url %}
+        <script type="module">
+          import * as pdfjsLib from "https://cdn.jsdelivr.net/npm/pdfjs-dist@5.4.530/build/pdf.min.mjs";
+
+          pdfjsLib.GlobalWorkerOptions.workerSrc = "https://cdn.jsdelivr.net/npm/pdfjs-dist@5.4.530/build/pdf.worker.min.mjs";
+
+          const stage = document.getElementById("stage");
+          const pdfPages = document.getElementById("pdfPages");
+          const statusEl = document.getElementById("status");
+          const toolButtons = document.querySelectorAll(".toolbtn[data-tool]");
+          const clearLastBtn = document.getElementById("clearLast");
+          const saveBtn = document.getElementById("saveLayout");
+
+const autoBtn = document.getElementById("autoSuggest");
+
+function detectFieldType(text) {
+  const t = text.toLowerCase();
+
+  if (t.includes("signature")) return "signature";
+  if (t.includes("date")) return "date";
+  if (t.includes("name")) return "name";
+  if (t.includes("phone")) return "phone";
+  if (t.includes("email")) return "email";
+  if (t.includes("address")) return "address";
+
+  return null;
+}
+
+async function autoSuggestFields(pdf) {
+  setStatus("Scanning PDF for fields...");
+
+  for (let pageNum = 1; pageNum <= pdf.numPages; pageNum++) {
+    const page = await pdf.getPage(pageNum);
+    const textContent = await page.getTextContent();
+
+    const viewport = page.getViewport({ scale: 1.35 });
+
+    textContent.items.forEach(item => {
+      const rawText = item.str.trim();
+      if (rawText.length > 10) return;
+
+      const fieldType = detectFieldType(rawText);
+      if (!fieldType) return;
+
+      const tx = item.transform[4];
+      const ty = item.transform[5];
+
+      const x = (tx + 35) / viewport.width;
+      const y = 1 - (ty / viewport.height);
+
+      fields.push({
+        page: pageNum,
+        type: fieldType,
+        x: Number(x.toFixed(6)),
+        y: Number(y.toFixed(6)),
+        width: 0.2
+      });
+    });
+  }
+
+  renderFields();
+  setStatus("Auto-suggest complete. Adjust fields if needed.");
+}
+
+if (autoBtn) {
+  autoBtn.addEventListener("click", async () => {
+    const loadingTask = pdfjsLib.getDocument(pdfUrl);
+    const pdf = await loadingTask.promise;
+    await autoSuggestFields(pdf);
+  });
+}
+
+
+          let selectedTool = "";
+          let snapEnabled = false;
+          let fields = {{ initial_fields|tojson }};
+          const pdfUrl = {{ current_image_url|tojson }};
+
+          function markerText(type) {
+            if (type === "name" || type === "text") return "Text";
+            if (type === "email") return "Email";
+            if (type === "phone") return "Phone";
+            if (type === "address") return "Address";
+            if (type === "checkbox") return "✓";
+            if (type === "date") return "Date";
+            if (type === "signature") return "Signature";
+            return type;
+          }
+
+          function setStatus(msg) {
+            statusEl.textContent = msg || "";
+          }
+
+          function renderFields() {
+            document.querySelectorAll(".marker").forEach(el => el.remove());
+
+            fields.forEach((field, index) => {
+              const wrap = document.querySelector('.pdf-page-wrap[data-page="' + field.page + '"]');
+              if (!wrap) return;
+
+              const el = document.createElement("div");
+              el.className = "marker";
+              el.style.left = (field.x * 100) + "%";
+              el.style.top = (field.y * 100) + "%";
+              if (field.type === "checkbox") {
+                el.style.width = "18px";
+                el.style.minWidth = "18px";
+                el.style.padding = "1px 3px";
+                el.style.borderRadius = "999px";
+                el.style.fontSize = "12px";
+                el.style.lineHeight = "12px";
+                el.innerHTML = "✓";
+              } else {
+                el.style.width = ((field.width || 0.18) * 100) + "%";
+                el.innerHTML = markerText(field.type) + '<small>P' + field.page + '</small>';
+              }
+              el.title = "Double-click to delete";
+              el.onclick = (e) => {
+                e.preventDefault();
+                e.stopPropagation();
+              };
+              el.ondblclick = (e) => {
+                e.preventDefault();
+                e.stopPropagation();
+                fields.splice(index, 1);
+                renderFields();
+                setStatus("Field removed.");
+              };
+              wrap.appendChild(el);
+            });
+          }
+
+          function syncActiveToolView() {
+            document.querySelectorAll(".pdf-page-wrap").forEach(el => {
+              if (selectedTool) el.classList.add("active-tool");
+              else el.classList.remove("active-tool");
+            });
+          }
+
+          async function renderPdf() {
+            pdfPages.innerHTML = "";
+            setStatus("Rendering PDF pages...");
+
+            const loadingTask = pdfjsLib.getDocument(pdfUrl);
+            const pdf = await loadingTask.promise;
+
+            for (let pageNum = 1; pageNum <= pdf.numPages; pageNum++) {
+              const page = await pdf.getPage(pageNum);
+              const viewport = page.getViewport({ scale: 1.35 });
+
+              const wrap = document.createElement("div");
+              wrap.className = "pdf-page-wrap";
+              wrap.dataset.page = String(pageNum);
+
+              const label = document.createElement("div");
+              label.className = "pdf-page-label";
+              label.textContent = "Page " + pageNum + " of " + pdf.numPages;
+
+              const canvas = document.createElement("canvas");
+              canvas.className = "pdf-canvas";
+              canvas.width = viewport.width;
+              canvas.height = viewport.height;
+              canvas.dataset.page = String(pageNum);
+
+              wrap.appendChild(label);
+              wrap.appendChild(canvas);
+              pdfPages.appendChild(wrap);
+
+              await page.render({
+                canvasContext: canvas.getContext("2d"),
+                viewport
+              }).promise;
+
+              let clickLocked = false;
+let toolTimeout = null;
+
+              wrap.addEventListener("click", (e) => {
+                if (clickLocked) return;
+                clickLocked = true;
+
+                // 1 second click delay
+                setTimeout(() => { clickLocked = false; }, 1000);
+
+                // reset 5-second tool auto-off timer
+                if (toolTimeout) clearTimeout(toolTimeout);
+                toolTimeout = setTimeout(() => {
+                  selectedTool = "";
+                  toolButtons.forEach(b => b.classList.remove("active"));
+                  syncActiveToolView();
+                  setStatus("Tool auto-turned off.");
+                }, 5000);
+                if (!selectedTool) {
+                  setStatus("Choose Checkbox, Date, or Signature first.");
+                  return;
+                }
+
+                const rect = canvas.getBoundingClientRect();
+                if (e.clientX < rect.left || e.clientX > rect.right || e.clientY < rect.top || e.clientY > rect.bottom) {
+                  return;
+                }
+
+                let x = (e.clientX - rect.left) / rect.width;
+                let y = (e.clientY - rect.top) / rect.height;
+
+                if (selectedTool === "checkbox") {
+                  x = x - 0.005;
+                  y = y + 0.010;
+
+                  // snap to consistent rows
+                  if (snapEnabled) {
+                  y = Math.round(y * 28) / 28;
+                }
+                }
+
+                const defaultFieldName =
+                  selectedTool === "name" ? "legal_name" :
+                  selectedTool === "date" ? "signature_date" :
+                  selectedTool === "signature" ? "signature_data" :
+                  selectedTool === "checkbox" ? "signature_ack" :
+                  selectedTool;
+
+                const defaultWidth =
+                  selectedTool === "signature" ? 0.55 :
+                  selectedTool === "name" ? 0.45 :
+                  selectedTool === "date" ? 0.28 :
+                  selectedTool === "checkbox" ? 0.08 :
+                  0.30;
+
+                fields.push({
+                  page: pageNum,
+                  type: selectedTool,
+                  field_name: defaultFieldName + "_" + fields.length,
+                  x: Number(x.toFixed(6)),
+                  y: Number(y.toFixed(6)),
+                  width: Number(defaultWidth.toFixed(6))
+                });
+
+                renderFields();
+                selectedTool = "";
+                toolButtons.forEach(b => b.classList.remove("active"));
+                syncActiveToolView();
+                setStatus("Field placed on page " + pageNum + ".");
+              });
+            }
+
+            renderFields();
+            syncActiveToolView();
+            setStatus("PDF ready. Choose a tool, then click the correct page.");
+          }
+
+          
+          const snapBtn = document.getElementById("snapToggle");
+          if (snapBtn) {
+            snapBtn.addEventListener("click", () => {
+              snapEnabled = !snapEnabled;
+              snapBtn.textContent = snapEnabled ? "Snap: ON" : "Snap: OFF";
+              setStatus("Snap " + (snapEnabled ? "enabled." : "disabled."));
+            });
+          }
+toolButtons.forEach(btn => {
+            btn.addEventListener("click", () => {
+              selectedTool = btn.dataset.tool;
+              toolButtons.forEach(b => b.classList.remove("active"));
+              btn.classList.add("active");
+              syncActiveToolView();
+              setStatus(selectedTool + " selected. Click the correct PDF page.");
+            });
+          });
+
+          clearLastBtn.addEventListener("click", () => {
+            if (!fields.length) {
+              setStatus("No fields to remove.");
+              return;
+            }
+            fields.pop();
+            renderFields();
+            setStatus("Last field removed.");
+          });
+
+          saveBtn.addEventListener("click", async () => {
+            const img = {{ current_image|tojson }} || "";
+            if (!img) {
+              setStatus("Upload a page, PDF, or document first.");
+              return;
+            }
+
+            const res = await fetch("/form-builder/save", {
+              method: "POST",
+              headers: { "Content-Type": "application/json" },
+              body: JSON.stringify({ img, fields })
+            });
+
+            const data = await res.json().catch(() => ({}));
+            if (res.ok) {
+              setStatus(data.message || "Layout saved.");
+
+              // AUTO LOAD NEXT FORM
+              const selector = document.getElementById("doc-selector");
+              if (selector && selector.selectedIndex >= 0) {
+                const nextIndex = selector.selectedIndex + 1;
+                if (nextIndex < selector.options.length) {
+                  const nextValue = selector.options[nextIndex].value;
+                  if (nextValue) {
+                    setTimeout(() => {
+                      window.location = "/form-builder?pdf=" + encodeURIComponent(nextValue);
+                    }, 600);
+                  }
+                } else {
+                  setStatus("All forms completed.");
+                }
+              }
+
+            } else {
+              setStatus(data.error || "Save failed.");
+            }
+          });
+
+          renderPdf().catch(err => {
+            console.error(err);
+            setStatus("PDF render failed: " + (err && err.message ? err.message : String(err)));
+          });
+        </script>
+        {% else %}
+        <script>
+          const stage = document.getElementById("stage");
+          const docImage = document.getElementById("docImage");
+          const statusEl = document.getElementById("status");
+          const toolButtons = document.querySelectorAll(".toolbtn[data-tool]");
+          const clearLastBtn = document.getElementById("clearLast");
+          const saveBtn = document.getElementById("saveLayout");
+
+          let selectedTool = "";
+          let snapEnabled = false;
+          let fields = {{ initial_fields|tojson }};
+
+          function markerText(type) {
+            if (type === "name" || type === "text") return "Text";\n            if (type === "email") return "Email";\n            if (type === "phone") return "Phone";\n            if (type === "address") return "Address";\n            if (type === "checkbox") return "✓";
+            if (type === "date") return "Date";
+            if (type === "signature") return "Signature";
+            return type;
+          }
+
+          function setStatus(msg) {
+            statusEl.textContent = msg || "";
+          }
+
+          function renderFields() {
+            document.querySelectorAll(".marker").forEach(el => el.remove());
+
+            fields.forEach((field, index) => {
+              const el = document.createElement("div");
+              el.className = "marker";
+              el.style.left = (field.x * 100) + "%";
+              el.style.top = (field.y * 100) + "%";
+              el.textContent = markerText(field.type);
+              el.title = "Double-click to delete";
+              el.ondblclick = () => {
+                fields.splice(index, 1);
+                renderFields();
+                setStatus("Field removed.");
+              };
+              stage.appendChild(el);
+            });
+          }
+
+          
+          const snapBtn = document.getElementById("snapToggle");
+          if (snapBtn) {
+            snapBtn.addEventListener("click", () => {
+              snapEnabled = !snapEnabled;
+              snapBtn.textContent = snapEnabled ? "Snap: ON" : "Snap: OFF";
+              setStatus("Snap " + (snapEnabled ? "enabled." : "disabled."));
+            });
+          }
+toolButtons.forEach(btn => {
+            btn.addEventListener("click", () => {
+              selectedTool = btn.dataset.tool;
+              toolButtons.forEach(b => b.classList.remove("active"));
+              btn.classList.add("active");
+              setStatus(selectedTool + " selected. Now click the page.");
+            });
+          });
+
+          clearLastBtn.addEventListener("click", () => {
+            if (!fields.length) {
+              setStatus("No fields to remove.");
+              return;
+            }
+            fields.pop();
+            renderFields();
+            setStatus("Last field removed.");
+          });
+
+          stage.addEventListener("click", (e) => {
+            if (!selectedTool) {
+              setStatus("Choose Checkbox, Date, or Signature first.");
+              return;
+            }
+
+            if (!docImage || !docImage.getBoundingClientRect) {
+              setStatus("Upload a page, PDF, or document first.");
+              return;
+            }
+
+            const rect = docImage.getBoundingClientRect();
+            if (e.clientX < rect.left || e.clientX > rect.right || e.clientY < rect.top || e.clientY > rect.bottom) {
+              return;
+            }
+
+            const x = (e.clientX - rect.left) / rect.width;
+            const y = (e.clientY - rect.top) / rect.height;
+
+            fields.push({
+              page: 1,
+              type: selectedTool,
+              x: Number(x.toFixed(6)),
+              y: Number(y.toFixed(6))
+            });
+
+            renderFields();
+            toolButtons.forEach(b => b.classList.remove("active"));
+            setStatus("Field placed.");
+          });
+
+          saveBtn.addEventListener("click", async () => {
+            const img = {{ current_image|tojson }} || "";
+            if (!img) {
+              setStatus("Upload a page, PDF, or document first.");
+              return;
+            }
+
+            const res = await fetch("/form-builder/save", {
+              method: "POST",
+              headers: { "Content-Type": "application/json" },
+              body: JSON.stringify({ img, fields })
+            });
+
+            const data = await res.json().catch(() => ({}));
+            if (res.ok) {
+              setStatus(data.message || "Layout saved.");
+            } else {
+              setStatus(data.error || "Save failed.");
+            }
+          });
+
+          renderFields();
+        </script>
+        {% endif %}
+      </body>
+    </html>
+    """, current_image=current_image, current_doc_value=current_doc_value, current_image_url=current_image_url, current_is_image=current_is_image, current_is_pdf=current_is_pdf, initial_fields=initial_fields, form_options=form_options)
+
+
+@bp.route("/form-builder/save", methods=["POST"])
+def form_builder_save():
+    session_id = session.get("licensed_session_id") or request.args.get("session_id")
+
+    payload = request.get_json(silent=True) or {}
+    img = (payload.get("img") or "").strip()
+    fields = payload.get("fields") or []
+
+    if not img:
+        return {"error": "Missing image name."}, 400
+
+    if not isinstance(fields, list):
+        return {"error": "Fields must be a list."}, 400
+
+    out = LAYOUTS.save(img, fields)
+    return {"ok": True, "message": f"Layout saved to {out.name}."}
@@ -0,0 +1,260 @@
+"""
+Certificate of Registration renderer.
+
+Everything on the certificate except the licensee's fields (border, titles,
+boilerplate paragraph, status line, seal, signature block, copyright line) is
+drawn once per process into a template page. Its content stream is then replayed
+into each certificate, and only the per-license fields are drawn on top.
+
+Batch mode renders a certificate for every row in licenses into the stamped
+document cache (see license_stamps.py) using a process pool:
+
+    python certificate_render.py batch [--db licenses.db] [--out stamped_docs] [--workers N]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+import lazy_imports as lazy
+from lazy_imports import inch, letter
+from license_stamps import STAMP_DIR, LicenseStamps, license_fields
+
+# Bump when the certificate layout changes so cached certificates are redrawn.
+CERTIFICATE_VERSION = "2"
+
+WIDTH, HEIGHT = letter
+MARGIN = 0.6 * inch
+
+PARAGRAPH = ("Operating in alignment with dignity-centered standards of autonomy, structural clarity, "
+             "and sustainable housing governance. This registration is site-specific and non-transferable.")
+
+ADDRESS_TOP = HEIGHT - 2.25*inch - 0.45*inch - 0.40*inch - 0.35*inch
+FOOTER_TOP = MARGIN + 1.70*inch
+
+
+def wrap_address(addr: str) -> list:
+    """Naive 62-column wrap, at most 3 lines."""
+    if len(addr) <= 62:
+        return [addr]
+    lines = []
+    while len(addr) > 62:
+        cut = addr.rfind(" ", 0, 62)
+        if cut == -1:
+            cut = 62
+        lines.append(addr[:cut].strip())
+        addr = addr[cut:].strip()
+    if addr:
+        lines.append(addr)
+    return lines[:3]
+
+
+def issued_display(issued_raw: str) -> str:
+    # created_at is stored as an ISO string; trim microseconds if present
+    # Example: 2026-03-02T13:44:21.773103
+    try:
+        return issued_raw.replace("Z", "").split(".")[0].replace("T", " ")
+    except Exception:
+        return issued_raw or "Unknown"
+
+
+def draw_background(c, address_lines: int):
+    """Static layer. The paragraph sits below the address, so it depends on how many lines that wraps to."""
+    width, height = WIDTH, HEIGHT
+    margin = MARGIN
+
+    # Border
+    c.setLineWidth(2)
+    c.rect(margin, margin, width - 2*margin, height - 2*margin)
+
+    # Title
+    c.setFont("Helvetica-Bold", 22)
+    c.drawCentredString(width/2, height - 1.25*inch, "NILPF CERTIFICATE OF REGISTRATION")
+
+    c.setFont("Helvetica", 13)
+    c.drawCentredString(width/2, height - 1.55*inch, "National Independent Living Program Framework (NILPF)")
+
+    # Core statement
+    c.setFont("Helvetica-Oblique", 12)
+    c.drawCentredString(width/2, height - 2.25*inch, "This certifies that")
+    c.drawCentredString(width/2, height - 2.25*inch - 0.85*inch, "is registered for the licensed business location:")
+
+    # Descriptive paragraph
+    y = ADDRESS_TOP - address_lines*0.22*inch - 0.10*inch
+    c.setFont("Helvetica", 11)
+    lines = []
+    line = []
+    for w in PARAGRAPH.split():
+        if len(" ".join(line + [w])) > 90:
+            lines.append(" ".join(line))
+            line = [w]
+        else:
+            line.append(w)
+    if line:
+        lines.append(" ".join(line))
+    for pline in lines[:4]:
+        c.drawString(margin + 0.35*inch, y, pline)
+        y -= 0.20*inch
+
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(margin + 0.35*inch, FOOTER_TOP - 0.50*inch, "Status:  Active")
+
+    # Vector seal (no image file needed)
+    from reportlab.lib import colors
+
+    seal_x = width/2
+    seal_y = height/2 - 0.3*inch
+    outer_r = 0.85*inch
+    inner_r = 0.68*inch
+
+    gold = colors.Color(0.78, 0.63, 0.19)
+    dark = colors.Color(0.30, 0.24, 0.05)
+    c.setStrokeColor(gold)
+    c.setFillColor(colors.white)
+    c.setLineWidth(3)
+    c.circle(seal_x, seal_y, outer_r, stroke=1, fill=0)
+    c.setStrokeColor(dark)
+    c.setLineWidth(2)
+    c.circle(seal_x, seal_y, inner_r, stroke=1, fill=0)
+
+    c.setFont("Helvetica-Bold", 12)
+    for dx, dy in [(0, outer_r-10), (outer_r-10, 0), (0, -(outer_r-10)), (-(outer_r-10), 0)]:
+        c.drawCentredString(seal_x+dx, seal_y+dy-4, "★")
+
+    c.setFont("Helvetica-Bold", 10)
+    c.drawCentredString(seal_x, seal_y + 12, "PEARLZZ LLC")
+    c.setFont("Helvetica-Bold", 16)
+    c.drawCentredString(seal_x, seal_y - 6, "NILPF")
+    c.setFont("Helvetica", 9)
+    c.drawCentredString(seal_x, seal_y - 22, "OFFICIAL SEAL • 2026")
+
+    # Signature block (right)
+    sig_x = width - margin - 3.1*inch
+    sig_y = margin + 1.55*inch
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(sig_x, sig_y, "PEARLZZ")
+    c.setFont("Helvetica", 10)
+    c.drawString(sig_x, sig_y - 0.25*inch, "Founder, NILPF")
+    c.drawString(sig_x, sig_y - 0.45*inch, "Pearlzz LLC")
+
+    # Final copyright line
+    c.setFont("Helvetica-Oblique", 9)
+    c.drawCentredString(width/2, margin + 0.55*inch, "© 2026 Pearlzz LLC. All Rights Reserved.")
+
+
+@lru_cache(maxsize=4)
+def background_template(address_lines: int) -> tuple:
+    """
+    (fonts, content stream) of the static layer, rendered once per process and
+    address height. fonts lists base font names in /F1, /F2 ... order; reportlab
+    may pick extra ones itself (ZapfDingbats for the seal's stars).
+    """
+    buf = BytesIO()
+    c = lazy.canvas.Canvas(buf, pagesize=letter, pageCompression=0)
+    draw_background(c, address_lines)
+    c.showPage()
+    c.save()
+    buf.seek(0)
+    page = lazy.PdfReader(buf).pages[0]
+    font_dict = page["/Resources"]["/Font"]
+    fonts = tuple(str(font_dict[k]["/BaseFont"])[1:] for k in sorted(font_dict, key=lambda k: int(k[2:])))
+    return fonts, page.get_contents().get_data().decode("latin-1")
+
+
+def draw_fields(c, fields: dict, session_id: str, addr_lines: list):
+    width, height = WIDTH, HEIGHT
+
+    c.setFont("Helvetica-Bold", 16)
+    c.drawCentredString(width/2, height - 2.25*inch - 0.45*inch, fields["name"])
+
+    c.setFont("Helvetica", 12)
+    y = ADDRESS_TOP
+    for line in addr_lines:
+        c.drawCentredString(width/2, y, line)
+        y -= 0.22*inch
+
+    x = MARGIN + 0.35*inch
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(x, FOOTER_TOP, f"License ID:  {fields['license_key']}")
+    c.drawString(x, FOOTER_TOP - 0.25*inch, f"Registration Date:  {issued_display(fields['issued'])}")
+    c.setFont("Helvetica", 10)
+    c.drawString(x, FOOTER_TOP - 0.75*inch, f"Transaction ID:  {session_id}")
+
+
+def certificate_renderer(fields: dict, session_id: str):
+    """render(fh) that writes the one-page certificate for one license."""
+    addr_lines = wrap_address(fields["address"])
+
+    def render(fh):
+        fonts, ops = background_template(len(addr_lines))
+        c = lazy.canvas.Canvas(fh, pagesize=letter)
+        # Register the template's fonts in its order so its /Fn names resolve here too.
+        for name in fonts:
+            c.setFont(name, 12)
+        c.saveState()
+        c.addLiteral(ops)
+        c.restoreState()
+        draw_fields(c, fields, session_id, addr_lines)
+        c.showPage()
+        c.save()
+
+    return render
+
+
+# -------------------------
+# Batch mode
+# -------------------------
+def _render_row(args):
+    """1 if the certificate had to be rendered, 0 if it was already cached."""
+    out_dir, row = args
+    session_id, lic = row[0], row[1:]
+    fields = license_fields(lic)
+    render = certificate_renderer(fields, session_id)
+    rendered = []
+
+    def counted(fh):
+        render(fh)
+        rendered.append(1)
+
+    LicenseStamps(out_dir).get(session_id, "certificate", fields, CERTIFICATE_VERSION, counted)
+    return len(rendered)
+
+
+def render_all(db_path, out_dir, workers=None) -> tuple:
+    """Renders every uncached certificate into out_dir; returns (licenses, rendered, seconds)."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT session_id, payer_email, payer_name, property_address, property_state, license_key, created_at, product_sku FROM licenses"
+    ).fetchall()
+    conn.close()
+
+    start = time.perf_counter()
+    jobs = [(out_dir, row) for row in rows]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        rendered = sum(pool.map(_render_row, jobs, chunksize=chunksize))
+    return len(jobs), rendered, time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Render NILPF certificates.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    batch = sub.add_parser("batch", help="render a certificate for every license")
+    batch.add_argument("--db", default="licenses.db")
+    batch.add_argument("--out", default=STAMP_DIR)
+    batch.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    total, rendered, seconds = render_all(args.db, args.out, args.workers)
+    rate = rendered / seconds if seconds else 0.0
+    print(f"{total} licenses, {rendered} certificates rendered in {seconds:.2f}s "
+          f"({rate:.1f} certificates/s, {total - rendered} already cached)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
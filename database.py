@@ -0,0 +1,369 @@
+"""
+licenses.db: the schema, licenses, participants and their form checklist.
+
+init_db() creates the tables, including doc_search's full-text index, and
+ensure_db_columns() migrates older files. The application factory runs both
+once at startup, so request handlers don't re-check the schema.
+"""
+from datetime import datetime
+
+from doc_search import ensure_search_tables
+from incident_rollups import ensure_rollup_schema
+from instrumentation import connect_db
+from notes_store import ensure_notes_schema
+from registries import STAMPS
+
+# -------------------------
+# DB Helpers
+# -------------------------
+DB_PATH = "licenses.db"
+SIGNED_DOCS_DIR = "signed_docs"
+
+
+def participant_has_notes(pid):
+    conn=connect_db(DB_PATH)
+    cur=conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM participant_notes WHERE participant_id=?", (str(pid),))
+    n=cur.fetchone()[0]
+    conn.close()
+    return n>0
+
+# -------------------------
+# Participant Form Tracking
+# -------------------------
+
+def ensure_participant_forms_table():
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS participant_forms (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            participant_id TEXT NOT NULL,
+            form_name TEXT NOT NULL,
+            is_complete INTEGER NOT NULL DEFAULT 0,
+            completed_at TEXT
+        )
+    """)
+    cols = [r[1] for r in cur.execute("PRAGMA table_info(participant_forms)").fetchall()]
+    if "is_complete" not in cols:
+        cur.execute("ALTER TABLE participant_forms ADD COLUMN is_complete INTEGER NOT NULL DEFAULT 0")
+    conn.commit()
+    conn.close()
+
+
+def seed_participant_forms(participant_id: str):
+    from datetime import datetime
+
+    forms = [
+        "Entry Screening",
+        "Participant Financial Responsibility Agreement",
+        "Important Notice and Disclaimer",
+        "Communication and Consent Form",
+        "Transfer Form",
+        "Pet / Animal Information Sheet",
+        "Vehicle / Parking Information Form",
+        "Complaint / Grievance Procedure Form"
+    ]
+
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+
+    cols = [r[1] for r in cur.execute("PRAGMA table_info(participant_forms)").fetchall()]
+
+    for form_name in forms:
+        existing = cur.execute(
+            "SELECT COUNT(*) FROM participant_forms WHERE participant_id = ? AND form_name = ?",
+            (str(participant_id), form_name)
+        ).fetchone()[0]
+
+        if existing:
+            continue
+
+        data = {
+            "participant_id": str(participant_id),
+            "form_name": form_name
+        }
+
+        if "is_complete" in cols:
+            data["is_complete"] = 0
+        if "created_at" in cols:
+            data["created_at"] = datetime.utcnow().isoformat()
+
+        fields = ", ".join(data.keys())
+        placeholders = ", ".join(["?"] * len(data))
+        cur.execute(
+            f"INSERT INTO participant_forms ({fields}) VALUES ({placeholders})",
+            tuple(data.values())
+        )
+
+    conn.commit()
+    conn.close()
+
+
+def get_participant_forms(pid: str):
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT form_name, is_complete, completed_at
+        FROM participant_forms
+        WHERE participant_id=?
+        ORDER BY id
+    """, (str(pid),))
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def mark_participant_form_complete(pid: str, form_name: str):
+    from datetime import datetime
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("""
+        UPDATE participant_forms
+        SET is_complete=1, completed_at=?
+        WHERE participant_id=? AND form_name=?
+    """, (datetime.utcnow().isoformat(), str(pid), form_name))
+    conn.commit()
+    conn.close()
+
+
+def ensure_participants_table():
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS participants (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            full_name TEXT NOT NULL,
+            dob TEXT,
+            move_in_date TEXT,
+            room_unit TEXT,
+            created_at TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+    conn.close()
+
+def ensure_notes_table():
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS participant_notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            participant_name TEXT NOT NULL,
+            staff_name TEXT,
+            note_text TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+    ensure_notes_schema(conn)
+    ensure_rollup_schema(conn)
+    conn.close()
+
+def ensure_db_columns():
+    """Lightweight migration so existing licenses.db doesn't break."""
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("PRAGMA table_info(licenses)")
+    cols = {row[1] for row in cur.fetchall()}
+    if "product_sku" not in cols:
+        cur.execute("ALTER TABLE licenses ADD COLUMN product_sku TEXT")
+    if "transaction_id" not in cols:
+        cur.execute("ALTER TABLE licenses ADD COLUMN transaction_id TEXT")
+    if "price_paid" not in cols:
+        cur.execute("ALTER TABLE licenses ADD COLUMN price_paid TEXT")
+    conn.commit()
+    conn.close()
+
+
+def init_db():
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS licenses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TEXT NOT NULL,
+            session_id TEXT NOT NULL UNIQUE,
+            payer_email TEXT,
+            payer_name TEXT,
+            property_address TEXT,
+            property_state TEXT,
+            license_key TEXT,
+            product_sku TEXT
+        )
+        """
+    )
+    ensure_search_tables(conn)
+    conn.commit()
+    conn.close()
+
+    ensure_participants_table()
+    ensure_participant_forms_table()
+    ensure_notes_table()
+
+def make_license_key(state_abbr: str, address: str) -> str:
+    # Simple deterministic-ish key seed; you can replace later with stronger logic
+    stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    safe_state = (state_abbr or "NA").upper()[:2]
+    return f"NILPF-{safe_state}-{stamp}"
+
+
+def transaction_id_used(transaction_id):
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM licenses WHERE transaction_id=?", (transaction_id,))
+    row = cur.fetchone()
+    conn.close()
+    return row is not None
+
+def upsert_license(session_id: str, email: str, name: str, address: str, state_abbr: str, product_sku: str = None, transaction_id: str = None, price_paid: str = None) -> str:
+    license_key = make_license_key(state_abbr, address)
+    conn = connect_db(DB_PATH)
+
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO licenses (
+            created_at, session_id, payer_email, payer_name,
+            property_address, property_state, license_key, product_sku, price_paid
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            datetime.utcnow().isoformat(),
+            session_id,
+            email,
+            name,
+            address,
+            state_abbr,
+            license_key,
+            product_sku,
+            price_paid,
+        ),
+    )
+    if transaction_id:
+        try:
+            cur.execute(
+                "UPDATE licenses SET transaction_id=?, price_paid=COALESCE(?, price_paid), product_sku=COALESCE(?, product_sku) WHERE session_id=?",
+                (transaction_id, price_paid, product_sku, session_id),
+            )
+        except Exception:
+            try:
+                cur.execute(
+                    "UPDATE licenses SET transaction_id=?, price_paid=COALESCE(?, price_paid), product_sku=COALESCE(?, product_sku) WHERE license_key=?",
+                    (transaction_id, price_paid, product_sku, license_key),
+                )
+            except Exception:
+                pass
+
+    conn.commit()
+    conn.close()
+
+    # Stamped copies carry the license fields; drop them so the next request restamps.
+    STAMPS.invalidate(session_id)
+    return license_key
+
+def get_license_by_session(session_id: str):
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT payer_email, payer_name, property_address, property_state, license_key, created_at, product_sku FROM licenses WHERE session_id = ?",
+        (session_id,),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+def get_license_session_by_email_address(email: str, address: str):
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT session_id
+        FROM licenses
+        WHERE lower(trim(payer_email)) = lower(trim(?))
+          AND lower(trim(property_address)) = lower(trim(?))
+        ORDER BY created_at DESC
+        LIMIT 1
+        """,
+        (email, address),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def get_license_by_business_address(address: str):
+    def normalize(v: str) -> str:
+        v = (v or "").strip().lower()
+        v = v.replace(",", " ").replace(".", " ")
+        v = " ".join(v.split())
+        return v
+
+    addr = normalize(address)
+    if not addr:
+        return None
+
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+
+    best_row = None
+    best_rank = 999
+
+    for candidate in cur.execute(
+        """
+        SELECT session_id, payer_email, payer_name, property_address, property_state, license_key, created_at, product_sku
+        FROM licenses
+        ORDER BY created_at DESC
+        """
+    ).fetchall():
+        stored = normalize(candidate[3] or "")
+
+        rank = None
+        if stored == addr:
+            rank = 1
+        elif stored.startswith(addr):
+            rank = 2
+        elif addr in stored:
+            rank = 3
+
+        if rank is not None and rank < best_rank:
+            best_row = candidate
+            best_rank = rank
+            if rank == 1:
+                break
+
+    conn.close()
+    return best_row
+
+
+def seed_forms_for_participant(pid):
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+
+    forms = cur.execute("""
+        SELECT form_name
+        FROM forms_master
+        ORDER BY display_order
+    """).fetchall()
+
+    for f in forms:
+        name = f[0]
+
+        exists = cur.execute("""
+            SELECT 1
+            FROM participant_forms
+            WHERE participant_id=? AND form_name=?
+        """, (pid, name)).fetchone()
+
+        if not exists:
+            cur.execute("""
+                INSERT INTO participant_forms
+                (participant_id, form_name, is_complete)
+                VALUES (?, ?, 0)
+            """, (pid, name))
+
+    conn.commit()
+    conn.close()
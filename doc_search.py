@@ -0,0 +1,197 @@
+"""
+Full-text search over the source documents.
+
+The indexer extracts each PDF's text page by page with pypdf and stores it in an
+SQLite FTS5 table. It covers EF_v2.2, Core-v2.1 and the state doc store. Pages
+are keyed by the file's sha256, so a re-run only extracts files whose content
+changed, and the 56 identical state copies are indexed once.
+
+    python doc_search.py [--db licenses.db]     # incremental (re)index
+"""
+import argparse
+import html
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+import lazy_imports as lazy
+from pdf_response import file_digest
+
+INDEX_ROOTS = ("EF_v2.2", "Core-v2.1")
+
+# Snippet markers; the text is HTML-escaped first, then these become <mark>.
+_MARK_OPEN = "\x02"
+_MARK_CLOSE = "\x03"
+
+
+def ensure_search_tables(conn):
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS search_documents (
+            sha256 TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            pages INTEGER NOT NULL,
+            indexed_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS search_sources (
+            url TEXT PRIMARY KEY,
+            sha256 TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_search_sources_sha ON search_sources(sha256);
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_pages USING fts5(
+            sha256 UNINDEXED,
+            page UNINDEXED,
+            title,
+            body,
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+    """)
+
+
+def _title(name: str) -> str:
+    # File names that aren't valid UTF-8 come back from the filesystem with surrogates.
+    return name.encode("utf-8", "surrogateescape").decode("utf-8", "replace")
+
+
+def iter_sources(roots=INDEX_ROOTS, doc_store=None):
+    """Yields (path, url, title) for every indexable PDF."""
+    for root in roots:
+        root = Path(root)
+        if not root.is_dir():
+            continue
+        for path in sorted(root.rglob("*.pdf")):
+            yield path, f"/source-pdf/{quote(path.name, errors='surrogateescape')}", _title(path.stem)
+
+    if doc_store is not None:
+        for state in doc_store.states():
+            for logical, sha in sorted(doc_store.manifest(state).items()):
+                if not logical.lower().endswith(".pdf"):
+                    continue
+                name = logical.rsplit("/", 1)[-1]
+                yield doc_store.blob_path(sha), f"/state-documents/{quote(name)}?state={quote(state)}", Path(name).stem
+
+
+def index_documents(db_path, roots=INDEX_ROOTS, doc_store=None, log=print) -> dict:
+    """
+    Incremental reindex; returns counts of indexed, unchanged and removed documents,
+    and of files skipped because they couldn't be read or parsed (retried next run).
+    """
+    conn = sqlite3.connect(db_path)
+    ensure_search_tables(conn)
+    known = {row[0] for row in conn.execute("SELECT sha256 FROM search_documents")}
+    sources = {}
+    indexed = 0
+    skipped = 0
+
+    for path, url, title in iter_sources(roots, doc_store):
+        if path is None:
+            log(f"skip {url}: blob missing from the doc store")
+            skipped += 1
+            continue
+        try:
+            sha = file_digest(path)
+        except OSError as e:
+            log(f"skip {path}: {e!r}")
+            skipped += 1
+            continue
+        if sha in known:
+            sources.setdefault(url, sha)
+            continue
+        try:
+            reader = lazy.PdfReader(path)
+            pages = [(i, page.extract_text() or "") for i, page in enumerate(reader.pages, start=1)]
+        except Exception as e:
+            log(f"skip {path}: {e!r}")
+            skipped += 1
+            continue
+        sources.setdefault(url, sha)
+        with conn:
+            conn.executemany(
+                "INSERT INTO search_pages (sha256, page, title, body) VALUES (?, ?, ?, ?)",
+                [(sha, i, title, text) for i, text in pages],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO search_documents (sha256, title, pages, indexed_at) VALUES (?, ?, ?, ?)",
+                (sha, title, len(pages), datetime.now(timezone.utc).isoformat()),
+            )
+        known.add(sha)
+        indexed += 1
+        log(f"indexed {path} ({len(pages)} pages)")
+
+    live = set(sources.values())
+    stale = known - live
+    with conn:
+        conn.execute("DELETE FROM search_sources")
+        conn.executemany("INSERT INTO search_sources (url, sha256) VALUES (?, ?)", sorted(sources.items()))
+        for sha in stale:
+            conn.execute("DELETE FROM search_pages WHERE sha256 = ?", (sha,))
+            conn.execute("DELETE FROM search_documents WHERE sha256 = ?", (sha,))
+    conn.close()
+    return {"indexed": indexed, "unchanged": len(live) - indexed, "removed": len(stale), "skipped": skipped}
+
+
+def fts_query(text: str, prefix: bool = True) -> str:
+    """
+    User text to an FTS5 query in which every word must match. With prefix, each
+    word also matches as a prefix ("evacuat" finds "evacuation"). Prefix terms
+    cost more on large tables.
+    """
+    words = re.findall(r"\w+", text or "")
+    star = "*" if prefix else ""
+    return " ".join(f'"{w}"{star}' for w in words)
+
+
+def search(conn, text: str, limit: int = 20) -> list:
+    """Ranked page hits: title, url (with #page=), page and an HTML snippet with <mark>ed terms."""
+    query = fts_query(text)
+    if not query:
+        return []
+    rows = conn.execute(
+        f"""
+        SELECT p.sha256, p.page, p.title,
+               snippet(search_pages, 3, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', 16),
+               bm25(search_pages, 0.0, 0.0, 4.0, 1.0) AS score,
+               (SELECT MIN(url) FROM search_sources s WHERE s.sha256 = p.sha256)
+        FROM search_pages p
+        WHERE search_pages MATCH ?
+        ORDER BY score
+        LIMIT ?
+        """,
+        (query, limit),
+    ).fetchall()
+
+    results = []
+    for sha, page, title, snippet, score, url in rows:
+        if not url:
+            continue
+        snippet = html.escape(" ".join(snippet.split()))
+        snippet = snippet.replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+        results.append({
+            "title": title,
+            "page": int(page),
+            "url": f"{url}#page={page}",
+            "snippet": snippet,
+            "score": round(-score, 3),
+        })
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Index source PDFs for /search.")
+    parser.add_argument("--db", default="licenses.db")
+    args = parser.parse_args(argv)
+
+    from doc_store import DocStore
+
+    start = time.perf_counter()
+    counts = index_documents(args.db, doc_store=DocStore())
+    print(f"{counts['indexed']} indexed, {counts['unchanged']} unchanged, {counts['removed']} removed, "
+          f"{counts['skipped']} skipped in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
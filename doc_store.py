@@ -0,0 +1,236 @@
+"""
+Content-addressed store for the per-state document tree.
+
+states/<NN_STATE>/01_Core_Documents/ holds the same handful of PDFs copied into
+every state folder. The store keeps each distinct file once, as
+doc_store/blobs/<sha[:2]>/<sha256><ext>, plus doc_store/manifest.json mapping each
+state's logical paths to blob hashes. Serving and bundling read blobs through the
+manifest, so every state shares one copy (and one cache entry) per document.
+
+    python doc_store.py build     # (re)build doc_store/ from states/
+    python doc_store.py verify    # re-hash every blob and check the manifest
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+STATES_DIR = "states"
+STORE_DIR = "doc_store"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+STATE_ABBREVIATIONS = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR",
+    "CALIFORNIA": "CA", "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE",
+    "DISTRICT_OF_COLUMBIA": "DC", "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI",
+    "IDAHO": "ID", "ILLINOIS": "IL", "INDIANA": "IN", "IOWA": "IA",
+    "KANSAS": "KS", "KENTUCKY": "KY", "LOUISIANA": "LA", "MAINE": "ME",
+    "MARYLAND": "MD", "MASSACHUSETTS": "MA", "MICHIGAN": "MI", "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT", "NEBRASKA": "NE",
+    "NEVADA": "NV", "NEW_HAMPSHIRE": "NH", "NEW_JERSEY": "NJ", "NEW_MEXICO": "NM",
+    "NEW_YORK": "NY", "NORTH_CAROLINA": "NC", "NORTH_DAKOTA": "ND", "OHIO": "OH",
+    "OKLAHOMA": "OK", "OREGON": "OR", "PENNSYLVANIA": "PA", "RHODE_ISLAND": "RI",
+    "SOUTH_CAROLINA": "SC", "SOUTH_DAKOTA": "SD", "TENNESSEE": "TN", "TEXAS": "TX",
+    "UTAH": "UT", "VERMONT": "VT", "VIRGINIA": "VA", "WASHINGTON": "WA",
+    "WEST_VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
+    "AMERICAN_SAMOA": "AS", "GUAM": "GU", "NORTHERN_MARIANA_ISLANDS": "MP",
+    "PUERTO_RICO": "PR", "US_VIRGIN_ISLANDS": "VI",
+}
+
+
+def sha256_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def blob_relpath(sha: str, ext: str) -> str:
+    return f"blobs/{sha[:2]}/{sha}{ext}"
+
+
+def _write_atomic(dest: Path, data: bytes):
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, dest)
+    except Exception:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def build_store(states_dir=STATES_DIR, store_dir=STORE_DIR) -> dict:
+    """Hashes every file under states_dir, copies each distinct one into the store once, writes the manifest."""
+    states_dir = Path(states_dir)
+    store_dir = Path(store_dir)
+    blobs = {}
+    states = {}
+
+    for state_dir in sorted(p for p in states_dir.iterdir() if p.is_dir()):
+        entries = {}
+        for path in sorted(p for p in state_dir.rglob("*") if p.is_file()):
+            sha = sha256_file(path)
+            ext = path.suffix.lower()
+            if sha not in blobs:
+                blobs[sha] = {"size": path.stat().st_size, "ext": ext}
+                dest = store_dir / blob_relpath(sha, ext)
+                if not dest.exists() or sha256_file(dest) != sha:
+                    dest.parent.mkdir(parents=True, exist_ok=True)
+                    fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-")
+                    os.close(fd)
+                    shutil.copyfile(path, tmp_name)
+                    os.chmod(tmp_name, 0o644)
+                    os.replace(tmp_name, dest)
+            entries[path.relative_to(state_dir).as_posix()] = sha
+        states[state_dir.name] = entries
+
+    manifest = {"version": MANIFEST_VERSION, "blobs": blobs, "states": states}
+    _write_atomic(store_dir / MANIFEST_NAME, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+    return manifest
+
+
+def verify_store(store_dir=STORE_DIR) -> list:
+    """Returns a list of problems; empty means every manifest entry points at an intact blob."""
+    store_dir = Path(store_dir)
+    problems = []
+    try:
+        manifest = json.loads((store_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except Exception as e:
+        return [f"manifest unreadable: {e!r}"]
+
+    blobs = manifest.get("blobs", {})
+    for sha, meta in sorted(blobs.items()):
+        path = store_dir / blob_relpath(sha, meta.get("ext", ""))
+        if not path.exists():
+            problems.append(f"missing blob {sha}")
+            continue
+        if path.stat().st_size != meta.get("size"):
+            problems.append(f"size mismatch {sha}")
+        if sha256_file(path) != sha:
+            problems.append(f"hash mismatch {sha}")
+
+    for state, entries in sorted(manifest.get("states", {}).items()):
+        for logical, sha in sorted(entries.items()):
+            if sha not in blobs:
+                problems.append(f"{state}/{logical} -> unknown blob {sha}")
+    return problems
+
+
+def manifest_digest(entries: dict) -> str:
+    """Stable hash of one state's manifest; changes whenever any of its documents do."""
+    return hashlib.sha256(json.dumps(entries, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class DocStore:
+    def __init__(self, store_dir=STORE_DIR, states_dir=STATES_DIR):
+        self.store_dir = Path(store_dir)
+        self.states_dir = Path(states_dir)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._manifest = {"blobs": {}, "states": {}}
+        self._aliases = {}
+
+    def _manifest_path(self) -> Path:
+        return self.store_dir / MANIFEST_NAME
+
+    def _current(self) -> dict:
+        path = self._manifest_path()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime is not None and mtime == self._mtime:
+            return self._manifest
+
+        with self._lock:
+            if mtime is None and self.states_dir.is_dir():
+                # First run on a fresh checkout: build the store from states/.
+                build_store(self.states_dir, self.store_dir)
+                mtime = os.stat(path).st_mtime_ns
+            if mtime is None:
+                return self._manifest
+            if mtime != self._mtime:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+                aliases = {}
+                for folder in manifest.get("states", {}):
+                    name = folder.split("_", 1)[1] if "_" in folder and folder.split("_", 1)[0].isdigit() else folder
+                    aliases[folder.upper()] = folder
+                    aliases[name.upper()] = folder
+                    abbr = STATE_ABBREVIATIONS.get(name.upper())
+                    if abbr:
+                        aliases[abbr] = folder
+                self._manifest = manifest
+                self._aliases = aliases
+                self._mtime = mtime
+        return self._manifest
+
+    def state_key(self, state) -> str:
+        """Folder name ("36_OHIO") for a folder name, state name or USPS abbreviation."""
+        self._current()
+        key = "_".join(str(state or "").strip().upper().replace("-", " ").split())
+        return self._aliases.get(key, "")
+
+    def states(self) -> list:
+        return sorted(self._current().get("states", {}))
+
+    def manifest(self, state) -> dict:
+        folder = self.state_key(state)
+        return dict(self._current().get("states", {}).get(folder, {})) if folder else {}
+
+    def manifest_digest(self, state) -> str:
+        return manifest_digest(self.manifest(state))
+
+    def blob_path(self, sha: str) -> Path:
+        meta = self._current().get("blobs", {}).get(sha)
+        if meta is None:
+            return None
+        return self.store_dir / blob_relpath(sha, meta.get("ext", ""))
+
+    def resolve(self, state, logical: str):
+        """(sha, blob path) for a state's document by logical path or bare file name, else (None, None)."""
+        entries = self.manifest(state)
+        logical = (logical or "").strip().lstrip("/")
+        sha = entries.get(logical)
+        if sha is None:
+            for name, candidate in entries.items():
+                if name.rsplit("/", 1)[-1] == logical:
+                    sha = candidate
+                    break
+        if sha is None:
+            return None, None
+        return sha, self.blob_path(sha)
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    cmd = argv[0] if argv else "build"
+    if cmd == "build":
+        manifest = build_store()
+        files = sum(len(v) for v in manifest["states"].values())
+        size = sum(m["size"] for m in manifest["blobs"].values())
+        print(f"{len(manifest['states'])} states, {files} files -> {len(manifest['blobs'])} blobs ({size} bytes)")
+        return 0
+    if cmd == "verify":
+        problems = verify_store()
+        for p in problems:
+            print(p)
+        print("OK" if not problems else f"{len(problems)} problem(s)")
+        return 1 if problems else 0
+    print(__doc__)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Buffered append-only event log.
+
+log() only appends a line to an in-memory ring buffer. A background thread
+writes whatever has accumulated in one write() every FLUSH_INTERVAL seconds, or
+sooner once BATCH_SIZE lines are waiting. The file is opened with O_APPEND for
+each batch, so several gunicorn workers can share one log (and it can be rotated
+underneath them) without interleaving partial lines. A batch whose write fails
+goes back to the head of the buffer and is retried, backing off up to
+MAX_BACKOFF seconds. If the writer falls behind, the buffer keeps the newest
+CAPACITY lines. Only lines evicted that way are counted as dropped, and the
+count is written to the log. Pending lines are flushed at interpreter exit.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import deque
+
+CAPACITY = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0
+MAX_BACKOFF = 30.0
+
+
+class EventLog:
+    def __init__(self, path, capacity=CAPACITY, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = min(batch_size, capacity)
+        self.flush_interval = flush_interval
+        self._buffer = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._written = 0
+        self._dropped = 0
+        self._dropped_reported = 0
+        atexit.register(self.close)
+        # A forked worker inherits the buffer but not the thread; it starts its own.
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._buffer.clear()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def log(self, line: str):
+        """Queues one line (newline added); never blocks on the file."""
+        if self._closed:
+            self._write([line.rstrip("\n") + "\n"])
+            return
+        with self._cond:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._dropped += 1
+            self._buffer.append(line.rstrip("\n") + "\n")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"event-log:{self.path}", daemon=True)
+                self._thread.start()
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def _take(self) -> list:
+        lines = list(self._buffer)
+        self._buffer.clear()
+        if self._dropped > self._dropped_reported:
+            lines.append(f"[event_log] {self._dropped - self._dropped_reported} events dropped (buffer full)\n")
+            self._dropped_reported = self._dropped
+        return lines
+
+    def _requeue(self, lines: list):
+        """Puts an unwritten batch back in front of newer lines, as much of it as fits."""
+        room = self._buffer.maxlen - len(self._buffer)
+        keep = lines[max(len(lines) - room, 0):] if room else []
+        self._dropped += len(lines) - len(keep)
+        self._buffer.extendleft(reversed(keep))
+
+    def _write(self, lines: list):
+        if not lines:
+            return
+        data = "".join(lines).encode("utf-8", "replace")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        self._written += len(lines)
+
+    def _run(self):
+        failures = 0
+        while True:
+            with self._cond:
+                if failures:
+                    # A full buffer keeps notifying; wait out the backoff regardless.
+                    deadline = time.monotonic() + min(self.flush_interval * 2 ** failures, MAX_BACKOFF)
+                    while not self._closed and time.monotonic() < deadline:
+                        self._cond.wait(deadline - time.monotonic())
+                elif not self._closed and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                lines = self._take()
+                closed = self._closed
+            try:
+                self._write(lines)
+                failures = 0
+            except OSError:
+                failures += 1
+                with self._cond:
+                    self._requeue(lines)
+            if closed:
+                return
+
+    def flush(self):
+        """Writes everything queued so far from the calling thread; on failure it stays queued."""
+        with self._cond:
+            lines = self._take()
+        try:
+            self._write(lines)
+        except OSError:
+            with self._cond:
+                self._requeue(lines)
+            raise
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "pending": len(self._buffer),
+                "written": self._written,
+                "dropped": self._dropped,
+                "capacity": self._buffer.maxlen,
+            }
+
@@ -0,0 +1,90 @@
+"""
+Form identity helpers.
+
+The same ~30 forms are requested under many spellings ("07 – Emergency_Contact_Form.pdf",
+"7_Emergency_Contact_Form.pdf", "EF_v2.2|7_Emergency_Contact_Form.pdf", & vs AND ...).
+canonical_form_key() collapses those to one stable key, and the form tables in
+participant_forms.py are keyed by it. Both helpers are memoized; they sit on every request path.
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+
+_LEADING_NUMBER = re.compile(r"^(\d+)(.*)$")
+_WHITESPACE = re.compile(r"\s+")
+_KEY_SEPARATORS = re.compile(r"[^A-Z0-9.]+")
+
+
+@lru_cache(maxsize=1024)
+def candidate_form_keys(form_name: str) -> tuple:
+    """File name variants a form may be stored under: &/AND swaps and 1-3 digit number padding."""
+    raw = Path(form_name).name if form_name else ""
+    if not raw:
+        return ()
+
+    stem = Path(raw).stem
+    suffix = Path(raw).suffix or ".pdf"
+    variants = []
+
+    def add(name):
+        if name and name not in variants:
+            variants.append(name)
+
+    def add_swaps(name):
+        add(name)
+        add(name.replace("&", "AND"))
+        add(name.replace("AND", "&"))
+
+    def add_padded(num, rest):
+        n = int(num)
+        for width in (1, 2, 3):
+            add_swaps(f"{n:0{width}d}{rest}{suffix}")
+
+    add_swaps(raw)
+
+    m = _LEADING_NUMBER.match(stem)
+    if m:
+        add_padded(m.group(1), m.group(2))
+
+    norm = stem
+    norm = norm.replace("&", " AND ")
+    norm = norm.replace("-", " ")
+    norm = norm.replace("_", " ")
+    norm = _WHITESPACE.sub(" ", norm).strip()
+
+    add_swaps(norm.replace(" ", "_") + suffix)
+
+    m2 = _LEADING_NUMBER.match(norm)
+    if m2:
+        add_padded(m2.group(1), m2.group(2).replace(" ", "_"))
+
+    return tuple(variants)
+
+
+@lru_cache(maxsize=1024)
+def canonical_form_key(form_name: str) -> str:
+    """
+    Stable identity for a form file name: source hint and extension dropped,
+    upper-cased, & spelled AND, separators collapsed to "_", leading number unpadded.
+    """
+    raw = Path(form_name).name if form_name else ""
+    if "|" in raw:
+        raw = raw.split("|", 1)[1]
+    raw = raw.strip()
+    if not raw:
+        return ""
+
+    stem = raw[:-4] if raw.lower().endswith(".pdf") else raw
+    tokens = _KEY_SEPARATORS.sub(" ", stem.upper().replace("&", " AND ")).split()
+    tokens = [t.strip(".") for t in tokens if t.strip(".")]
+    if tokens and tokens[0].isdigit():
+        tokens[0] = str(int(tokens[0]))
+    return "_".join(tokens)
+
+
+def key_by_form(table: dict) -> dict:
+    """Re-keys a {file name: value} table by canonical_form_key; the first entry wins."""
+    keyed = {}
+    for name, value in table.items():
+        keyed.setdefault(canonical_form_key(name), value)
+    return keyed
@@ -0,0 +1,655 @@
+"""
+Participant forms: the in-app form page, the filled and signed print PDF, and
+the source PDFs they are drawn from.
+"""
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from flask import Blueprint, abort, redirect, render_template_string, request, send_file
+
+from acroform_fill import fill_acroform, has_acroform
+from database import DB_PATH, SIGNED_DOCS_DIR
+from instrumentation import connect_db, timed
+from participant_forms import auto_mark_form_complete_if_has_data, get_form_definition, get_participant_form_values, save_participant_form_values
+from pdf_response import VERSIONED_MAX_AGE, file_digest, persist_pdf, send_pdf, spool_pdf
+from registries import LAYOUTS, OPTIMIZED_PDFS, SOURCE_PDFS, get_source_pdf_relpath, get_source_pdf_url
+
+bp = Blueprint("forms", __name__)
+
+
+@bp.route("/source-pdf/<path:form_name>")
+def source_pdf(form_name):
+    rel = SOURCE_PDFS.resolve_any(Path(form_name).name)
+    if not rel:
+        abort(404)
+
+    # Strong ETag from the content hash; send_file(conditional=True) answers
+    # If-None-Match with 304 and Range with 206 so pdf.js can load pages lazily.
+    digest = file_digest(rel)
+    versioned = request.args.get("v") == digest[:16]
+    served, etag = OPTIMIZED_PDFS.variant(rel, digest)
+    resp = send_file(
+        served,
+        mimetype="application/pdf",
+        etag=etag,
+        conditional=True,
+        max_age=VERSIONED_MAX_AGE if versioned else 0,
+    )
+    if versioned:
+        resp.cache_control.immutable = True
+    else:
+        resp.cache_control.no_cache = True
+    # pdf.js only switches to range loading when the full response advertises it.
+    resp.headers.setdefault("Accept-Ranges", "bytes")
+    return resp
+
+@bp.route("/participant-form/<int:participant_id>/<path:form_name>", methods=["GET", "POST"])
+def participant_form_page(participant_id, form_name):
+    form_name = unquote(form_name)
+
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    participant = cur.execute(
+        """
+        SELECT id, legal_name, preferred_name, dob, gender, phone, email,
+               address, city, state, zip_code,
+               emergency_contact_name, emergency_contact_phone,
+               move_in_date, room_unit, created_at
+        FROM participants
+        WHERE id=?
+        """,
+        (participant_id,)
+    ).fetchone()
+    conn.close()
+
+    if not participant:
+        abort(404, "Participant not found.")
+
+    (
+        pid, legal_name, preferred_name, dob, gender, phone, email,
+        address, city, state, zip_code,
+        emergency_contact_name, emergency_contact_phone,
+        move_in_date, room_unit, created_at
+    ) = participant
+    display_name = preferred_name or legal_name
+    form_def = get_form_definition(form_name)
+
+    pdf_layout = LAYOUTS.get(form_name)
+
+    if request.method == "POST":
+        from datetime import datetime as _dt
+        payload = {}
+        for field in form_def["fields"]:
+            payload[field["name"]] = request.form.get(field["name"], "").strip()
+
+        signature_name = (request.form.get("signature_name") or "").strip()
+        signature_date = (request.form.get("signature_date") or "").strip()
+        signature_ack = "yes" if request.form.get("signature_ack") else ""
+        signature_data = request.form.get("signature_data", "")
+        payload["signature_name"] = signature_name
+        payload["signature_date"] = signature_date
+        payload["signature_ack"] = signature_ack
+        payload["signature_data"] = signature_data
+
+        existing_values = get_participant_form_values(participant_id, form_name)
+        if signature_name and signature_ack:
+            payload["signed_at"] = existing_values.get("signed_at") or _dt.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+        else:
+            payload["signed_at"] = ""
+
+        save_participant_form_values(participant_id, form_name, payload)
+        auto_mark_form_complete_if_has_data(participant_id, form_name)
+        return redirect(f"/participant-form/{participant_id}/{quote(form_name)}")
+
+    values = get_participant_form_values(participant_id, form_name)
+    # AUTO-FILL EMPTY DATE FIELDS
+    from datetime import datetime as _dt
+    for _field in form_def.get('fields', []):
+        if _field.get('type') == 'date' and not values.get(_field.get('name', '')):
+            values[_field['name']] = _dt.utcnow().strftime('%Y-%m-%d')
+
+    # Inject participant demographics if not already set
+    participant_demographics = {
+        "legal_name": legal_name,
+        "preferred_name": preferred_name,
+        "dob": dob,
+        "gender": gender,
+        "phone": phone,
+        "email": email,
+        "address": address,
+        "city": city,
+        "state": state,
+        "zip_code": zip_code,
+        "emergency_contact_name": emergency_contact_name,
+        "emergency_contact_phone": emergency_contact_phone,
+        "move_in_date": move_in_date,
+        "room_unit": room_unit,
+    }
+    for key, val in participant_demographics.items():
+        if key not in values or not values[key]:
+            values[key] = val
+
+
+    if not values.get("legal_name"):
+        values["legal_name"] = legal_name
+
+    return render_template_string("""
+    <!doctype html>
+    <html>
+    <head>
+      <meta charset="utf-8">
+      <meta name="viewport" content="width=device-width, initial-scale=1">
+      <title>{{ form_def.title }}</title>
+      <style>
+        body { font-family: Arial, sans-serif; margin: 0; background: #f6f7fb; color: #111; }
+        .wrap { max-width: 920px; margin: 0 auto; padding: 18px; }
+        .card { background: #fff; border: 2px solid #111; border-radius: 18px; padding: 18px; margin-bottom: 18px; }
+        h1 { margin: 0 0 8px 0; }
+        .note { color: #444; margin-bottom: 6px; }
+        .field { margin-bottom: 14px; }
+        label { display: block; font-weight: 700; margin-bottom: 6px; }
+        input, textarea {
+          width: 100%; box-sizing: border-box; padding: 10px 12px;
+          border: 2px solid #111; border-radius: 12px; font-size: 14px;
+          background: #fff;
+        }
+        textarea { min-height: 110px; resize: vertical; }
+        .btnrow { display: flex; gap: 10px; flex-wrap: wrap; margin-top: 16px; }
+        .btn {
+          display: inline-block; text-decoration: none; border: 2px solid #111;
+          background: #111; color: #fff; padding: 10px 14px; border-radius: 999px;
+          font-weight: 700; cursor: pointer;
+        }
+        .btn.alt { background: #fff; color: #111; }
+      </style>
+    </head>
+    <body>
+
+
+<div style="background:#111;color:#fff;padding:10px;">
+
+<a href="/participants" style="color:#fff;margin-right:20px;">Add / View Participants</a>
+<a href="/notes" style="color:#fff;">Incident / Status Documentation</a>
+</div>
+
+      <div class="wrap">
+        <div class="card">
+          <div style="display:flex;gap:10px;flex-wrap:wrap;margin-bottom:12px;">
+            <a class="btn alt" href="/">Home</a>
+            <a class="btn alt" href="/participant-workflow/{{ pid }}">Back to Workflow</a>
+          </div>
+          <h1>{{ form_def.title }}</h1>
+          <div class="note">Participant: {{ display_name }}</div>
+          <div class="note">Legal Name: {{ legal_name }}</div>
+        </div>
+
+        <div class="card">
+          <h3 style="margin-top:0;">PDF Form (Live View)
+
+<div id="pdf-viewer" style="position:relative;"></div>
+
+<script src="https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.min.js"></script>
+<script>
+(async function() {
+  const url = "{{ source_pdf_url }}";
+  const pdfjsLib = window['pdfjsLib'];
+  pdfjsLib.GlobalWorkerOptions.workerSrc =
+    "https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.worker.min.js";
+
+  const container = document.getElementById("pdf-viewer");
+  const pdf = await pdfjsLib.getDocument(url).promise;
+  const layout = {{ pdf_layout|tojson }};
+  const values = {{ values|tojson }};
+
+  function fieldValue(name, type) {
+    if (type === "checkbox") return values[name] === "yes";
+    return values[name] || "";
+  }
+
+  for (let i = 1; i <= pdf.numPages; i++) {
+    const page = await pdf.getPage(i);
+    const viewport = page.getViewport({ scale: 1.3 });
+
+    const wrap = document.createElement("div");
+    wrap.style.position = "relative";
+    wrap.style.marginBottom = "20px";
+
+    const canvas = document.createElement("canvas");
+    canvas.width = viewport.width;
+    canvas.height = viewport.height;
+    canvas.style.display = "block";
+
+    wrap.appendChild(canvas);
+    container.appendChild(wrap);
+
+    await page.render({
+      canvasContext: canvas.getContext("2d"),
+      viewport
+    }).promise;
+
+    const pageFields = layout.filter(f => Number(f.page || 1) === i);
+
+    for (const field of pageFields) {
+      const typeMap = {
+        name: "text",
+        date: "date",
+        checkbox: "checkbox",
+        signature: "text"
+      };
+      const nameMap = {
+        name: "legal_name",
+        date: "signature_date",
+        checkbox: "signature_ack",
+        signature: "signature_data"
+      };
+
+      const input = document.createElement("input");
+      input.type = typeMap[field.type] || "text";
+      input.name = field.field_name || nameMap[field.type] || field.type;
+
+      input.style.position = "absolute";
+      // Snap alignment logic
+const snap = 6; // pixels
+
+let x = posX;
+let y = posY;
+
+// Snap to grid
+x = Math.round(x / snap) * snap;
+y = Math.round(y / snap) * snap;
+
+input.style.left = x + "px";
+input.style.top = y + "px";
+((Number(field.y || 0)) * canvas.height) + "px";
+      input.style.zIndex = "9999";
+      input.style.background = "rgba(255,255,0,0.92)";
+      input.style.border = "3px solid red";
+      input.style.borderRadius = "8px";
+      input.style.boxSizing = "border-box";
+
+      if (field.type === "realcheckbox") {
+                const px = 12;
+
+                el.style.width = px + "px";
+                el.style.height = px + "px";
+                el.style.minWidth = px + "px";
+                el.style.minHeight = px + "px";
+                el.style.border = "1px solid #111";
+                el.style.borderRadius = "2px";
+                el.style.background = "#fff";
+                el.style.display = "block";
+                el.innerHTML = "";
+              } else if (field.type === "checkbox") {
+        input.style.width = "8px";
+        input.style.height = "8px";
+        input.style.minWidth = "8px";
+        input.style.minHeight = "8px";
+        input.style.padding = "0";
+        input.style.margin = "0";
+        input.style.border = "1px solid #111";
+        input.style.borderRadius = "2px";
+        input.style.boxSizing = "border-box";
+        input.style.background = "#fff";
+        input.checked = fieldValue(input.name, "checkbox");
+
+        input.style.cursor = "pointer";
+        input.style.accentColor = "#000";
+
+        input.addEventListener("change", () => {
+          if (input.checked) {
+            input.style.transform = "scale(1.2)";
+          } else {
+            input.style.transform = "scale(1)";
+          }
+        });
+        input.value = "yes";
+      } else if (field.type === "signature") {
+        input.style.width = Math.max(220, (Number(field.width || 0.22) * canvas.width)) + "px";
+        input.style.height = "42px";
+        input.placeholder = "Signature";
+        input.value = fieldValue(input.name, "text");
+      } else {
+        input.style.width = Math.max(140, (Number(field.width || 0.18) * canvas.width)) + "px";
+        input.style.height = "34px";
+        input.value = fieldValue(input.name, "text");
+      }
+
+      wrap.appendChild(input);
+    }
+  }
+})();
+</script>
+        </div>
+      </div>
+    
+<div style="
+margin-top:40px;
+padding-top:12px;
+border-top:1px solid #ddd;
+text-align:center;
+font-size:13px;
+color:#666;
+">
+<img src="/static/pearlzz-logo.png" style="height:28px;opacity:.9;"><br>Pearlzz
+© Pearlzz
+</div>
+
+        
+
+
+</body>
+
+    </html>
+    """,
+    pid=pid,
+    legal_name=legal_name,
+    display_name=display_name,
+    form_def=form_def,
+    values=values,
+    quoted_form_name=quote(form_name),
+    form_name=form_name,
+    source_pdf_url=get_source_pdf_url(form_name),
+    pdf_layout=pdf_layout)
+
+@bp.route("/participant-form-print/<int:participant_id>/<path:form_name>")
+def participant_form_print(participant_id, form_name):
+    form_name = unquote(form_name)
+
+    import re
+    from io import BytesIO
+    import base64
+    from pathlib import Path
+    from lazy_imports import ImageReader, PdfReader, PdfWriter, canvas, inch, letter, simpleSplit
+
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    participant = cur.execute(
+        """
+        SELECT id, legal_name, preferred_name, dob, gender, phone, email,
+               address, city, state, zip_code,
+               emergency_contact_name, emergency_contact_phone,
+               move_in_date, room_unit, created_at
+        FROM participants
+        WHERE id=?
+        """,
+        (participant_id,)
+    ).fetchone()
+    conn.close()
+
+    if not participant:
+        abort(404, "Participant not found.")
+
+    (
+        pid, legal_name, preferred_name, dob, gender, phone, email,
+        address, city, state, zip_code,
+        emergency_contact_name, emergency_contact_phone,
+        move_in_date, room_unit, created_at
+    ) = participant
+
+    display_name = preferred_name or legal_name
+    form_def = get_form_definition(form_name)
+    values = get_participant_form_values(participant_id, form_name)
+
+    # EF_v2.2, Core-v2.1, then static/documents (source_pdf_index.py).
+    source_rel = get_source_pdf_relpath(form_name)
+
+    layout_fields = LAYOUTS.get(form_name)
+
+    participant_demographics = {
+        "legal_name": legal_name,
+        "preferred_name": preferred_name,
+        "dob": dob,
+        "gender": gender,
+        "phone": phone,
+        "email": email,
+        "address": address,
+        "city": city,
+        "state": state,
+        "zip_code": zip_code,
+        "emergency_contact_name": emergency_contact_name,
+        "emergency_contact_phone": emergency_contact_phone,
+        "move_in_date": move_in_date,
+        "room_unit": room_unit,
+    }
+    for key, val in participant_demographics.items():
+        if key not in values or not values[key]:
+            values[key] = val
+
+    if not values.get("legal_name"):
+        values["legal_name"] = legal_name
+
+    # --- Layout preview rendering ---
+    # AcroForm fields in the source are filled natively; only layout fields
+    # that don't sit on a real field are drawn as reportlab overlays.
+    if source_rel and (layout_fields or has_acroform(source_rel)):
+        try:
+            with timed("pdf"):
+                base_reader = PdfReader(source_rel)
+                writer, overlay_fields = fill_acroform(base_reader, values, form_def, layout_fields)
+
+            for page_index, page in enumerate(writer.pages, start=1):
+                page_fields = [f for f in overlay_fields if f.get("page") == page_index]
+                if not page_fields:
+                    continue
+
+                packet = BytesIO()
+                c = canvas.Canvas(packet, pagesize=letter)
+
+                for field in page_fields:
+                    x = field.get("x", 0.5) * 612
+                    y = (1 - field.get("y", 0.5)) * 792
+
+                    c.setFont("Helvetica", 10)
+
+                    field_type = field.get("type", "")
+                    field_name = field.get("field_name", "")
+                    val = values.get(field_name, "")
+
+                    if field_type in ("name", "text", "email", "phone", "address"):
+                        c.drawString(x, y, str(val or values.get("legal_name", "")))
+
+                    elif field_type == "date":
+                        c.drawString(x, y, str(val or values.get("signature_date", "")))
+
+                    elif field_type == "checkbox":
+                        checked = str(val).lower() in ("yes", "true", "1", "on", "checked")
+                        if checked:
+                            c.setFont("Helvetica-Bold", 12)
+                            c.drawString(x, y, "X")
+                            c.setFont("Helvetica", 10)
+
+                    elif field_type == "signature":
+                        signature_data = values.get(field_name, "") or values.get("signature_data", "")
+                        if isinstance(signature_data, str) and signature_data.startswith("data:image"):
+                            try:
+                                from io import BytesIO as _BytesIO
+
+                                header, encoded = signature_data.split(",", 1)
+                                img_bytes = base64.b64decode(encoded)
+                                sig_img = ImageReader(_BytesIO(img_bytes))
+
+                                sig_w = max(120, int(field.get("width", 0.42) * 612))
+                                sig_h = 36
+                                c.drawImage(
+                                    sig_img,
+                                    x,
+                                    y - 18,
+                                    width=sig_w,
+                                    height=sig_h,
+                                    preserveAspectRatio=True,
+                                    mask='auto'
+                                )
+                            except Exception:
+                                c.drawString(x, y, "[sig]")
+                        elif signature_data:
+                            c.drawString(x, y, "[sig]")
+
+                c.showPage()
+                c.save()
+                packet.seek(0)
+
+                overlay = PdfReader(packet)
+                if len(overlay.pages) > 0:
+                    page.merge_page(overlay.pages[0])
+
+            return send_pdf(spool_pdf(writer.write), "layout_preview.pdf")
+        except Exception as e:
+            print("PDF OVERLAY ERROR:", repr(e))
+            raise
+
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    width, height = letter
+
+    left = 0.75 * inch
+    right = width - 0.75 * inch
+    top = height - 0.75 * inch
+    y = top
+
+    def new_page():
+        nonlocal y
+        c.showPage()
+        y = top
+        c.setFont("Helvetica", 11)
+
+    def draw_wrapped(label, value):
+        nonlocal y
+        label = str(label or "").strip()
+        value = str(value or "").strip()
+        if not value:
+            value = ""
+
+        label_lines = simpleSplit(label, "Helvetica-Bold", 11, right - left)
+        value_lines = simpleSplit(value, "Helvetica", 11, right - left)
+
+        needed = (len(label_lines) * 14) + (max(1, len(value_lines)) * 14) + 14
+        if y - needed < 0.75 * inch:
+            new_page()
+
+        c.setFont("Helvetica-Bold", 11)
+        for line in label_lines:
+            c.drawString(left, y, line)
+            y -= 14
+
+        c.setFont("Helvetica", 11)
+        if value_lines:
+            for line in value_lines:
+                c.drawString(left, y, line)
+                y -= 14
+        else:
+            c.drawString(left, y, "")
+            y -= 14
+
+        y -= 8
+        c.line(left, y, right, y)
+        y -= 14
+
+    c.setTitle(f"{form_def['title']} - {display_name}")
+
+    c.setFont("Helvetica-Bold", 18)
+    c.drawString(left, y, form_def["title"])
+    y -= 24
+
+    c.setFont("Helvetica", 11)
+    c.drawString(left, y, f"Participant: {display_name}")
+    y -= 16
+    if legal_name != display_name:
+        c.drawString(left, y, f"Legal Name: {legal_name}")
+        y -= 16
+
+    c.drawString(left, y, "Participant copy generated from the NILPF workflow.")
+    y -= 22
+    c.line(left, y, right, y)
+    y -= 18
+
+    for field in form_def.get("fields", []):
+        draw_wrapped(field.get("label", ""), values.get(field.get("name", ""), ""))
+
+    signer_ip = (
+        request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
+        or request.remote_addr
+        or ""
+    )
+
+    if values.get("signature_name") or values.get("signature_date") or values.get("signed_at") or values.get("signature_data"):
+        if y - 220 < 0.75 * inch:
+            new_page()
+
+        c.setFont("Helvetica-Bold", 13)
+        c.drawString(left, y, "Participant Signature")
+        y -= 20
+        c.setFont("Helvetica", 11)
+
+        signature_data = values.get("signature_data", "") or ""
+        if signature_data.startswith("data:image"):
+            try:
+                import base64
+                from io import BytesIO as _BytesIO
+
+                header, encoded = signature_data.split(",", 1)
+                img_bytes = base64.b64decode(encoded)
+                sig_img = ImageReader(_BytesIO(img_bytes))
+
+                box_w = 4.8 * inch
+                box_h = 1.5 * inch
+
+                c.roundRect(left, y - box_h, box_w, box_h, 8, stroke=1, fill=0)
+                c.drawImage(sig_img, left + 6, y - box_h + 6, width=box_w - 12, height=box_h - 12, preserveAspectRatio=True, mask='auto')
+                y -= (box_h + 14)
+            except Exception:
+                draw_wrapped("Signature Image", "[Unable to render saved signature]")
+        else:
+            draw_wrapped("Signature Image", "[No handwritten signature captured]")
+
+        draw_wrapped("Signer Full Legal Name", values.get("signature_name", ""))
+        draw_wrapped("Signature Date", values.get("signature_date", ""))
+        draw_wrapped("Signed At", values.get("signed_at", ""))
+        draw_wrapped("IP Address", signer_ip)
+
+    if y - 40 < 0.75 * inch:
+        new_page()
+
+    c.setFont("Helvetica-Oblique", 9)
+    c.drawString(left, y, "This copy reflects the information currently saved in the participant workflow for this form.")
+
+    c.showPage(); c.save(); buf.seek(0)
+
+    overlay_reader = PdfReader(buf)
+    writer = PdfWriter()
+
+    if source_rel:
+        reader = PdfReader(source_rel)
+        for i, page in enumerate(reader.pages):
+            if i < len(overlay_reader.pages):
+                page.merge_page(overlay_reader.pages[i])
+            writer.add_page(page)
+    else:
+        for page in overlay_reader.pages:
+            writer.add_page(page)
+
+    safe_display = re.sub(r"[^A-Za-z0-9_-]+", "_", display_name or "participant").strip("_") or "participant"
+    safe_form = re.sub(r"[^A-Za-z0-9_-]+", "_", form_def["title"]).strip("_") or "form"
+    filename = f"{safe_display}_{safe_form}_signed_copy.pdf"
+
+    signed_dir = Path(SIGNED_DOCS_DIR)
+    signed_path = persist_pdf(writer.write, signed_dir / filename)
+
+    return send_pdf(signed_path, filename, accel_root=signed_dir)
+
+
+# -------------------------
+# Universal Form Loader
+# -------------------------
+@bp.route("/form/<form_name>")
+def open_form(form_name):
+    pid = request.args.get("pid")
+
+    return f"""
+    <html>
+    <body style="font-family:Arial;padding:40px">
+    <h2>Form: {form_name}</h2>
+    <p>Participant ID: {pid}</p>
+    <p>This confirms the form route is working.</p>
+    </body>
+    </html>
+    """
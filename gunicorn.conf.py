@@ -0,0 +1,13 @@
+"""
+gunicorn settings, read automatically when gunicorn starts in this directory.
+
+The app is imported and preloaded in the master, so the workers fork with the
+schema in place and the registries already in memory (see app.py).
+"""
+preload_app = True
+
+
+def on_starting(server):
+    from app import app, preload
+
+    preload(app)
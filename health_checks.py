@@ -0,0 +1,115 @@
+"""
+Readiness checks for /ready.
+
+Each check runs on a small thread pool with its own time budget. One that
+overruns is reported as "timeout" and not started again until the stuck run
+finishes. Results are cached for CACHE_SECONDS, so load balancer probes from
+several sources cost at most one round of checks per worker every few seconds.
+The service is ready when every critical check passes. Non-critical checks
+(PayPal) are reported but never take the instance out of rotation.
+"""
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from datetime import datetime, timezone
+
+CACHE_SECONDS = 5.0
+
+
+class ReadinessChecks:
+    def __init__(self, cache_seconds=CACHE_SECONDS):
+        self.cache_seconds = cache_seconds
+        self._checks = []
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ready")
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._result = None
+        self._checked_at = 0.0
+
+    def add(self, name, fn, timeout, critical=True):
+        """fn() returns a dict of details or raises; it must finish within timeout seconds."""
+        self._checks.append((name, fn, timeout, critical))
+
+    def _submit(self, name, fn):
+        future = self._inflight.get(name)
+        if future is None or future.done():
+            future = self._inflight[name] = self._pool.submit(_timed_call, fn)
+        return future
+
+    def _collect(self, future, started, timeout, critical):
+        try:
+            ms, details = future.result(timeout=max(0.0, timeout - (time.monotonic() - started)))
+            result = {"status": "ok", "ms": ms, **(details or {})}
+        except TimeoutError:
+            result = {"status": "timeout"}
+        except Exception as e:
+            result = {"status": "fail", "error": str(e) or repr(e)}
+        result["critical"] = critical
+        result["budget_ms"] = round(timeout * 1000, 1)
+        return result
+
+    def run(self) -> dict:
+        now = time.monotonic()
+        if self._result is not None and now - self._checked_at < self.cache_seconds:
+            return {**self._result, "cached": True}
+        with self._lock:
+            if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+                return {**self._result, "cached": True}
+            # All checks run at once; each is waited on only up to its own budget.
+            started = time.monotonic()
+            futures = [(name, self._submit(name, fn), timeout, critical) for name, fn, timeout, critical in self._checks]
+            checks = {name: self._collect(future, started, timeout, critical) for name, future, timeout, critical in futures}
+            self._result = {
+                "ready": all(c["status"] == "ok" for c in checks.values() if c["critical"]),
+                "checked_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "checks": checks,
+            }
+            self._checked_at = time.monotonic()
+            return {**self._result, "cached": False}
+
+
+def _timed_call(fn):
+    start = time.perf_counter()
+    details = fn()
+    return round((time.perf_counter() - start) * 1000, 2), details
+
+
+# -------------------------
+# Checks
+# -------------------------
+def check_sqlite(db_path, table, timeout):
+    """Read latency (one row from table) and write latency (taking and releasing the write lock)."""
+
+    def check():
+        if not os.path.exists(db_path):
+            raise RuntimeError(f"{db_path} not found")
+        conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None)
+        try:
+            start = time.perf_counter()
+            conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchall()
+            read_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            # BEGIN IMMEDIATE takes the write lock without changing anything.
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("ROLLBACK")
+            write_ms = (time.perf_counter() - start) * 1000
+        finally:
+            conn.close()
+        return {"read_ms": round(read_ms, 2), "write_ms": round(write_ms, 2)}
+
+    return check
+
+
+def check_source_index(index, required_roots):
+    """Per-root PDF counts from a SourcePdfIndex; fails when a required root has none."""
+
+    def check():
+        counts = index.pdf_counts()
+        empty = [root for root in required_roots if not counts.get(root)]
+        if empty:
+            raise RuntimeError(f"no PDFs indexed under: {', '.join(empty)}")
+        return {"pdfs": counts}
+
+    return check
@@ -0,0 +1,251 @@
+"""
+Incident rollups: note counts per day × participant × incident_type.
+
+Triggers on participant_notes keep two rollup tables current as notes are
+written. incident_rollups holds counts per day, participant and type.
+incident_daily_counts holds counts per day and type across all participants.
+The analytics endpoint reads whichever is smaller for the question asked, so it
+never scans the notes themselves.
+
+    python incident_rollups.py backfill [--db licenses.db]   # rebuild from participant_notes
+    python incident_rollups.py bench [--notes 1000000]       # synthetic benchmark in a temp DB
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+GROUPS = ("day", "week", "month", "participant")
+
+_PERIOD = {
+    "day": "day",
+    "week": "date(day, 'weekday 0', '-6 days')",  # the Monday that starts the week
+    "month": "substr(day, 1, 7)",
+    # Unary + keeps the planner on the (day, ...) primary key for date ranges
+    # instead of walking idx_rollups_participant to get participant order.
+    "participant": "+participant_id",
+}
+
+_NEW = "substr(new.created_at, 1, 10), COALESCE(new.participant_id, ''), COALESCE(new.incident_type, '')"
+_OLD_MATCH = """day = substr(old.created_at, 1, 10)
+              AND participant_id = COALESCE(old.participant_id, '')
+              AND incident_type = COALESCE(old.incident_type, '')"""
+_NEW_DAILY = "substr(new.created_at, 1, 10), COALESCE(new.incident_type, '')"
+_OLD_DAILY_MATCH = """day = substr(old.created_at, 1, 10)
+              AND incident_type = COALESCE(old.incident_type, '')"""
+
+_ADD = f"""
+            INSERT INTO incident_rollups (day, participant_id, incident_type, count) VALUES ({_NEW}, 1)
+            ON CONFLICT (day, participant_id, incident_type) DO UPDATE SET count = count + 1;
+            INSERT INTO incident_daily_counts (day, incident_type, count) VALUES ({_NEW_DAILY}, 1)
+            ON CONFLICT (day, incident_type) DO UPDATE SET count = count + 1;"""
+_REMOVE = f"""
+            UPDATE incident_rollups SET count = count - 1
+            WHERE {_OLD_MATCH};
+            UPDATE incident_daily_counts SET count = count - 1
+            WHERE {_OLD_DAILY_MATCH};"""
+
+
+def ensure_rollup_schema(conn):
+    has_tables = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('incident_rollups', 'incident_daily_counts')"
+    ).fetchone()[0] == 2
+
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS incident_rollups (
+            day TEXT NOT NULL,
+            participant_id TEXT NOT NULL,
+            incident_type TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, participant_id, incident_type)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_rollups_participant ON incident_rollups(participant_id, day);
+
+        CREATE TABLE IF NOT EXISTS incident_daily_counts (
+            day TEXT NOT NULL,
+            incident_type TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, incident_type)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS incident_rollups_ai AFTER INSERT ON participant_notes BEGIN{_ADD}
+        END;
+        CREATE TRIGGER IF NOT EXISTS incident_rollups_ad AFTER DELETE ON participant_notes BEGIN{_REMOVE}
+        END;
+        CREATE TRIGGER IF NOT EXISTS incident_rollups_au
+        AFTER UPDATE OF created_at, participant_id, incident_type ON participant_notes BEGIN{_REMOVE}{_ADD}
+        END;
+    """)
+
+    if not has_tables:
+        backfill(conn)
+    conn.commit()
+
+
+def backfill(conn) -> int:
+    """Rebuilds both rollup tables from participant_notes; returns the number of incident_rollups rows."""
+    with conn:
+        conn.execute("DELETE FROM incident_rollups")
+        conn.execute("""
+            INSERT INTO incident_rollups (day, participant_id, incident_type, count)
+            SELECT substr(created_at, 1, 10), COALESCE(participant_id, ''), COALESCE(incident_type, ''), COUNT(*)
+            FROM participant_notes
+            GROUP BY 1, 2, 3
+        """)
+        conn.execute("DELETE FROM incident_daily_counts")
+        conn.execute("""
+            INSERT INTO incident_daily_counts (day, incident_type, count)
+            SELECT day, incident_type, SUM(count)
+            FROM incident_rollups
+            GROUP BY 1, 2
+        """)
+    return conn.execute("SELECT COUNT(*) FROM incident_rollups").fetchone()[0]
+
+
+def rollup_counts(conn, group="week", date_from="", date_to="", participant_id="", incident_type="") -> list:
+    """
+    [{"period", "incident_type", "count"}] for the filters. period is the day, the
+    week's Monday, YYYY-MM, or the participant_id, depending on group.
+    """
+    period = _PERIOD.get(group, _PERIOD["week"])
+    # House-wide questions read the per-day totals, a few rows a day however
+    # many participants there are.
+    table = "incident_rollups" if participant_id or group == "participant" else "incident_daily_counts"
+    where = ["count > 0"]
+    params = []
+    if date_from:
+        where.append("day >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append("day <= ?")
+        params.append(date_to)
+    if participant_id:
+        where.append("participant_id = ?")
+        params.append(str(participant_id).strip())
+    if incident_type:
+        where.append("incident_type = ?")
+        params.append(incident_type)
+
+    rows = conn.execute(
+        f"""
+        SELECT {period} AS period, incident_type, SUM(count)
+        FROM {table}
+        WHERE {" AND ".join(where)}
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        """,
+        params,
+    ).fetchall()
+    return [{"period": p, "incident_type": t, "count": n} for p, t, n in rows]
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+BENCH_TYPES = (
+    "General Status", "Behavioral Concern", "Mental Status Observation", "Fighting / Aggression",
+    "Verbal Conflict", "Fall / Found Down", "Missing / Elopement", "Other",
+)
+
+
+def _bench_rows(n, participants=60, days=730):
+    start = datetime(2024, 1, 1)
+    rng = random.Random(7)
+    for i in range(n):
+        ts = start + timedelta(seconds=i * days * 86400 // n)
+        pid = str(rng.randint(1, participants))
+        yield (f"Participant {pid}", "Staff", "synthetic note", ts.strftime("%Y-%m-%d %H:%M:%S"), pid, rng.choice(BENCH_TYPES))
+
+
+def bench(n_notes: int):
+    def timed(label, fn, repeat=1):
+        best = None
+        for _ in range(repeat):
+            t = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - t
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{label:52s} {best * 1000:10.1f} ms")
+        return result
+
+    create = """
+        CREATE TABLE participant_notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            participant_name TEXT NOT NULL, staff_name TEXT, note_text TEXT NOT NULL,
+            created_at TEXT NOT NULL, participant_id TEXT, incident_type TEXT
+        )
+    """
+    insert = ("INSERT INTO participant_notes (participant_name, staff_name, note_text, created_at, participant_id, incident_type) "
+              "VALUES (?, ?, ?, ?, ?, ?)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = sqlite3.connect(os.path.join(tmp, "plain.db"))
+        plain.execute(create)
+        timed(f"insert {n_notes} notes, no rollup trigger", lambda: (plain.executemany(insert, _bench_rows(n_notes)), plain.commit()))
+
+        conn = sqlite3.connect(os.path.join(tmp, "rollup.db"))
+        conn.execute(create)
+        ensure_rollup_schema(conn)
+        timed(f"insert {n_notes} notes, with rollup trigger", lambda: (conn.executemany(insert, _bench_rows(n_notes)), conn.commit()))
+        rows = timed("backfill from participant_notes", lambda: backfill(conn))
+        print(f"{'rollup rows':52s} {rows:10d}")
+
+        # The raw queries get the same indexes notes_store.py puts on participant_notes.
+        conn.executescript("""
+            CREATE INDEX idx_notes_created ON participant_notes(created_at);
+            CREATE INDEX idx_notes_participant_created ON participant_notes(participant_id, created_at);
+            CREATE INDEX idx_notes_incident_created ON participant_notes(incident_type, created_at);
+            ANALYZE;
+        """)
+        raw_week = """
+            SELECT date(created_at, 'weekday 0', '-6 days'), incident_type, COUNT(*)
+            FROM participant_notes GROUP BY 1, 2
+        """
+        raw_participant = """
+            SELECT participant_id, incident_type, COUNT(*)
+            FROM participant_notes WHERE created_at >= ? GROUP BY 1, 2
+        """
+        raw_one = """
+            SELECT date(created_at, 'weekday 0', '-6 days'), COUNT(*)
+            FROM participant_notes WHERE participant_id = ? AND incident_type = ? GROUP BY 1
+        """
+        since = (datetime(2024, 1, 1) + timedelta(days=640)).strftime("%Y-%m-%d")
+        fall = "Fall / Found Down"
+        timed("per week, all types: raw notes", lambda: conn.execute(raw_week).fetchall(), 3)
+        timed("per week, all types: rollups", lambda: rollup_counts(conn, "week"), 3)
+        timed("per participant, last 90 days: raw notes", lambda: conn.execute(raw_participant, (since,)).fetchall(), 3)
+        timed("per participant, last 90 days: rollups", lambda: rollup_counts(conn, "participant", since), 3)
+        timed("one participant, falls per week: raw notes", lambda: conn.execute(raw_one, ("7", fall)).fetchall(), 3)
+        timed("one participant, falls per week: rollups",
+              lambda: rollup_counts(conn, "week", participant_id="7", incident_type=fall), 3)
+        conn.close()
+        plain.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Incident rollup maintenance.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_backfill = sub.add_parser("backfill", help="rebuild incident_rollups from participant_notes")
+    p_backfill.add_argument("--db", default="licenses.db")
+    p_bench = sub.add_parser("bench", help="benchmark rollups against raw scans on synthetic notes")
+    p_bench.add_argument("--notes", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "backfill":
+        conn = sqlite3.connect(args.db)
+        ensure_rollup_schema(conn)
+        start = time.perf_counter()
+        rows = backfill(conn)
+        conn.close()
+        print(f"{rows} rollup rows in {time.perf_counter() - start:.2f}s")
+    else:
+        bench(args.notes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+Per-request timing.
+
+instrument_app(app) records, for every request:
+- wall time;
+- the number of SQLite queries and their execute time, for connections opened
+  with connect_db();
+- time inside timed("http") and timed("pdf") blocks;
+- time spent rendering templates.
+
+Statements slower than SLOW_QUERY_MS also go to the slow-query log
+(slow_queries.py), inside requests or not.
+
+Each response gets a Server-Timing header, so the split shows up in the
+browser's network panel. Once the response has been sent, one JSON line per
+request goes to the "nilpf.requests" logger. A request that runs more than
+N_PLUS_ONE_QUERIES queries is logged at WARNING with its most repeated
+statement, which is usually a query issued once per row of an earlier one.
+"""
+import contextvars
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from metrics import REGISTRY
+from slow_queries import SLOW_QUERIES
+
+N_PLUS_ONE_QUERIES = int(os.getenv("N_PLUS_ONE_QUERIES", "25"))
+
+log = logging.getLogger("nilpf.requests")
+
+
+class RequestStats:
+    __slots__ = ("endpoint", "status", "started", "queries", "db_ms", "timings", "statements", "template_started")
+
+    def __init__(self, endpoint=None):
+        self.endpoint = endpoint
+        self.status = None
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.timings = {}  # kind -> [count, ms]
+        self.statements = Counter()
+        self.template_started = None
+
+    def add(self, kind, ms):
+        entry = self.timings.setdefault(kind, [0, 0.0])
+        entry[0] += 1
+        entry[1] += ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+def current_stats():
+    """The RequestStats of the request being handled, or None outside one."""
+    return _current.get()
+
+
+@contextmanager
+def timed(kind):
+    """Adds the block's wall time to `kind` (e.g. "http", "pdf") for the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            elapsed = time.perf_counter() - start
+            stats.add(kind, elapsed * 1000)
+            REGISTRY.observe(f"nilpf_{kind}_duration_seconds", (("endpoint", stats.endpoint),), elapsed)
+
+
+# -------------------------
+# SQLite
+# -------------------------
+def _record_query(cursor, sql, parameters, start, many=False):
+    elapsed = time.perf_counter() - start
+    stats = _current.get()
+    if elapsed * 1000 >= SLOW_QUERIES.threshold_ms:
+        SLOW_QUERIES.record(cursor.connection, sql, parameters, elapsed * 1000, stats and stats.endpoint, many)
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.db_ms += elapsed * 1000
+    stats.statements[sql] += 1
+    REGISTRY.observe("nilpf_sqlite_query_duration_seconds", (), elapsed)
+
+
+def _record_error(exc):
+    if "locked" in str(exc):
+        REGISTRY.inc("nilpf_sqlite_locked_total")
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        except sqlite3.OperationalError as e:
+            _record_error(e)
+            raise
+        finally:
+            _record_query(self, sql, parameters, start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        except sqlite3.OperationalError as e:
+            _record_error(e)
+            raise
+        finally:
+            _record_query(self, sql, seq_of_parameters, start, many=True)
+
+    def executescript(self, sql_script):
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        except sqlite3.OperationalError as e:
+            _record_error(e)
+            raise
+        finally:
+            _record_query(self, sql_script, (), start, many=True)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connect_db(path, **kwargs):
+    """sqlite3.connect() whose queries are counted against the current request."""
+    return sqlite3.connect(path, factory=InstrumentedConnection, **kwargs)
+
+
+# -------------------------
+# Flask hooks
+# -------------------------
+def server_timing(stats) -> str:
+    parts = [f'db;dur={stats.db_ms:.1f};desc="{stats.queries} queries"']
+    for kind, (count, ms) in sorted(stats.timings.items()):
+        parts.append(f'{kind};dur={ms:.1f};desc="{count}x"')
+    parts.append(f"total;dur={stats.elapsed_ms():.1f}")
+    return ", ".join(parts)
+
+
+def instrument_app(app, n_plus_one=N_PLUS_ONE_QUERIES):
+    from flask import before_render_template, g, request, template_rendered
+
+    REGISTRY.enable()
+
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.setLevel(os.getenv("REQUEST_LOG_LEVEL", "INFO"))
+        log.propagate = False
+
+    @app.before_request
+    def _start_request_stats():
+        g._request_stats_token = _current.set(RequestStats(request.endpoint))
+
+    @app.after_request
+    def _server_timing(response):
+        stats = _current.get()
+        if stats is not None:
+            stats.status = response.status_code
+            response.headers["Server-Timing"] = server_timing(stats)
+        return response
+
+    @app.teardown_request
+    def _log_request_stats(exc):
+        # Runs once the response has been sent, so streamed bodies are included.
+        stats = _current.get()
+        token = g.pop("_request_stats_token", None)
+        if stats is None or token is None:
+            return
+        _current.reset(token)
+
+        elapsed_ms = stats.elapsed_ms()
+        status = stats.status or (500 if exc is not None else 200)
+        endpoint = request.endpoint or "unmatched"
+        REGISTRY.inc("nilpf_requests_total", (("endpoint", endpoint), ("method", request.method), ("status", str(status))))
+        REGISTRY.observe("nilpf_request_duration_seconds", (("endpoint", endpoint),), elapsed_ms / 1000)
+
+        line = {
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": status,
+            "ms": round(elapsed_ms, 2),
+            "queries": stats.queries,
+            "db_ms": round(stats.db_ms, 2),
+        }
+        for kind, (count, ms) in sorted(stats.timings.items()):
+            line[f"{kind}_ms"] = round(ms, 2)
+            line[f"{kind}_count"] = count
+        if exc is not None:
+            line["error"] = repr(exc)
+
+        level = logging.INFO
+        if stats.queries > n_plus_one:
+            sql, count = stats.statements.most_common(1)[0]
+            line["n_plus_one"] = {"count": count, "statement": " ".join(sql.split())[:300]}
+            level = logging.WARNING
+        log.log(level, json.dumps(line))
+
+    def _template_started(sender, template, context, **extra):
+        stats = _current.get()
+        if stats is not None:
+            stats.template_started = time.perf_counter()
+
+    def _template_done(sender, template, context, **extra):
+        stats = _current.get()
+        if stats is not None and stats.template_started is not None:
+            stats.add("tpl", (time.perf_counter() - stats.template_started) * 1000)
+            stats.template_started = None
+
+    before_render_template.connect(_template_started, app, weak=False)
+    template_rendered.connect(_template_done, app, weak=False)
@@ -0,0 +1,138 @@
+"""
+In-memory registry of form builder layouts (form_builder_layouts/*.json).
+
+Every layout is read and validated once, then indexed under each name variant a
+form might be requested by, so lookups are dict hits instead of a glob + parse
+per request. The index is rebuilt when the directory's mtime changes; saves go
+through save() (temp file + os.replace), which bumps that mtime so every worker
+process notices.
+"""
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+def clean_layout_fields(fields) -> list:
+    """Normalises a raw layout list the same way the builder saves it."""
+    clean = []
+    if not isinstance(fields, list):
+        return clean
+    for f in fields:
+        if not isinstance(f, dict):
+            continue
+        try:
+            clean.append({
+                "page": int(f.get("page", 1)),
+                "type": str(f.get("type", "")).strip(),
+                "field_name": str(f.get("field_name", "")).strip(),
+                "x": float(f.get("x", 0)),
+                "y": float(f.get("y", 0)),
+                "width": float(f.get("width", 0.18)),
+            })
+        except Exception:
+            continue
+    return clean
+
+
+class LayoutRegistry:
+    def __init__(self, layout_dir, key_variants):
+        self.layout_dir = Path(layout_dir)
+        self.key_variants = key_variants
+        self._lock = threading.Lock()
+        self._mtime = None
+        # (layouts, index), replaced in one assignment so a reader never pairs
+        # one build's index with another build's layouts.
+        self._snapshot = ({}, {})
+
+    def _dir_mtime(self):
+        try:
+            return os.stat(self.layout_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _build(self):
+        layouts = {}
+        index = {}
+
+        def add(key, stem):
+            if key and key not in index:
+                index[key] = stem
+
+        paths = sorted(self.layout_dir.glob("*.json")) if self.layout_dir.exists() else []
+        for path in paths:
+            try:
+                fields = clean_layout_fields(json.loads(path.read_text(encoding="utf-8")))
+            except Exception:
+                continue
+            layouts[path.stem] = (path, fields)
+
+        # Priority: exact file names, then their name variants, then the looser
+        # matches the print route used to glob for (bare stem, "<prefix>_<name>").
+        for stem in layouts:
+            add(stem, stem)
+        for stem in layouts:
+            for key in self.key_variants(stem):
+                add(key, stem)
+        for stem in layouts:
+            add(Path(stem).stem, stem)
+        for stem in layouts:
+            parts = stem.split("_")
+            for i in range(1, len(parts)):
+                suffix = "_".join(parts[i:])
+                add(suffix, stem)
+                add(Path(suffix).stem, stem)
+
+        return layouts, index
+
+    def _current(self):
+        mtime = self._dir_mtime()
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._snapshot = self._build()
+                    self._mtime = mtime
+        return self._snapshot
+
+    def __len__(self):
+        return len(self._current()[0])
+
+    def invalidate(self):
+        with self._lock:
+            self._mtime = None
+
+    def _lookup(self, form_name):
+        layouts, index = self._current()
+        name = Path(form_name).name if form_name else ""
+        if not name:
+            return None
+        for key in (name, *self.key_variants(name), Path(name).stem):
+            stem = index.get(key)
+            if stem is not None:
+                return layouts[stem]
+        return None
+
+    def get(self, form_name) -> list:
+        """Returns a copy of the parsed layout for form_name, or [] if none was saved."""
+        hit = self._lookup(form_name)
+        return [dict(field) for field in hit[1]] if hit else []
+
+    def save(self, name, fields) -> Path:
+        clean = clean_layout_fields(fields)
+        self.layout_dir.mkdir(parents=True, exist_ok=True)
+        out = self.layout_dir / f"{Path(name).name}.json"
+        fd, tmp_name = tempfile.mkstemp(dir=self.layout_dir, prefix=".tmp-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(json.dumps(clean, indent=2))
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, out)
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        self.invalidate()
+        return out
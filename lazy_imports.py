@@ -0,0 +1,134 @@
+"""
+Heavy third-party modules, imported the first time they are used.
+
+pypdf, reportlab and requests together are about a third of app.py's import
+time. Most requests, and every gunicorn worker until its first PDF or PayPal
+call, never need them. Modules reference them through this one:
+
+    import lazy_imports as lazy
+
+    reader = lazy.PdfReader(path)      # pypdf is imported here, once
+    c = lazy.canvas.Canvas(buf, pagesize=lazy.letter)
+
+After the first access the name is a plain module attribute. letter and inch
+are reportlab's constants copied here, so module-level layout maths doesn't
+pull reportlab in.
+
+tests/test_import_budget.py enforces the budget: `import app`, timed with
+`python -X importtime` in a fresh interpreter from an empty scratch directory,
+must take at most IMPORT_BUDGET_MS and must not import any HEAVY package.
+`python lazy_imports.py budget` runs the same measurement by hand and lists the
+slowest direct imports.
+"""
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+
+# Same values as reportlab.lib.pagesizes.letter and reportlab.lib.units.inch.
+letter = (612.0, 792.0)
+inch = 72.0
+
+# name -> (module, attribute or None for the module itself)
+LAZY = {
+    "requests": ("requests", None),
+    "PdfReader": ("pypdf", "PdfReader"),
+    "PdfWriter": ("pypdf", "PdfWriter"),
+    "BooleanObject": ("pypdf.generic", "BooleanObject"),
+    "NameObject": ("pypdf.generic", "NameObject"),
+    "TextStringObject": ("pypdf.generic", "TextStringObject"),
+    "canvas": ("reportlab.pdfgen.canvas", None),
+    "simpleSplit": ("reportlab.lib.utils", "simpleSplit"),
+    "ImageReader": ("reportlab.lib.utils", "ImageReader"),
+}
+
+HEAVY = ("pypdf", "reportlab", "requests")
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "350"))
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = importlib.import_module(module_name)
+    if attr is not None:
+        value = getattr(value, attr)
+    globals()[name] = value
+    return value
+
+
+def import_times(module="app", cwd=None) -> list:
+    """[(name, self_us, cumulative_us)] from `python -X importtime -c "import module"`, in import order."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as scratch:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd or scratch,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [here, os.getenv("PYTHONPATH")]))},
+            capture_output=True,
+            text=True,
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"import {module} failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # One space follows the "|"; nested imports are indented two more per level.
+        rows.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def check_budget(module="app", budget_ms=IMPORT_BUDGET_MS, runs=5) -> int:
+    """Prints the import profile; returns the number of problems (0 when within budget)."""
+    best = None
+    for _ in range(runs):
+        rows = import_times(module)
+        total = next(us for name, _, us in rows if name == module)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+
+    # -X importtime lists a module after its imports, so the module's direct imports are
+    # the entries one level deep since the previous top-level entry.
+    children = []
+    for name, _, us in rows:
+        if not name.startswith(" "):
+            if name == module:
+                break
+            children = []
+        elif not name.startswith("   "):
+            children.append((name.strip(), us))
+    print(f"import {module}: {total / 1000:.1f} ms (best of {runs}), budget {budget_ms:.0f} ms")
+    for name, us in sorted(children, key=lambda c: -c[1])[:12]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    problems = 0
+    heavy = sorted({name.strip().split(".")[0] for name, _, _ in rows} & set(HEAVY))
+    if heavy:
+        print(f"FAIL: imported at startup: {', '.join(heavy)}")
+        problems += 1
+    if total / 1000 > budget_ms:
+        print(f"FAIL: {total / 1000:.1f} ms is over the {budget_ms:.0f} ms budget")
+        problems += 1
+    return problems
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import-time budget for app.py.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_budget = sub.add_parser("budget", help="measure `import app` and enforce the budget")
+    p_budget.add_argument("--module", default="app")
+    p_budget.add_argument("--max-ms", type=float, default=IMPORT_BUDGET_MS)
+    p_budget.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+    return 1 if check_budget(args.module, args.max_ms, args.runs) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
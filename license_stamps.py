@@ -0,0 +1,115 @@
+"""
+Per-license stamped documents.
+
+The Master License Agreement, the Master Lease and the certificate are stamped
+with the licensee's name, licensed address, state and license key. Each stamped
+PDF is generated once per (license, document version) and kept under
+stamped_docs/<license>/; later requests are served from that file. The file name
+carries a hash of the stamped fields and of the source document, so an edited
+license or a new source revision misses the cache by itself. upsert_license()
+also calls invalidate() so a re-issued license drops its old files right away.
+"""
+import hashlib
+import shutil
+import threading
+from io import BytesIO
+from pathlib import Path
+
+import lazy_imports as lazy
+from metrics import cache_result
+from pdf_response import persist_pdf
+
+STAMP_DIR = "stamped_docs"
+
+# Bump when the stamp layout changes so every cached copy is regenerated.
+STAMP_VERSION = "1"
+
+
+def license_fields(lic) -> dict:
+    """Stamped fields from a get_license_by_session() row, with the certificate's fallbacks."""
+    payer_email, payer_name, prop_addr, prop_state, license_key, created_at, product_sku = lic
+    return {
+        "name": (payer_name or "").strip() or "NILPF Registered Operator",
+        "address": (prop_addr or "").strip() or "Address on file",
+        "state": (prop_state or "").strip() or "NA",
+        "license_key": (license_key or "").strip() or "NILPF-NA-UNKNOWN",
+        "issued": (created_at or "").strip(),
+    }
+
+
+def _hash(*parts) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(str(p).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _stamp_overlay(width, height, fields):
+    buf = BytesIO()
+    c = lazy.canvas.Canvas(buf, pagesize=(width, height))
+    c.setFont("Helvetica", 7.5)
+    c.drawCentredString(width / 2, 26, f"Licensed to {fields['name']}  |  {fields['address']}, {fields['state']}")
+    c.drawCentredString(width / 2, 16, f"License {fields['license_key']}  |  Site-specific, non-transferable")
+    c.showPage()
+    c.save()
+    buf.seek(0)
+    return lazy.PdfReader(buf)
+
+
+def stamp_pdf(source_path, fields):
+    """Returns render(fh) writing source_path with the license footer merged onto every page."""
+    def render(fh):
+        reader = lazy.PdfReader(source_path)
+        writer = lazy.PdfWriter()
+        overlays = {}
+        for page in reader.pages:
+            box = page.mediabox
+            size = (round(float(box.width), 2), round(float(box.height), 2))
+            # One overlay per page size; most documents are a single size.
+            if size not in overlays:
+                overlays[size] = _stamp_overlay(size[0], size[1], fields).pages[0]
+            out = writer.add_page(page)
+            out.merge_page(overlays[size])
+            # merge_page leaves the combined content stream uncompressed.
+            out.compress_content_streams()
+        writer.write(fh)
+    return render
+
+
+class LicenseStamps:
+    def __init__(self, stamp_dir=STAMP_DIR):
+        self.stamp_dir = Path(stamp_dir)
+        self._guard = threading.Lock()
+        self._locks = {}
+
+    def license_dir(self, session_id) -> Path:
+        return self.stamp_dir / _hash("license", session_id)[:24]
+
+    def get(self, session_id, doc, fields, version, render) -> Path:
+        """
+        Path of the stamped doc for this license and document version, calling
+        render(fh) to create it on a miss. Superseded copies of doc are removed.
+        """
+        key = _hash(STAMP_VERSION, *(fields[k] for k in sorted(fields)), version)[:16]
+        path = self.license_dir(session_id) / f"{doc}-{key}.pdf"
+        if path.exists():
+            cache_result("stamped_docs", True)
+            return path
+        cache_result("stamped_docs", False)
+
+        with self._guard:
+            lock = self._locks.setdefault(path.as_posix(), threading.Lock())
+        with lock:
+            if not path.exists():
+                persist_pdf(render, path)
+                for old in path.parent.glob(f"{doc}-*.pdf"):
+                    if old != path:
+                        try:
+                            old.unlink()
+                        except OSError:
+                            pass
+        return path
+
+    def invalidate(self, session_id):
+        shutil.rmtree(self.license_dir(session_id), ignore_errors=True)
@@ -0,0 +1,270 @@
+"""
+Prometheus-style metrics shared by every gunicorn worker.
+
+Each worker records counters and histograms in process memory: a dict update
+under a lock, with no I/O on the request path. A background thread copies the
+series that changed into an SQLite file (METRICS_DB, default metrics.db) every
+FLUSH_INTERVAL seconds, one row per worker and series. /metrics flushes the
+serving worker, then sums every worker's rows. Other workers' numbers can be up
+to FLUSH_INTERVAL old. When gunicorn recycles a worker, its counters must not
+go backwards, so a scrape folds the rows of any worker on this host that has exited
+and not flushed for RETIRE_AFTER seconds into a single "retired" worker. The
+table therefore stays at one set of rows per live worker, plus that one.
+
+Recording is off until enable() is called (instrumentation.instrument_app
+does), so CLI tools that share these modules never touch the metrics file.
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+
+METRICS_DB = os.getenv("METRICS_DB", "metrics.db")
+FLUSH_INTERVAL = 5.0
+RETIRE_AFTER = 60.0
+RETIRED = "retired"
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help)
+METRICS = {
+    "nilpf_requests_total": ("counter", "HTTP requests by endpoint, method and status."),
+    "nilpf_request_duration_seconds": ("histogram", "HTTP request wall time by endpoint."),
+    "nilpf_sqlite_query_duration_seconds": ("histogram", "SQLite execute time per query."),
+    "nilpf_sqlite_locked_total": ("counter", "SQLite queries that failed with 'database is locked'."),
+    "nilpf_pdf_duration_seconds": ("histogram", "PDF rendering time by endpoint."),
+    "nilpf_http_duration_seconds": ("histogram", "Outbound HTTP time by endpoint."),
+    "nilpf_paypal_request_duration_seconds": ("histogram", "PayPal API call latency by operation."),
+    "nilpf_paypal_errors_total": ("counter", "PayPal API calls that raised or returned HTTP >= 400."),
+    "nilpf_cache_requests_total": ("counter", "Cache lookups by cache and result (hit or miss)."),
+}
+
+
+class Registry:
+    def __init__(self, db_path=METRICS_DB, flush_interval=FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.enabled = False
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        # A forked worker starts with empty series of its own and a new worker id.
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._values = {}
+        self._dirty = set()
+        self._thread = None
+        self.worker = f"{socket.gethostname()}:{os.getpid()}:{time.time():.0f}"
+
+    def enable(self):
+        self.enabled = True
+
+    def _start_flusher(self):
+        self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+        self._thread.start()
+
+    def inc(self, name, labels=(), value=1):
+        if not self.enabled:
+            return
+        key = (name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+            self._dirty.add(key)
+            if self._thread is None:
+                self._start_flusher()
+
+    def observe(self, name, labels, seconds):
+        if not self.enabled:
+            return
+        key = (name, labels)
+        with self._lock:
+            hist = self._values.get(key)
+            if hist is None:
+                # Per-bucket counts (the last one is +Inf), then sum.
+                hist = self._values[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+            hist[bisect_left(BUCKETS, seconds)] += 1
+            hist[-1] += seconds
+            self._dirty.add(key)
+            if self._thread is None:
+                self._start_flusher()
+
+    # -------------------------
+    # Shared store
+    # -------------------------
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=2)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS metric_series (
+                worker TEXT NOT NULL,
+                name TEXT NOT NULL,
+                labels TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (worker, name, labels)
+            )
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(metric_series)")}
+        if "updated_at" not in columns:
+            conn.execute("ALTER TABLE metric_series ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+        return conn
+
+    def flush(self):
+        """Writes this worker's changed series to the shared store."""
+        with self._flush_lock:
+            now = time.time()
+            with self._lock:
+                rows = [
+                    (self.worker, name, json.dumps(labels), json.dumps(self._values[(name, labels)]), now)
+                    for name, labels in self._dirty
+                ]
+                dirty, self._dirty = self._dirty, set()
+            if not rows:
+                return
+            try:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO metric_series (worker, name, labels, value, updated_at) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            rows,
+                        )
+                finally:
+                    conn.close()
+            except sqlite3.Error:
+                # Retried on the next flush.
+                with self._lock:
+                    self._dirty |= dirty
+                raise
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass
+
+    def _retire(self, conn):
+        """Folds the rows of exited workers on this host into the RETIRED worker's rows."""
+        cutoff = time.time() - RETIRE_AFTER
+        host = socket.gethostname()
+        # IMMEDIATE so two workers scraping at once can't both fold the same rows.
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            workers = conn.execute(
+                "SELECT worker FROM metric_series WHERE worker != ? GROUP BY worker HAVING MAX(updated_at) < ?",
+                (RETIRED, cutoff),
+            ).fetchall()
+            for (worker,) in workers:
+                if _worker_alive(worker, host):
+                    continue
+                rows = conn.execute(
+                    "SELECT name, labels, value FROM metric_series WHERE worker = ?", (worker,)
+                ).fetchall()
+                for name, labels, value in rows:
+                    total = conn.execute(
+                        "SELECT value FROM metric_series WHERE worker = ? AND name = ? AND labels = ?",
+                        (RETIRED, name, labels),
+                    ).fetchone()
+                    value = json.loads(value)
+                    if total is not None:
+                        value = _add(json.loads(total[0]), value)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO metric_series (worker, name, labels, value, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (RETIRED, name, labels, json.dumps(value), time.time()),
+                    )
+                conn.execute("DELETE FROM metric_series WHERE worker = ?", (worker,))
+
+    def collect(self) -> dict:
+        """{(name, labels): value} summed over every worker's last flush."""
+        try:
+            self.flush()
+        except sqlite3.Error:
+            pass
+        totals = {}
+        if not os.path.exists(self.db_path):
+            return totals
+        conn = self._connect()
+        try:
+            try:
+                self._retire(conn)
+            except sqlite3.Error:
+                # Retried on the next scrape; the rows still add up meanwhile.
+                pass
+            rows = conn.execute("SELECT name, labels, value FROM metric_series").fetchall()
+        finally:
+            conn.close()
+        for name, labels, value in rows:
+            key = (name, tuple(tuple(pair) for pair in json.loads(labels)))
+            value = json.loads(value)
+            totals[key] = _add(totals[key], value) if key in totals else value
+        return totals
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        by_name = {}
+        for (name, labels), value in self.collect().items():
+            by_name.setdefault(name, []).append((labels, value))
+
+        out = []
+        for name in sorted(by_name):
+            kind, help_text = METRICS.get(name, ("untyped", ""))
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(by_name[name]):
+                if kind == "histogram":
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS + (float("inf"),), value[:-1]):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        out.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                    out.append(f"{name}_sum{_labels(labels)} {value[-1]:.6f}")
+                    out.append(f"{name}_count{_labels(labels)} {cumulative}")
+                else:
+                    out.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(out) + "\n"
+
+
+def _add(a, b):
+    """Sums two counter values, or two histograms bucket by bucket."""
+    if isinstance(a, list):
+        return [x + y for x, y in zip(a, b)]
+    return a + b
+
+
+def _worker_alive(worker, host) -> bool:
+    """Workers are "host:pid:started"; only ones on this host can be checked, so others count as alive."""
+    parts = worker.rsplit(":", 2)
+    if len(parts) != 3 or parts[0] != host:
+        return True
+    try:
+        os.kill(int(parts[1]), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+REGISTRY = Registry()
+
+
+def cache_result(cache: str, hit: bool):
+    REGISTRY.inc("nilpf_cache_requests_total", (("cache", cache), ("result", "hit" if hit else "miss")))
@@ -0,0 +1,516 @@
+"""
+Incident / status notes: the keyset-paged notes page, and the rollup-backed
+analytics JSON and dashboard.
+"""
+import time
+
+from flask import Blueprint, current_app, jsonify, redirect, render_template_string, request, session, stream_with_context
+
+from database import DB_PATH, get_license_by_session
+from incident_rollups import GROUPS as ROLLUP_GROUPS, rollup_counts
+from instrumentation import connect_db
+from notes_store import query_notes
+
+bp = Blueprint("notes", __name__)
+
+# -------------------------
+# NOTES PAGE
+# -------------------------
+# Compiled once per app when the blueprint is registered (see _compile_notes_template);
+# autoescaped like every string template in app.jinja_env.
+NOTES_TEMPLATE = """
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>Incident / Status Documentation</title>
+        <style>
+          body {
+            font-family: Arial, sans-serif;
+            margin: 0;
+            background: #f6f7fb;
+            color: #111;
+          }
+          .topbar {
+            background: #111;
+            color: #fff;
+            padding: 10px 16px;
+          }
+          .topbar a {
+            color: #fff;
+            margin-right: 20px;
+            text-decoration: none;
+            font-weight: 700;
+          }
+          .wrap {
+            max-width: 1050px;
+            margin: 0 auto;
+            padding: 24px;
+          }
+          .card {
+            background: #fff;
+            border: 2px solid #111;
+            border-radius: 18px;
+            padding: 20px;
+            margin-bottom: 18px;
+          }
+          h1 {
+            margin: 0 0 8px 0;
+            font-size: 30px;
+          }
+          .sub {
+            color: #444;
+            margin-bottom: 18px;
+          }
+          .grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
+            gap: 14px;
+          }
+          label {
+            display: block;
+            font-weight: 700;
+            margin-bottom: 6px;
+          }
+          select, input, textarea {
+            width: 100%;
+            padding: 12px;
+            border: 2px solid #111;
+            border-radius: 12px;
+            font-size: 15px;
+            background: #fff;
+          }
+          textarea {
+            min-height: 150px;
+            resize: vertical;
+          }
+          .btn {
+            display: inline-block;
+            text-decoration: none;
+            border: 2px solid #111;
+            background: #111;
+            color: #fff;
+            padding: 12px 16px;
+            border-radius: 999px;
+            font-weight: 700;
+            cursor: pointer;
+          }
+          .entry {
+            border: 2px solid #111;
+            border-radius: 16px;
+            padding: 16px;
+            margin-bottom: 14px;
+            background: #fff;
+          }
+          .entry-head {
+            display: flex;
+            gap: 10px;
+            align-items: center;
+            flex-wrap: wrap;
+            margin-bottom: 6px;
+          }
+          .pill {
+            display: inline-block;
+            border: 2px solid #111;
+            border-radius: 999px;
+            padding: 4px 10px;
+            font-size: 12px;
+            font-weight: 700;
+            background: #f3f3f3;
+          }
+          .meta {
+            color: #444;
+            font-size: 14px;
+            margin-bottom: 10px;
+          }
+          .body {
+            white-space: pre-wrap;
+            line-height: 1.45;
+          }
+        </style>
+      </head>
+      <body>
+        <div class="topbar">
+          <a href="/home">Home</a>
+          <a href="/participants">Add / View Participants</a>
+          <a href="/documents?tab=dashboard">Dashboard</a>
+          <a href="/notes/dashboard">Incident Analytics</a>
+          {% if selected_pid %}<a href="/participant-workflow/{{ selected_pid }}">Back to Participant Workflow</a>{% endif %}
+        </div>
+
+        <div class="wrap">
+          <div class="card">
+            <h1>Incident / Status Documentation</h1>
+            <div class="sub">Document observations noticed during normal routine house checks and participant-related events.</div>
+            <div class="sub"><strong>{% if selected_pid and selected_name %}Participant Focus: {{ selected_name }} (ID {{ selected_pid }}){% else %}All participants{% endif %}</strong></div>
+
+            <form method="post">
+              <div class="grid">
+                <div>
+                  <label>Participant</label>
+                  <select name="participant_id" required>
+                    <option value="">Select participant</option>
+                    {% for pid, name in participant_options %}
+                    <option value="{{ pid }}"{% if pid == selected_pid %} selected{% endif %}>{{ name }} (ID {{ pid }})</option>
+                    {% endfor %}
+                  </select>
+                </div>
+                <div>
+                  <label>Incident Type</label>
+                  <select name="incident_type" required>
+                    <option value="">Select incident type</option>
+                    {% for item in incident_types %}
+                    <option value="{{ item }}">{{ item }}</option>
+                    {% endfor %}
+                  </select>
+                </div>
+                <div>
+                  <label>Staff / Composer</label>
+                  <input name="staff_name" required>
+                </div>
+              </div>
+
+              <div style="margin-top:14px;">
+                <label>Incident / Status Details</label>
+                <textarea name="note_text" required></textarea>
+              </div>
+
+              <div style="margin-top:14px;">
+                <button class="btn" type="submit">Save Incident Note</button>
+              </div>
+            </form>
+          </div>
+
+          <div class="card">
+            <h2 style="margin-top:0;">Timeline</h2>
+            <form method="get" style="margin-bottom:14px;">
+              <input type="hidden" name="participant_id" value="{{ selected_pid }}">
+              <div class="grid">
+                <div>
+                  <label>Search</label>
+                  <input name="q" value="{{ filter_q }}" placeholder="Words in notes, staff, type">
+                </div>
+                <div>
+                  <label>Incident Type</label>
+                  <select name="incident_type">
+                    <option value="">All types</option>
+                    {% for item in incident_types %}
+                    <option value="{{ item }}"{% if item == filter_type %} selected{% endif %}>{{ item }}</option>
+                    {% endfor %}
+                  </select>
+                </div>
+                <div>
+                  <label>From</label>
+                  <input type="date" name="from" value="{{ filter_from }}">
+                </div>
+                <div>
+                  <label>To</label>
+                  <input type="date" name="to" value="{{ filter_to }}">
+                </div>
+              </div>
+              <div style="margin-top:14px;">
+                <button class="btn" type="submit">Filter</button>
+                {% if before_id %}<a href="{{ url_for('notes.notes', **filter_args) }}">Newest</a>{% endif %}
+              </div>
+            </form>
+            {% for note_id, participant_name, staff_name, incident_type, note_text, created_at, participant_id in page %}
+            <div class="entry">
+              <div class="entry-head">
+                <strong>{{ participant_name }}</strong>
+                <span class="pill">{{ incident_type }}</span>
+                <span class="pill">ID {{ participant_id or "-" }}</span>
+              </div>
+              <div class="meta">Staff: {{ staff_name }} | {{ created_at }}</div>
+              <div class="body">{{ note_text }}</div>
+            </div>
+            {% else %}
+            <div class="sub">No incident or status notes match.</div>
+            {% endfor %}
+            {% if page.next_before_id %}
+            <a class="btn" href="{{ url_for('notes.notes', before=page.next_before_id, **filter_args) }}">Older notes</a>
+            {% endif %}
+          </div>
+        </div>
+      </body>
+    </html>
+"""
+
+
+@bp.record_once
+def _compile_notes_template(state):
+    state.app.extensions["notes_template"] = state.app.jinja_env.from_string(NOTES_TEMPLATE)
+
+
+@bp.route("/notes", methods=["GET", "POST"])
+def notes():
+    session_id = session.get("licensed_session_id") or request.args.get("session_id") or session.get("licensed_session_id") or request.args.get("session_id")
+    if not session_id:
+        return redirect("/")
+
+    session["licensed_session_id"] = session_id
+
+    lic = get_license_by_session(session_id)
+    if not lic:
+        session.clear()
+        return redirect("/")
+
+    from datetime import datetime
+
+    incident_types = [
+        "General Status",
+        "Behavioral Concern",
+        "Mental Status Observation",
+        "Fighting / Aggression",
+        "Verbal Conflict",
+        "Intoxication / Suspected Alcohol",
+        "Fall / Found Down",
+        "Missing / Elopement",
+        "Noncompliance with Program Rules",
+        "Property Damage",
+        "Visitor Issue",
+        "Other"
+    ]
+
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+
+    participants = cur.execute("""
+        SELECT id, legal_name, preferred_name
+        FROM participants
+        ORDER BY COALESCE(NULLIF(TRIM(preferred_name), ''), TRIM(legal_name)) COLLATE NOCASE
+    """).fetchall()
+
+    selected_pid = (request.args.get("participant_id") or request.form.get("participant_id") or "").strip()
+
+    if request.method == "POST":
+        participant_id = (request.form.get("participant_id") or "").strip()
+        staff_name = (request.form.get("staff_name") or "").strip()
+        incident_type = (request.form.get("incident_type") or "").strip()
+        note_text = (request.form.get("note_text") or "").strip()
+
+        participant_name = ""
+        if participant_id:
+            row = cur.execute("""
+                SELECT id, legal_name, preferred_name
+                FROM participants
+                WHERE id = ?
+            """, (participant_id,)).fetchone()
+            if row:
+                pid, legal_name, preferred_name = row
+                participant_name = (preferred_name or "").strip() or (legal_name or "").strip() or f"Participant {pid}"
+
+        if participant_id and participant_name and staff_name and incident_type and note_text:
+            created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            cur.execute("""
+                INSERT INTO participant_notes
+                (participant_name, staff_name, note_text, created_at, participant_id, incident_type)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (participant_name, staff_name, note_text, created_at, participant_id, incident_type))
+            conn.commit()
+            selected_pid = participant_id
+
+    # Filters; the timeline is read one keyset page at a time (notes_store.py).
+    filter_type = (request.args.get("incident_type") or "").strip()
+    filter_from = (request.args.get("from") or "").strip()
+    filter_to = (request.args.get("to") or "").strip()
+    filter_q = (request.args.get("q") or "").strip()
+    before_id = request.args.get("before", type=int)
+
+    page = query_notes(
+        conn,
+        participant_id=selected_pid,
+        incident_type=filter_type,
+        date_from=filter_from,
+        date_to=filter_to,
+        q=filter_q,
+        before_id=before_id,
+    )
+
+    filter_args = {k: v for k, v in (
+        ("participant_id", selected_pid),
+        ("incident_type", filter_type),
+        ("from", filter_from),
+        ("to", filter_to),
+        ("q", filter_q),
+    ) if v}
+
+    participant_options = []
+    selected_name = ""
+    for pid, legal_name, preferred_name in participants:
+        display_name = (preferred_name or "").strip() or (legal_name or "").strip() or f"Participant {pid}"
+        if str(pid) == str(selected_pid):
+            selected_name = display_name
+        participant_options.append((str(pid), display_name))
+
+    context = dict(
+        participant_options=participant_options,
+        incident_types=incident_types,
+        selected_pid=selected_pid,
+        selected_name=selected_name,
+        filter_type=filter_type,
+        filter_from=filter_from,
+        filter_to=filter_to,
+        filter_q=filter_q,
+        filter_args=filter_args,
+        before_id=before_id,
+        page=page,
+    )
+    current_app.update_template_context(context)
+
+    # Rows come off the cursor as the page is sent, a few dozen template chunks
+    # per write; conn closes when the response does.
+    stream = current_app.extensions["notes_template"].stream(context)
+    stream.enable_buffering(64)
+    resp = current_app.response_class(stream_with_context(stream))
+    resp.call_on_close(conn.close)
+    return resp
+
+
+def _incident_analytics(args):
+    """Rollup counts for the analytics filters in args; see incident_rollups.py."""
+    group = args.get("group") or "week"
+    if group not in ROLLUP_GROUPS:
+        group = "week"
+    filters = {
+        "date_from": (args.get("from") or "").strip(),
+        "date_to": (args.get("to") or "").strip(),
+        "participant_id": (args.get("participant_id") or "").strip(),
+        "incident_type": (args.get("incident_type") or "").strip(),
+    }
+
+    conn = connect_db(DB_PATH)
+    counts = rollup_counts(conn, group, **filters)
+    participants = {
+        str(pid): (preferred_name or "").strip() or (legal_name or "").strip() or f"Participant {pid}"
+        for pid, legal_name, preferred_name in conn.execute("SELECT id, legal_name, preferred_name FROM participants")
+    }
+    conn.close()
+    return group, filters, counts, participants
+
+@bp.route("/notes/analytics")
+def notes_analytics():
+    # Incident counts per day / week / month or per participant, read from the incident_rollups table.
+    session_id = session.get("licensed_session_id") or request.args.get("session_id")
+    if not session_id or not get_license_by_session(session_id):
+        return jsonify(error="License session required."), 401
+
+    session["licensed_session_id"] = session_id
+
+    started = time.perf_counter()
+    group, filters, counts, participants = _incident_analytics(request.args)
+    if group == "participant":
+        for row in counts:
+            row["participant_name"] = participants.get(row["period"], "")
+
+    return jsonify(
+        group=group,
+        filters=filters,
+        took_ms=round((time.perf_counter() - started) * 1000, 2),
+        total=sum(row["count"] for row in counts),
+        counts=counts,
+    )
+
+@bp.route("/notes/dashboard")
+def notes_dashboard():
+    session_id = session.get("licensed_session_id") or request.args.get("session_id")
+    if not session_id or not get_license_by_session(session_id):
+        return redirect("/")
+
+    session["licensed_session_id"] = session_id
+
+    from datetime import date, timedelta
+
+    args = request.args.to_dict()
+    if not args.get("from") and not args.get("to"):
+        args["from"] = (date.today() - timedelta(weeks=12)).isoformat()
+    group, filters, counts, participants = _incident_analytics(args)
+
+    types = sorted({row["incident_type"] for row in counts})
+    table = {}
+    for row in counts:
+        table.setdefault(row["period"], {})[row["incident_type"]] = row["count"]
+    labels = {period: participants.get(period, f"Participant {period}") if group == "participant" else period
+              for period in table}
+
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>Incident Analytics</title>
+        <style>
+          body { font-family: Arial, sans-serif; margin: 0; background: #f6f7fb; color: #111; }
+          .topbar { background: #111; color: #fff; padding: 10px 16px; }
+          .topbar a { color: #fff; margin-right: 20px; text-decoration: none; font-weight: 700; }
+          .wrap { max-width: 1200px; margin: 0 auto; padding: 24px; }
+          .card { background: #fff; border: 2px solid #111; border-radius: 18px; padding: 20px; margin-bottom: 18px; overflow-x: auto; }
+          .grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 14px; }
+          label { display: block; font-weight: 700; margin-bottom: 6px; }
+          select, input { width: 100%; padding: 10px; border: 2px solid #111; border-radius: 12px; font-size: 15px; background: #fff; box-sizing: border-box; }
+          .btn { display: inline-block; border: 2px solid #111; background: #111; color: #fff; padding: 10px 16px; border-radius: 999px; font-weight: 700; cursor: pointer; }
+          table { border-collapse: collapse; width: 100%; font-size: 14px; }
+          th, td { border-bottom: 1px solid #ddd; padding: 8px; text-align: right; white-space: nowrap; }
+          th:first-child, td:first-child { text-align: left; }
+          .zero { color: #bbb; }
+        </style>
+      </head>
+      <body>
+        <div class="topbar">
+          <a href="/home">Home</a>
+          <a href="/notes">Incident / Status Notes</a>
+          <a href="/documents?tab=dashboard">Dashboard</a>
+        </div>
+        <div class="wrap">
+          <div class="card">
+            <h1 style="margin-top:0;">Incident Analytics</h1>
+            <form method="get">
+              <div class="grid">
+                <div>
+                  <label>Group by</label>
+                  <select name="group">
+                    {% for g in groups %}<option value="{{ g }}"{% if g == group %} selected{% endif %}>{{ g|capitalize }}</option>{% endfor %}
+                  </select>
+                </div>
+                <div>
+                  <label>Participant</label>
+                  <select name="participant_id">
+                    <option value="">All participants</option>
+                    {% for pid, name in participants|dictsort %}<option value="{{ pid }}"{% if pid == filters.participant_id %} selected{% endif %}>{{ name }} (ID {{ pid }})</option>{% endfor %}
+                  </select>
+                </div>
+                <div><label>From</label><input type="date" name="from" value="{{ filters.date_from }}"></div>
+                <div><label>To</label><input type="date" name="to" value="{{ filters.date_to }}"></div>
+              </div>
+              <div style="margin-top:14px;">
+                <button class="btn" type="submit">Update</button>
+                <a href="{{ url_for('notes.notes_analytics', **request.args) }}">JSON</a>
+              </div>
+            </form>
+          </div>
+          <div class="card">
+            {% if table %}
+            <table>
+              <tr>
+                <th>{{ "Participant" if group == "participant" else group|capitalize }}</th>
+                {% for t in types %}<th>{{ t or "Untyped" }}</th>{% endfor %}
+                <th>Total</th>
+              </tr>
+              {% for period, row in table|dictsort %}
+              <tr>
+                <td>{{ labels[period] }}</td>
+                {% for t in types %}<td{% if not row.get(t) %} class="zero"{% endif %}>{{ row.get(t, 0) }}</td>{% endfor %}
+                <td><strong>{{ row.values()|sum }}</strong></td>
+              </tr>
+              {% endfor %}
+            </table>
+            {% else %}
+            <div>No incident notes in this window.</div>
+            {% endif %}
+          </div>
+        </div>
+      </body>
+    </html>
+    """, groups=ROLLUP_GROUPS, group=group, filters=filters, participants=participants,
+        types=types, table=table, labels=labels)
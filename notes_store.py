@@ -0,0 +1,152 @@
+"""
+Queries for participant_notes (the incident / status timeline).
+
+Notes are read newest first in fixed-size pages using keyset pagination
+(WHERE id < :before ORDER BY id DESC LIMIT n). Each page costs the same however
+long the history gets. Free-text search goes through participant_notes_fts, an
+FTS5 index over note_text, staff_name and incident_type that triggers keep in
+sync with the base table.
+"""
+from datetime import datetime, timedelta
+
+from doc_search import fts_query
+
+PAGE_SIZE = 50
+
+
+def ensure_notes_schema(conn):
+    """Columns older databases lack, the filter indexes, and the FTS index and its triggers."""
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(participant_notes)")}
+    if "participant_id" not in cols:
+        conn.execute("ALTER TABLE participant_notes ADD COLUMN participant_id TEXT")
+    if "incident_type" not in cols:
+        conn.execute("ALTER TABLE participant_notes ADD COLUMN incident_type TEXT")
+
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'participant_notes_fts'"
+    ).fetchone()
+
+    conn.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_notes_participant ON participant_notes(participant_id, id);
+        CREATE INDEX IF NOT EXISTS idx_notes_incident ON participant_notes(incident_type, id);
+        CREATE INDEX IF NOT EXISTS idx_notes_created ON participant_notes(created_at);
+        CREATE INDEX IF NOT EXISTS idx_notes_participant_created ON participant_notes(participant_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_notes_incident_created ON participant_notes(incident_type, created_at);
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS participant_notes_fts USING fts5(
+            note_text,
+            staff_name,
+            incident_type,
+            content = 'participant_notes',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS participant_notes_fts_ai AFTER INSERT ON participant_notes BEGIN
+            INSERT INTO participant_notes_fts (rowid, note_text, staff_name, incident_type)
+            VALUES (new.id, new.note_text, new.staff_name, new.incident_type);
+        END;
+        CREATE TRIGGER IF NOT EXISTS participant_notes_fts_ad AFTER DELETE ON participant_notes BEGIN
+            INSERT INTO participant_notes_fts (participant_notes_fts, rowid, note_text, staff_name, incident_type)
+            VALUES ('delete', old.id, old.note_text, old.staff_name, old.incident_type);
+        END;
+        CREATE TRIGGER IF NOT EXISTS participant_notes_fts_au AFTER UPDATE ON participant_notes BEGIN
+            INSERT INTO participant_notes_fts (participant_notes_fts, rowid, note_text, staff_name, incident_type)
+            VALUES ('delete', old.id, old.note_text, old.staff_name, old.incident_type);
+            INSERT INTO participant_notes_fts (rowid, note_text, staff_name, incident_type)
+            VALUES (new.id, new.note_text, new.staff_name, new.incident_type);
+        END;
+    """)
+
+    if not has_fts:
+        # Notes written before the index existed.
+        conn.execute("INSERT INTO participant_notes_fts (participant_notes_fts) VALUES ('rebuild')")
+    conn.commit()
+
+
+def _day(value):
+    try:
+        return datetime.strptime((value or "").strip(), "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+class NotesPage:
+    """
+    Iterates one page of rows straight off the cursor. next_before_id is set once
+    iteration has gone past the last row and is None on the last page.
+    """
+
+    def __init__(self, cursor, limit):
+        self._cursor = cursor
+        self._limit = limit
+        self.next_before_id = None
+
+    def __iter__(self):
+        last_id = None
+        for i, row in enumerate(self._cursor):
+            if i == self._limit:
+                self.next_before_id = last_id
+                break
+            last_id = row[0]
+            yield row
+        self._cursor.close()
+
+
+def query_notes(conn, participant_id="", incident_type="", date_from="", date_to="", q="",
+                before_id=None, limit=PAGE_SIZE):
+    """
+    One page of notes, newest first, matching every filter given. Dates are
+    YYYY-MM-DD and inclusive. Returns a NotesPage of (id, participant_name,
+    staff_name, incident_type, note_text, created_at, participant_id) rows.
+    Rows are read lazily, so conn must stay open until the page is consumed.
+    """
+    where = []
+    params = []
+
+    # Free text drives the query from the FTS index, walked newest rowid first,
+    # so a page stops after `limit` hits instead of collecting every match.
+    # Whole words only: prefix terms have no prefix index to use here.
+    match = fts_query(q, prefix=False)
+    if match:
+        sql = """
+            SELECT n.id, n.participant_name, n.staff_name, n.incident_type, n.note_text, n.created_at, n.participant_id
+            FROM participant_notes_fts f
+            JOIN participant_notes n ON n.id = f.rowid
+        """
+        id_col = "f.rowid"
+        where.append("participant_notes_fts MATCH ?")
+        params.append(match)
+    else:
+        sql = """
+            SELECT id, participant_name, staff_name, incident_type, note_text, created_at, participant_id
+            FROM participant_notes n
+        """
+        id_col = "n.id"
+
+    if participant_id:
+        where.append("n.participant_id = ?")
+        params.append(str(participant_id).strip())
+    if incident_type:
+        where.append("n.incident_type = ?")
+        params.append(incident_type)
+
+    start = _day(date_from)
+    if start:
+        where.append("n.created_at >= ?")
+        params.append(start.strftime("%Y-%m-%d"))
+    end = _day(date_to)
+    if end:
+        where.append("n.created_at < ?")
+        params.append((end + timedelta(days=1)).strftime("%Y-%m-%d"))
+
+    if before_id:
+        where.append(f"{id_col} < ?")
+        params.append(int(before_id))
+
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {id_col} DESC LIMIT ?"
+    params.append(limit + 1)
+
+    return NotesPage(conn.execute(sql, params), limit)
@@ -0,0 +1,122 @@
+"""
+Operations endpoints: health and readiness probes, /metrics, and the
+token-protected request profiles and slow-query report under /admin.
+"""
+import os
+from pathlib import Path
+
+from flask import Blueprint, abort, jsonify, render_template_string, request, send_file
+
+from database import DB_PATH
+from health_checks import ReadinessChecks, check_source_index, check_sqlite
+from metrics import REGISTRY
+from paypal_api import paypal_token_status
+from profiling import PROFILE_DIR, list_profiles, top_functions, valid_token
+from registries import LAYOUTS, LAYOUT_DIR, SOURCE_PDFS
+from slow_queries import SLOW_QUERIES, report as slow_query_report
+
+bp = Blueprint("ops", __name__)
+
+
+@bp.route("/health")
+def health():
+    return jsonify(ok=True)
+
+# Deep checks for load balancers; /health stays a cheap liveness probe.
+def check_layouts():
+    if not os.path.isdir(LAYOUT_DIR):
+        raise RuntimeError(f"{LAYOUT_DIR} not found")
+    return {"layouts": len(LAYOUTS)}
+
+READY = ReadinessChecks()
+READY.add("database", check_sqlite(DB_PATH, "licenses", timeout=0.5), timeout=0.5)
+# The two source trees must hold PDFs; static/documents is only a fallback and is reported, not required.
+READY.add("source_pdfs", check_source_index(SOURCE_PDFS, ["EF_v2.2", "Core-v2.1"]), timeout=0.2)
+READY.add("layouts", check_layouts, timeout=0.5)
+READY.add("paypal_token", paypal_token_status, timeout=0.05, critical=False)
+
+@bp.route("/ready")
+def ready():
+    report = READY.run()
+    return jsonify(report), 200 if report["ready"] else 503
+
+# -------------------------
+# Request profiles (profiling.py)
+# -------------------------
+def require_profile_token():
+    # Header only: a ?token= would end up in access logs, proxies and browser history.
+    if not valid_token(request.headers.get("X-Profile-Token")):
+        abort(404)
+
+@bp.route("/admin/profiles")
+def admin_profiles():
+    require_profile_token()
+    return jsonify(profiles=list_profiles())
+
+@bp.route("/admin/profiles/<route>")
+def admin_profile_top(route):
+    require_profile_token()
+    report = top_functions(route, limit=request.args.get("limit", 30, type=int))
+    if request.args.get("format") == "json":
+        return jsonify(report)
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <title>Profile: {{ r.endpoint }}</title>
+        <style>
+          body { font-family: Arial, sans-serif; margin: 24px; color: #111; }
+          table { border-collapse: collapse; margin-bottom: 24px; }
+          th, td { border-bottom: 1px solid #ddd; padding: 4px 10px; text-align: left; font-size: 13px; }
+          td.n { text-align: right; font-variant-numeric: tabular-nums; }
+        </style>
+      </head>
+      <body>
+        <h1>{{ r.endpoint }}</h1>
+        <p>{{ r.profiles }} profiles, {{ r.samples }} samples.</p>
+        {% for title, key in [("Self time", "self"), ("Total time (including callees)", "total")] %}
+        <h2>{{ title }}</h2>
+        <table>
+          <tr><th>Function</th><th>Samples</th><th>%</th></tr>
+          {% for row in r[key] %}
+          <tr><td>{{ row.function }}</td><td class="n">{{ row.samples }}</td><td class="n">{{ row.pct }}</td></tr>
+          {% endfor %}
+        </table>
+        {% endfor %}
+        <h2>Collapsed stacks</h2>
+        <ul>
+          {% for name in files %}
+          <li><a href="{{ url_for('ops.admin_profile_file', route=r.endpoint, name=name) }}">{{ name }}</a></li>
+          {% endfor %}
+        </ul>
+      </body>
+    </html>
+    """, r=report, files=list_profiles().get(route, []))
+
+@bp.route("/admin/profiles/<route>/<name>")
+def admin_profile_file(route, name):
+    require_profile_token()
+    path = Path(PROFILE_DIR) / route / name
+    if not name.endswith(".folded") or route != Path(route).name or name != Path(name).name or not path.is_file():
+        abort(404)
+    return send_file(path.resolve(), mimetype="text/plain", as_attachment=True, download_name=f"{route}-{name}")
+
+@bp.route("/admin/slow-queries")
+def admin_slow_queries():
+    # Same token as the profiles; aggregated over every worker's slow_queries.log lines.
+    require_profile_token()
+    SLOW_QUERIES.flush()
+    return jsonify(
+        threshold_ms=SLOW_QUERIES.threshold_ms,
+        statements=slow_query_report(SLOW_QUERIES.path, limit=request.args.get("limit", 50, type=int)),
+    )
+
+@bp.route("/metrics")
+def metrics():
+    # Prometheus scrape target, summed over all workers (metrics.py). Set
+    # METRICS_TOKEN to require "Authorization: Bearer <token>".
+    token = os.getenv("METRICS_TOKEN", "")
+    if token and request.headers.get("Authorization", "") != f"Bearer {token}":
+        abort(401)
+    return REGISTRY.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
@@ -0,0 +1,496 @@
+"""
+The participant form catalog and each participant's answers.
+
+framework_groups lists the documents on the /documents framework tab. The
+FORM_* tables describe the workflow forms: in-app fields, labels, groups and
+requirements. The helpers at the end read and save a participant's answers and
+build the workflow checklist.
+"""
+import json
+from pathlib import Path
+
+from database import DB_PATH
+from form_identity import canonical_form_key, key_by_form
+from instrumentation import connect_db
+from registries import get_source_pdf_url
+
+# -------------------------
+# Framework Documents
+# -------------------------
+framework_groups = {
+    "Program Foundations": [
+        ("Member Bill of Rights", "00_Member_Bill_of_Rights_v2.1.pdf"),
+        ("NILPF Charter", "01_NILPF_Charter_of_Human_Dignity_and_Independent_Living_v2.1.pdf"),
+    ],
+    "Getting Started": [
+        ("Pre-Opening Waitlist Form", "14-Pre_Opening_Waitlist_Form.pdf"),
+        ("Entry Screening", "18_Entry_Screening_v2.2.pdf"),
+        ("Independent Living Disclosure", "1_Independent_Living_Disclosure_v2.1.pdf"),
+        ("No Services / No Supervision Acknowledgement", "2_No_Services_No_Supervision_Acknowledgement.pdf"),
+        ("Voluntary Participation Acknowledgement", "3_Voluntary_Participation_Acknowledgement.pdf"),
+    ],
+    "Program Standards": [
+        ("House Rules and Community Standards", "4_House_Rules_and_Community_Standards.pdf"),
+        ("Fire Safety and Self-Preservation", "5_Fire_Safety_and_Self-Preservation_Acknowledgement.pdf"),
+        ("Emergency Evacuation Plan", "6_Emergency_Evacuation_Plan.pdf"),
+        ("Emergency Contact Form", "7_Emergency_Contact_Form.pdf"),
+        ("Incident Report Form", "8_Incident_Report_Form.pdf"),
+        ("Guest Addendum", "9_Guest_Addendum.pdf"),
+    ],
+    "Operational Forms": [
+        ("Pet / Animal Information", "10-Pet_Animal_Information_Sheet.pdf"),
+        ("Vehicle / Parking Information", "11-Vehicle_Parking_Information_Form.pdf"),
+        ("Transfer Form", "12-Transfer_Form.pdf"),
+        ("Communication and Consent", "13-Communication_and_Consent_Form.pdf"),
+    ],
+    "Compliance and Financial": [
+        ("Complaint / Grievance Procedure", "15_COMPLAINT_GRIEVANCE_PROCEDURE_FORM.pdf"),
+        ("Important Notice and Disclaimer", "15_IMPORTANT_NOTICE_AND_DISCLAIMER_v2.1.pdf"),
+        ("Participant Financial Responsibility", "16_Participant_Financial_Responsibility_Agreement.pdf"),
+        ("No Payee Financial Control Disclosure", "17_NO_PAYEE_FINANCIAL_CONTROL_DISCLOSURE.pdf"),
+        ("Common Area Security Disclosure", "19-Common_Area_Security_Disclosure.pdf"),
+        ("Privacy and Non-Commercialization Acknowledgement", "20_Participant_Privacy_AND_Non_Commercialization_Acknowledgement.pdf"),
+        ("Property and Personal Belongings Acknowledgement", "21_Property_AND_Personal_Belongings_Acknowledgement.pdf"),
+    ],
+    "Legal Authority": [
+        ("Owner Acknowledgment and Program Boundary Handbook", "064_Owner_Acknowledgment_and_Program_Boundary_Handbook_v2.1.pdf"),
+        ("Master License Agreement", "MASTER_LICENSE_AGREEMENT_MLA_v2.1.pdf"),
+        ("Master Lease", "Master_Lease_v2.1.pdf"),
+        ("Essential Forms Guide", "README_ESSENTIAL_FORMS_v2.1.pdf"),
+    ],
+}
+
+
+ALLOWED_EXTENSIONS = {'pdf'}
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+# -------------------------
+# Field Map Schema Loader
+# -------------------------
+FIELD_MAP_PATH = Path("field_map.json")
+
+def load_field_map():
+    """
+    Loads the NILPF field schema from field_map.json.
+    Returns a dict with sections like: golden_static_fields, emergency_contacts, etc.
+    """
+    try:
+        return json.loads(FIELD_MAP_PATH.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        # If JSON is malformed or unreadable, fail safe
+        return {}
+
+
+# -------------------------
+# In-App Form Definitions
+# -------------------------
+TEST_FORM_PDF_MAP = {
+    "03_Voluntary_Participation_ Acknowledgement.pdf": {
+        "participant_name": {"page": 0, "x": 170, "y": 145},
+        "signature_name": {"page": 0, "x": 145, "y": 118},
+        "signature_date": {"page": 0, "x": 430, "y": 118},
+    }
+}
+
+# Form tables below are written with file names but keyed by canonical_form_key(),
+# so every spelling of a form's file name finds the same entry.
+FORM_DEFINITIONS = key_by_form({
+    "18_Entry_Screening_v2.2.pdf": {
+        "title": "Entry Screening",
+        "fields": [
+            {"name": "legal_name", "label": "Legal Name", "type": "text"},
+            {"name": "preferred_name", "label": "Preferred Name", "type": "text"},
+            {"name": "date_of_birth", "label": "Date of Birth", "type": "date"},
+            {"name": "move_in_date", "label": "Move-In Date", "type": "date"},
+            {"name": "mobility_status", "label": "Mobility Status", "type": "text"},
+            {"name": "self_preservation", "label": "Able to Self-Preserve?", "type": "text"},
+            {"name": "orientation_status", "label": "Orientation Status", "type": "text"},
+            {"name": "smoking_status", "label": "Smoking Status", "type": "text"},
+            {"name": "safety_concerns", "label": "Safety Concerns", "type": "textarea"},
+            {"name": "screening_notes", "label": "Screening Notes", "type": "textarea"},
+            {"name": "screened_by", "label": "Screened By", "type": "text"},
+            {"name": "screening_date", "label": "Screening Date", "type": "date"},
+            {"name": "screening_result", "label": "Screening Result", "type": "text"},
+        ]
+    },
+
+    "7_Emergency_Contact_Form.pdf": {
+        "title": "Emergency Contact Form",
+        "fields": [
+            {"name": "legal_name", "label": "Legal Name", "type": "text"},
+            {"name": "primary_contact_name", "label": "Primary Contact Name", "type": "text"},
+            {"name": "primary_contact_phone", "label": "Primary Contact Phone", "type": "text"},
+            {"name": "primary_contact_relationship", "label": "Relationship", "type": "text"},
+            {"name": "secondary_contact_name", "label": "Secondary Contact Name", "type": "text"},
+            {"name": "secondary_contact_phone", "label": "Secondary Contact Phone", "type": "text"},
+            {"name": "secondary_contact_relationship", "label": "Secondary Relationship", "type": "text"},
+            {"name": "hospital_preference", "label": "Preferred Hospital", "type": "text"},
+            {"name": "emergency_notes", "label": "Emergency Notes", "type": "textarea"},
+        ]
+    },
+
+    "16_Participant_Financial_Responsibility_Agreement.pdf": {
+        "title": "Participant Financial Responsibility Agreement",
+        "fields": [
+            {"name": "legal_name", "label": "Legal Name", "type": "text"},
+            {"name": "monthly_amount", "label": "Monthly Amount", "type": "text"},
+            {"name": "payment_due_date", "label": "Payment Due Date", "type": "text"},
+            {"name": "payment_method", "label": "Payment Method", "type": "text"},
+            {"name": "responsible_party", "label": "Responsible Party", "type": "text"},
+            {"name": "responsible_party_phone", "label": "Responsible Party Phone", "type": "text"},
+            {"name": "financial_notes", "label": "Financial Notes", "type": "textarea"},
+            {"name": "agreement_date", "label": "Agreement Date", "type": "date"},
+        ]
+    },
+
+    "13-Communication_and_Consent_Form.pdf": {
+        "title": "Communication and Consent Form",
+        "fields": [
+            {"name": "legal_name", "label": "Legal Name", "type": "text"},
+            {"name": "contact_phone", "label": "Phone", "type": "text"},
+            {"name": "contact_email", "label": "Email", "type": "text"},
+            {"name": "preferred_contact_method", "label": "Preferred Contact Method", "type": "text"},
+            {"name": "consent_to_call", "label": "Consent to Call", "type": "text"},
+            {"name": "consent_to_text", "label": "Consent to Text", "type": "text"},
+            {"name": "consent_to_email", "label": "Consent to Email", "type": "text"},
+            {"name": "communication_notes", "label": "Communication Notes", "type": "textarea"},
+        ]
+    },
+
+    "12-Transfer_Form.pdf": {
+        "title": "Transfer / Exit Form",
+        "fields": [
+            {"name": "legal_name", "label": "Legal Name", "type": "text"},
+            {"name": "transfer_date", "label": "Transfer / Exit Date", "type": "date"},
+            {"name": "reason_for_exit", "label": "Reason for Exit", "type": "textarea"},
+            {"name": "forwarding_destination", "label": "Forwarding Destination", "type": "text"},
+            {"name": "property_returned", "label": "Property Returned?", "type": "text"},
+            {"name": "keys_returned", "label": "Keys Returned?", "type": "text"},
+            {"name": "room_condition", "label": "Room Condition", "type": "textarea"},
+            {"name": "exit_notes", "label": "Exit Notes", "type": "textarea"},
+            {"name": "completed_by", "label": "Completed By", "type": "text"},
+        ]
+    },
+})
+
+# -------------------------
+# Participant Workflow UI
+# -------------------------
+FORM_LABELS = key_by_form({
+    "00_Member_Bill_of_Rights_v2.1.pdf": "Member Bill of Rights",
+    "01_NILPF_Charter_of_Human_Dignity_and_Independent_Living_v2.1.pdf": "Charter of Human Dignity and Independent Living",
+    "18_Entry_Screening_v2.2.pdf": "Entry Screening",
+    "1_Independent_Living_Disclosure_v2.1.pdf": "Independent Living Disclosure",
+    "2_No_Services_No_Supervision_Acknowledgement.pdf": "No Services / No Supervision Acknowledgement",
+    "3_Voluntary_Participation_Acknowledgement.pdf": "Voluntary Participation Acknowledgement",
+    "4_House_Rules_and_Community_Standards.pdf": "House Rules and Community Standards",
+    "20_Participant_Privacy_AND_Non_Commercialization_Acknowledgement.pdf": "Participant Privacy and Non-Commercialization Acknowledgement",
+    "21_Property_AND_Personal_Belongings_Acknowledgement.pdf": "Property and Personal Belongings Acknowledgement",
+    "16_Participant_Financial_Responsibility_Agreement.pdf": "Participant Financial Responsibility Agreement",
+    "15_IMPORTANT_NOTICE_AND_DISCLAIMER_v2.1.pdf": "Important Notice and Disclaimer",
+    "17_NO_PAYEE_FINANCIAL_CONTROL_DISCLOSURE.pdf": "No Payee Financial Control Disclosure",
+    "7_Emergency_Contact_Form.pdf": "Emergency Contact Form",
+    "6_Emergency_Evacuation_Plan.pdf": "Emergency Evacuation Plan",
+    "5_Fire_Safety_and_Self-Preservation_Acknowledgement.pdf": "Fire Safety and Self-Preservation Acknowledgement",
+    "19-Common_Area_Security_Disclosure.pdf": "Common Area Security Disclosure",
+    "13-Communication_and_Consent_Form.pdf": "Communication and Consent Form",
+    "10-Pet_Animal_Information_Sheet.pdf": "Pet / Animal Information Sheet",
+    "11-Vehicle_Parking_Information_Form.pdf": "Vehicle Parking Information Form",
+    "9_Guest_Addendum.pdf": "Guest Addendum",
+    "8_Incident_Report_Form.pdf": "Incident Report Form",
+    "15_COMPLAINT_GRIEVANCE_PROCEDURE_FORM.pdf": "Complaint / Grievance Procedure Form",
+    "12-Transfer_Form.pdf": "Transfer / Exit Form",
+})
+
+GROUP_ORDER = [
+    "Foundation",
+    "Entry",
+    "Disclosures",
+    "Program Agreements",
+    "Safety",
+    "Resident Info",
+    "Administration",
+    "Exit",
+]
+
+FORM_GROUPS = key_by_form({
+    "00_Member_Bill_of_Rights_v2.1.pdf": "Foundation",
+    "01_NILPF_Charter_of_Human_Dignity_and_Independent_Living_v2.1.pdf": "Foundation",
+
+    "18_Entry_Screening_v2.2.pdf": "Entry",
+
+    "1_Independent_Living_Disclosure_v2.1.pdf": "Disclosures",
+    "2_No_Services_No_Supervision_Acknowledgement.pdf": "Disclosures",
+    "3_Voluntary_Participation_Acknowledgement.pdf": "Disclosures",
+
+    "4_House_Rules_and_Community_Standards.pdf": "Program Agreements",
+    "20_Participant_Privacy_AND_Non_Commercialization_Acknowledgement.pdf": "Program Agreements",
+    "21_Property_AND_Personal_Belongings_Acknowledgement.pdf": "Program Agreements",
+    "16_Participant_Financial_Responsibility_Agreement.pdf": "Program Agreements",
+    "15_IMPORTANT_NOTICE_AND_DISCLAIMER_v2.1.pdf": "Program Agreements",
+    "17_NO_PAYEE_FINANCIAL_CONTROL_DISCLOSURE.pdf": "Program Agreements",
+
+    "7_Emergency_Contact_Form.pdf": "Safety",
+    "6_Emergency_Evacuation_Plan.pdf": "Safety",
+    "5_Fire_Safety_and_Self-Preservation_Acknowledgement.pdf": "Safety",
+    "19-Common_Area_Security_Disclosure.pdf": "Safety",
+
+    "13-Communication_and_Consent_Form.pdf": "Resident Info",
+    "10-Pet_Animal_Information_Sheet.pdf": "Resident Info",
+    "11-Vehicle_Parking_Information_Form.pdf": "Resident Info",
+    "9_Guest_Addendum.pdf": "Resident Info",
+
+    "8_Incident_Report_Form.pdf": "Administration",
+    "15_COMPLAINT_GRIEVANCE_PROCEDURE_FORM.pdf": "Administration",
+
+    "12-Transfer_Form.pdf": "Exit",
+})
+
+
+FORM_REQUIREMENTS = key_by_form({
+    "00_Member_Bill_of_Rights_v2.1.pdf": "required",
+    "01_NILPF_Charter_of_Human_Dignity_and_Independent_Living_v2.1.pdf": "required",
+
+    "18_Entry_Screening_v2.2.pdf": "required",
+
+    "1_Independent_Living_Disclosure_v2.1.pdf": "required",
+    "2_No_Services_No_Supervision_Acknowledgement.pdf": "required",
+    "3_Voluntary_Participation_Acknowledgement.pdf": "required",
+
+    "4_House_Rules_and_Community_Standards.pdf": "required",
+    "MASTER_LICENSE_AGREEMENT_MLA_v2.2.pdf": "required",
+    "20_Participant_Privacy_AND_Non_Commercialization_Acknowledgement.pdf": "required",
+    "21_Property_AND_Personal_Belongings_Acknowledgement.pdf": "required",
+    "16_Participant_Financial_Responsibility_Agreement.pdf": "conditional",
+    "15_IMPORTANT_NOTICE_AND_DISCLAIMER_v2.1.pdf": "required",
+    "17_NO_PAYEE_FINANCIAL_CONTROL_DISCLOSURE.pdf": "required",
+
+    "7_Emergency_Contact_Form.pdf": "required",
+    "6_Emergency_Evacuation_Plan.pdf": "required",
+    "5_Fire_Safety_and_Self-Preservation_Acknowledgement.pdf": "required",
+    "19-Common_Area_Security_Disclosure.pdf": "conditional",
+
+    "13-Communication_and_Consent_Form.pdf": "conditional",
+    "10-Pet_Animal_Information_Sheet.pdf": "conditional",
+    "11-Vehicle_Parking_Information_Form.pdf": "conditional",
+    "9_Guest_Addendum.pdf": "conditional",
+
+    "8_Incident_Report_Form.pdf": "conditional",
+    "15_COMPLAINT_GRIEVANCE_PROCEDURE_FORM.pdf": "required",
+
+    "12-Transfer_Form.pdf": "conditional",
+})
+
+
+def participant_workflow(participant_id):
+    from urllib.parse import quote
+
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+
+    participant = cur.execute(
+        """
+        SELECT id, legal_name, preferred_name, dob, gender, phone, email,
+               address, city, state, zip_code,
+               emergency_contact_name, emergency_contact_phone,
+               move_in_date, room_unit, created_at
+        FROM participants
+        WHERE id=?
+        """,
+        (participant_id,)
+    ).fetchone()
+
+    form_rows = cur.execute(
+        "SELECT form_name, is_complete, completed_at FROM participant_forms WHERE participant_id=?",
+        (str(participant_id),)
+    ).fetchall()
+
+    conn.close()
+
+    if not participant:
+        return None, {}, {"completed": 0, "total_required": 0, "percent": 0}
+
+    completed_map = {
+        row[0]: {"is_complete": bool(row[1]), "completed_at": row[2]}
+        for row in form_rows
+    }
+
+    grouped_defs = get_grouped_participant_forms()
+    grouped = {}
+    total_required = 0
+    completed_required = 0
+
+    for group_name, forms in grouped_defs.items():
+        items = []
+        for form in forms:
+            form_name = form.get("form_name") or form.get("name") or ""
+            label = form.get("label") or form_name
+            status = completed_map.get(form_name, {})
+            is_complete = bool(status.get("is_complete"))
+            completed_at = status.get("completed_at")
+            href = f"/participant-form/{participant_id}/{quote(form_name)}"
+            pdf_url = get_source_pdf_url(form_name)
+
+            is_conditional = bool(form.get("conditional"))
+            is_required = not is_conditional
+            requirement_label = "Conditional" if is_conditional else "Required"
+
+            if is_required:
+                total_required += 1
+                if is_complete:
+                    completed_required += 1
+
+            items.append({
+                "form_name": form_name,
+                "label": label,
+                "href": href,
+                "pdf_url": pdf_url,
+                "is_complete": is_complete,
+                "completed_at": completed_at,
+                "is_required": is_required,
+                "is_conditional": is_conditional,
+                "requirement_label": requirement_label
+            })
+        items = sorted(items, key=lambda x: x.get("is_complete", False))
+        grouped[group_name] = items
+
+    percent = int((completed_required / total_required) * 100) if total_required else 0
+    entry_ready = completed_required >= total_required and total_required > 0
+
+    progress = {
+        "completed": completed_required,
+        "total_required": total_required,
+        "percent": percent,
+        "entry_ready": entry_ready
+    }
+
+
+    grouped = dict(sorted(
+        grouped.items(),
+        key=lambda g: all(item.get("is_complete", False) for item in g[1])
+    ))
+
+    return participant, grouped, progress
+
+
+def get_grouped_participant_forms():
+    return {
+        "Foundation": [
+            {"form_name": "00_Member_Bill_of_Rights_v2.1.pdf", "label": "Member Bill of Rights", "conditional": False},
+            {"form_name": "01_NILPF_Charter_of_Human_Dignity_and_Independent_Living_v2.1.pdf", "label": "NILPF Charter of Human Dignity and Independent Living", "conditional": False}
+        ],
+        "Entry": [
+            {"form_name": "18_Entry_Screening_v2.2.pdf", "label": "Entry Screening", "conditional": False},
+            {"form_name": "3_Voluntary_Participation_Acknowledgement.pdf", "label": "Voluntary Participation Acknowledgement", "conditional": False},
+            {"form_name": "13-Communication_and_Consent_Form.pdf", "label": "Communication and Consent Form", "conditional": True}
+        ],
+        "Disclosures": [
+            {"form_name": "1_Independent_Living_Disclosure_v2.1.pdf", "label": "Independent Living Disclosure", "conditional": False},
+            {"form_name": "2_No_Services_No_Supervision_Acknowledgement.pdf", "label": "No Services / No Supervision Acknowledgement", "conditional": False}
+        ],
+        "Program Agreements": [
+            {"form_name": "MASTER_LICENSE_AGREEMENT_MLA_v2.2.pdf", "label": "Master License Agreement (MLA)", "conditional": False},
+            {"form_name": "4_House_Rules_and_Community_Standards.pdf", "label": "House Rules and Community Standards", "conditional": False},
+            {"form_name": "16_Participant_Financial_Responsibility_Agreement.pdf", "label": "Participant Financial Responsibility Agreement", "conditional": True},
+            {"form_name": "15_IMPORTANT_NOTICE_AND_DISCLAIMER_v2.1.pdf", "label": "Important Notice and Disclaimer", "conditional": False},
+            {"form_name": "17_NO_PAYEE_FINANCIAL_CONTROL_DISCLOSURE.pdf", "label": "No Payee Financial Control Disclosure", "conditional": False},
+            {"form_name": "20_Participant_Privacy_AND_Non_Commercialization_Acknowledgement.pdf", "label": "Participant Privacy and Non-Commercialization Acknowledgement", "conditional": False},
+            {"form_name": "21_Property_AND_Personal_Belongings_Acknowledgement.pdf", "label": "Property and Personal Belongings Acknowledgement", "conditional": False}
+        ],
+        "Safety": [
+            {"form_name": "7_Emergency_Contact_Form.pdf", "label": "Emergency Contact Form", "conditional": False},
+            {"form_name": "6_Emergency_Evacuation_Plan.pdf", "label": "Emergency Evacuation Plan", "conditional": False},
+            {"form_name": "5_Fire_Safety_and_Self-Preservation_Acknowledgement.pdf", "label": "Fire Safety and Self-Preservation Acknowledgement", "conditional": False},
+            {"form_name": "19-Common_Area_Security_Disclosure.pdf", "label": "Common Area Security Disclosure", "conditional": True}
+        ],
+        "Resident Info": [
+            {"form_name": "10-Pet_Animal_Information_Sheet.pdf", "label": "Pet / Animal Information Sheet", "conditional": True},
+            {"form_name": "11-Vehicle_Parking_Information_Form.pdf", "label": "Vehicle / Parking Information Form", "conditional": True},
+            {"form_name": "9_Guest_Addendum.pdf", "label": "Guest Addendum", "conditional": True}
+        ],
+        "Administration": [
+            {"form_name": "8_Incident_Report_Form.pdf", "label": "Incident Report Form", "conditional": True},
+            {"form_name": "15_COMPLAINT_GRIEVANCE_PROCEDURE_FORM.pdf", "label": "Complaint / Grievance Procedure Form", "conditional": False}
+        ],
+        "Exit": [
+            {"form_name": "12-Transfer_Form.pdf", "label": "Transfer / Exit Form", "conditional": True}
+        ]
+    }
+
+
+GENERIC_FORM_FIELDS = [
+    {"name": "participant_name", "label": "Participant Name", "type": "text"},
+    {"name": "date", "label": "Date", "type": "date"},
+    {"name": "notes", "label": "Notes", "type": "textarea"}
+]
+
+def get_form_definition(form_name):
+    form_key = canonical_form_key(form_name)
+    if form_key in FORM_DEFINITIONS:
+        return FORM_DEFINITIONS[form_key]
+
+    label = FORM_LABELS.get(form_key, form_name.replace(".pdf", "").replace("_", " "))
+    return {
+        "title": label,
+        "fields": GENERIC_FORM_FIELDS,
+    }
+
+
+def get_participant_form_values(participant_id, form_name):
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    rows = cur.execute("""
+        SELECT field_name, field_value
+        FROM participant_form_data
+        WHERE participant_id=? AND form_name=?
+    """, (str(participant_id), form_name)).fetchall()
+    conn.close()
+    return {k: v for k, v in rows}
+
+def save_participant_form_values(participant_id, form_name, form_data):
+    from datetime import datetime
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+
+    for field_name, field_value in form_data.items():
+        cur.execute("""
+            INSERT INTO participant_form_data
+            (participant_id, form_name, field_name, field_value, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(participant_id, form_name, field_name)
+            DO UPDATE SET field_value=excluded.field_value, updated_at=excluded.updated_at
+        """, (
+            str(participant_id),
+            form_name,
+            field_name,
+            field_value,
+            datetime.utcnow().isoformat()
+        ))
+
+    conn.commit()
+    conn.close()
+
+def auto_mark_form_complete_if_has_data(participant_id, form_name):
+    from datetime import datetime
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+
+    count = cur.execute("""
+        SELECT COUNT(*)
+        FROM participant_form_data
+        WHERE participant_id=? AND form_name=? AND COALESCE(TRIM(field_value),'') <> ''
+    """, (str(participant_id), form_name)).fetchone()[0]
+
+    if count > 0:
+        cur.execute("""
+            UPDATE participant_forms
+            SET is_complete=1, completed_at=?
+            WHERE participant_id=? AND form_name=?
+        """, (datetime.utcnow().isoformat(), str(participant_id), form_name))
+
+    conn.commit()
+    conn.close()
@@ -0,0 +1,604 @@
+"""
+Participants: the roster, the per-participant workflow checklist and the
+completion toggles.
+"""
+from datetime import datetime
+from urllib.parse import quote
+
+from flask import Blueprint, abort, redirect, render_template_string, request
+
+from database import DB_PATH, seed_participant_forms
+from instrumentation import connect_db
+from participant_forms import participant_workflow
+from registries import DIGNITY_LOG
+
+bp = Blueprint("participants", __name__)
+
+
+@bp.route("/log-dignity-screen", methods=["POST"])
+def log_dignity_screen():
+    from datetime import datetime
+    ts = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+    DIGNITY_LOG.log(f"Dignity screen shown: {ts}")
+    return "ok"
+
+
+@bp.route("/participant-form-complete", methods=["POST"])
+def participant_form_complete():
+    participant_id = request.form.get("participant_id", "").strip()
+    form_name = request.form.get("form_name", "").strip()
+    go_back = request.form.get("go_back", "").strip()
+
+    if not participant_id or not form_name:
+        abort(400, "Missing participant_id or form_name.")
+
+    from datetime import datetime
+
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+
+    cur.execute("""
+        UPDATE participant_forms
+        SET is_complete=1, completed_at=?
+        WHERE participant_id=? AND form_name=?
+    """, (datetime.utcnow().isoformat(timespec="seconds"), str(participant_id), form_name))
+
+    if cur.rowcount == 0:
+        ts = datetime.utcnow().isoformat(timespec="seconds")
+        cur.execute("""
+            INSERT INTO participant_forms (participant_id, form_name, is_complete, completed_at, created_at)
+            VALUES (?, ?, 1, ?, ?)
+        """, (str(participant_id), form_name, ts, ts))
+
+    conn.commit()
+    conn.close()
+
+    if go_back:
+        return redirect(go_back)
+
+    participant, grouped, progress = participant_workflow(int(participant_id))
+    next_form = None
+
+    for section, forms in grouped:
+        for form in forms:
+            if form.get("required") and not form.get("is_complete"):
+                next_form = form
+                break
+        if next_form:
+            break
+
+    if next_form:
+        return redirect(f"/participant-form/{participant_id}/{quote(next_form['name'])}")
+
+    return redirect(f"/participant-workflow/{participant_id}")
+
+@bp.route("/participant-workflow/<int:participant_id>")
+def participant_workflow_page(participant_id):
+    participant, grouped, progress = participant_workflow(participant_id)
+    if not participant:
+        abort(404, "Participant not found.")
+
+    pid = participant[0]
+    legal_name = participant[1]
+    preferred_name = participant[2]
+    created_at = participant[-1]
+    display_name = preferred_name or legal_name
+
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>Participant Workflow</title>
+        <style>
+          body { font-family: Arial, sans-serif; margin: 0; background: #f6f7fb; color: #111; }
+          .wrap { max-width: 1150px; margin: 0 auto; padding: 24px; }
+          .top { background: #fff; border: 2px solid #111; border-radius: 18px; padding: 18px; margin-bottom: 18px; }
+          .top h1 { margin: 0 0 8px 0; font-size: 28px; }
+          .note { color: #444; }
+          .btnrow { display:flex; gap:10px; flex-wrap:wrap; margin-top:14px; }
+          .btn { display:inline-block; padding:10px 14px; border-radius:12px; border:2px solid #111; background:#111; color:#fff; text-decoration:none; font-weight:700; cursor:pointer; }
+          .btn.alt { background:#fff; color:#111; }
+          .progressbox { margin-top:14px; }
+          .progressmeta { display:flex; justify-content:space-between; gap:10px; font-weight:700; margin-bottom:8px; }
+          .bar { width:100%; height:16px; background:#e5e7eb; border:2px solid #111; border-radius:999px; overflow:hidden; }
+          .fill { height:100%; background:#111; }
+          .grid { display:grid; grid-template-columns:repeat(auto-fit, minmax(320px, 1fr)); gap:16px; }
+          .card { background:#fff; border:2px solid #111; border-radius:18px; padding:16px; }
+          .card h2 { margin:0 0 12px 0; font-size:20px; }
+          .row {
+            border-left: 4px solid transparent;
+          }
+          .row.next-required {
+            border-left: 6px solid gold;
+            background: #fffbe6;
+          } border:1px solid #d7dbe7; border-radius:14px; padding:12px; margin-bottom:10px; background:#fafafa; }
+          .row.done { background:#eefbf1; border-color:#b7e4c7; }
+          .title { font-weight:700; font-size:16px; margin-bottom:10px; line-height:1.3; }
+          .title a { color:#111; text-decoration:none; }
+          .title a:hover { text-decoration:underline; }
+          .badges { display:flex; gap:8px; flex-wrap:wrap; margin-bottom:10px; }
+          .badge { display:inline-block; padding:4px 8px; border-radius:999px; font-size:12px; font-weight:700; background:#e9ecef; }
+          .stamp { font-size:12px; color:#555; margin-top:6px; }
+          .actions { display:flex; gap:8px; flex-wrap:wrap; }
+          form { margin:0; }
+        </style>
+      </head>
+      <body>
+
+<div id="dignityScreen" onclick="hideDignityScreen()" style="
+display:none;
+position:fixed;
+inset:0;
+background:rgba(17,17,17,.96);
+color:#fff;
+z-index:99999;
+align-items:center;
+justify-content:center;
+text-align:center;
+padding:30px;
+font-family:Arial,sans-serif;
+">
+  <div>
+    <div style="font-size:34px;font-weight:700;margin-bottom:14px;">Dignity & Privacy Protected</div>
+    <div style="font-size:18px;max-width:700px;line-height:1.5;">
+      Participant information has been hidden due to inactivity.
+      Tap or click anywhere to continue.
+    </div>
+  </div>
+</div>
+
+<style>
+.home-icon{
+    position:fixed;
+    top:60px;
+    right:22px;
+    font-size:22px;
+    text-decoration:none;
+    color:#111;
+    font-weight:600;
+}
+.home-icon:hover{
+    text-decoration:underline;
+}
+</style>
+
+
+        <div class="wrap">
+          <div class="top">
+            <h1>Participant Workflow</h1>
+            <div class="note"><strong>{{ display_name }}</strong> · Participant ID {{ pid }}</div>
+            <div class="note">Created: {{ created_at }}</div>
+
+            <div style="margin-bottom:14px;padding:10px 14px;border-radius:12px;font-weight:700;
+              {% if progress.entry_ready %}
+              background:#d1fae5;border:2px solid #10b981;color:#065f46;
+              {% else %}
+              background:#fee2e2;border:2px solid #ef4444;color:#7f1d1d;
+              {% endif %}
+            ">
+              ENTRY STATUS:
+              {% if progress.entry_ready %}
+              READY
+              {% else %}
+              NOT READY
+              {% endif %}
+            </div>
+
+            <div class="progressbox">
+              <div class="progressmeta">
+                <span>Required Forms: {{ progress.completed }} / {{ progress.total_required }} Complete</span>
+                <span>{{ progress.percent }}%</span>
+              </div>
+              <div class="bar">
+                <div class="fill" style="width: {{ progress.percent }}%;"></div>
+              </div>
+            </div>
+
+            <div class="btnrow">
+                            <a class="btn alt" href="/participants">Participant Manager</a>
+              <a class="btn alt" href="/home">Home</a>
+            </div>
+          </div>
+
+          <div class="grid">
+            {% for group_name, items in grouped.items() %}
+              <div class="card">
+                <h2>{{ group_name }}</h2>
+                {% for item in items %}
+                  <div class="row {% if item.is_complete %}done{% elif item.is_required %}next-required{% endif %}">
+                    <div class="title">
+                      <a href="{{ item.href }}">{{ item.label }}</a>
+                    </div>
+
+                    <div class="badges">
+                      <span class="badge">{{ item.requirement_label }}</span>
+                      <span class="badge">{% if item.is_complete %}Complete{% else %}Pending{% endif %}</span>
+                    </div>
+
+                    {% if item.completed_at %}
+                      <div class="stamp">Completed: {{ item.completed_at }}</div>
+                    {% endif %}
+
+                    <div class="actions">
+                      <a class="btn alt" href="{{ item.href }}">Start Form</a>
+                      {% if item.pdf_url %}
+                      {% endif %}
+                      {% if not item.is_complete %}
+                      <form method="post" action="/participant-form-complete">
+                        <input type="hidden" name="participant_id" value="{{ pid }}">
+                        <input type="hidden" name="form_name" value="{{ item.form_name }}">
+                        <input type="hidden" name="go_back" value="/participant-workflow/{{ pid }}">
+                        <button class="btn alt" type="submit">Mark Complete</button>
+                      </form>
+                      {% endif %}
+
+                      <a class="btn alt" href="/participant-form-print/{{ pid }}/{{ item.form_name|replace(' ', '%20') }}">Print</a>
+                    </div>
+                  </div>
+                {% endfor %}
+              </div>
+            {% endfor %}
+          </div>
+        </div>
+
+<script>
+let idleTimer;
+let logoutTimer;
+const idleTimeLimit = 60000;
+const logoutTimeLimit = 300000;
+
+function resetIdleTimer() {
+    clearTimeout(idleTimer);
+    clearTimeout(logoutTimer);
+    idleTimer = setTimeout(showDignityScreen, idleTimeLimit);
+    logoutTimer = setTimeout(() => { window.location = "/logout"; }, logoutTimeLimit);
+}
+
+function showDignityScreen() {
+    const el = document.getElementById("dignityScreen");
+    if (el) el.style.display = "flex";
+    fetch('/log-dignity-screen', {method:'POST'});
+}
+
+function hideDignityScreen() {
+    const el = document.getElementById("dignityScreen");
+    if (el) el.style.display = "none";
+    resetIdleTimer();
+}
+
+window.addEventListener("load", resetIdleTimer);
+document.addEventListener("mousemove", resetIdleTimer);
+document.addEventListener("keypress", resetIdleTimer);
+document.addEventListener("click", resetIdleTimer);
+document.addEventListener("touchstart", resetIdleTimer);
+</script>
+
+      </body>
+    </html>
+    """, pid=pid, display_name=display_name, created_at=created_at, grouped=grouped, progress=progress)
+
+
+@bp.route("/participant-form-toggle/<int:participant_id>", methods=["POST"])
+def participant_form_toggle(participant_id):
+    is_complete = 1 if str(request.form.get("is_complete", "0")) == "1" else 0
+    form_name = request.form.get("form_name", "").strip()
+    go_back = request.form.get("go_back") or f"/participant-workflow/{participant_id}"
+
+    if not form_name:
+        abort(400, "Missing form_name.")
+
+    completed_at = datetime.utcnow().isoformat() if is_complete else None
+
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("""
+        UPDATE participant_forms
+        SET is_complete=?, completed_at=?
+        WHERE participant_id=? AND form_name=?
+    """, (is_complete, completed_at, str(participant_id), form_name))
+    conn.commit()
+    conn.close()
+
+    return redirect(go_back)
+
+
+@bp.route("/participants", methods=["GET", "POST"])
+def participants():
+    from datetime import datetime
+
+    message = ""
+
+    if request.method == "POST":
+        full_name = (request.form.get("full_name") or "").strip()
+        dob = (request.form.get("dob") or "").strip()
+        move_in_date = (request.form.get("move_in_date") or datetime.utcnow().strftime("%Y-%m-%d") or "").strip()
+        room_unit = (request.form.get("room_unit") or "").strip()
+        gender = (request.form.get("gender") or "").strip()
+        phone = (request.form.get("phone") or "").strip()
+        email = (request.form.get("email") or "").strip()
+        address = (request.form.get("address") or "").strip()
+        city = (request.form.get("city") or "").strip()
+        state = (request.form.get("state") or "").strip()
+        zip_code = (request.form.get("zip_code") or "").strip()
+        emergency_contact_name = (request.form.get("emergency_contact_name") or "").strip()
+        emergency_contact_phone = (request.form.get("emergency_contact_phone") or "").strip()
+
+        if full_name:
+            conn = connect_db(DB_PATH)
+            cur = conn.cursor()
+
+            cols = [r[1] for r in cur.execute("PRAGMA table_info(participants)").fetchall()]
+
+            data = {}
+            if "full_name" in cols:
+                data["full_name"] = full_name
+            elif "participant_name" in cols:
+                data["participant_name"] = full_name
+            elif "legal_name" in cols:
+                data["legal_name"] = full_name
+
+            if "preferred_name" in cols:
+                data["preferred_name"] = full_name
+
+            if "dob" in cols:
+                data["dob"] = dob
+            if "move_in_date" in cols:
+                data["move_in_date"] = move_in_date
+            if "room_unit" in cols:
+                data["room_unit"] = room_unit
+            elif "room" in cols:
+                data["room"] = room_unit
+            elif "unit" in cols:
+                data["unit"] = room_unit
+            if "gender" in cols:
+                data["gender"] = gender
+            if "phone" in cols:
+                data["phone"] = phone
+            if "email" in cols:
+                data["email"] = email
+            if "address" in cols:
+                data["address"] = address
+            if "city" in cols:
+                data["city"] = city
+            if "state" in cols:
+                data["state"] = state
+            if "zip_code" in cols:
+                data["zip_code"] = zip_code
+            if "emergency_contact_name" in cols:
+                data["emergency_contact_name"] = emergency_contact_name
+            if "emergency_contact_phone" in cols:
+                data["emergency_contact_phone"] = emergency_contact_phone
+            if "created_at" in cols:
+                data["created_at"] = datetime.utcnow().isoformat()
+
+            if data:
+                fields = ", ".join(data.keys())
+                placeholders = ", ".join(["?"] * len(data))
+                cur.execute(f"INSERT INTO participants ({fields}) VALUES ({placeholders})", tuple(data.values()))
+                participant_id = cur.lastrowid
+                conn.commit()
+                seed_participant_forms(participant_id)
+                message = "Participant added."
+            else:
+                message = "Participants table exists, but no matching columns were found."
+
+            conn.close()
+        else:
+            message = "Full name is required."
+
+    conn = connect_db(DB_PATH)
+    cur = conn.cursor()
+
+    cols = [r[1] for r in cur.execute("PRAGMA table_info(participants)").fetchall()]
+    select_cols = []
+    for c in ["id", "legal_name", "preferred_name", "full_name", "participant_name", "dob", "gender", "phone", "email", "address", "city", "state", "zip_code", "emergency_contact_name", "emergency_contact_phone", "move_in_date", "room_unit", "room", "unit", "created_at"]:
+        if c in cols and c not in select_cols:
+            select_cols.append(c)
+
+    rows = []
+    if select_cols:
+        q = "SELECT " + ", ".join(select_cols) + " FROM participants ORDER BY id DESC" if "id" in select_cols else "SELECT " + ", ".join(select_cols) + " FROM participants"
+        rows = cur.execute(q).fetchall()
+
+    alerts_by_pid = {}
+    notes_by_pid = {}
+    if "id" in select_cols and rows:
+        pid_index = select_cols.index("id")
+        for row in rows:
+            try:
+                pid = row[pid_index]
+                total_forms = cur.execute(
+                    "SELECT COUNT(*) FROM participant_forms WHERE participant_id = ?",
+                    (str(pid),)
+                ).fetchone()[0]
+                incomplete_forms = cur.execute(
+                    "SELECT COUNT(*) FROM participant_forms WHERE participant_id = ? AND COALESCE(is_complete, 0) = 0",
+                    (str(pid),)
+                ).fetchone()[0]
+                note_count = cur.execute(
+                    "SELECT COUNT(*) FROM participant_notes WHERE TRIM(COALESCE(participant_id, '')) = TRIM(?)",
+                    (str(pid),)
+                ).fetchone()[0]
+                alerts_by_pid[str(pid)] = {
+                    "total": total_forms,
+                    "incomplete": incomplete_forms
+                }
+                notes_by_pid[str(pid)] = note_count
+            except:
+                alerts_by_pid[str(row[pid_index])] = {
+                    "total": 0,
+                    "incomplete": 0
+                }
+                notes_by_pid[str(row[pid_index])] = 0
+
+    conn.close()
+
+    return render_template_string("""
+    <!doctype html>
+    <html>
+    <head>
+      <meta charset="utf-8">
+      <meta name="viewport" content="width=device-width, initial-scale=1">
+      <title>Add / View Participants</title>
+      <style>
+        body { font-family: Arial, sans-serif; max-width: 1100px; margin: 30px auto; padding: 0 16px; background: #f6f6f6; }
+        .card { background: white; border: 2px solid #111; border-radius: 18px; padding: 18px; margin-bottom: 18px; }
+        h1,h2 { margin-top: 0; }
+        .grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(220px, 1fr)); gap: 12px; }
+        input { width: 100%; padding: 10px; border: 2px solid #111; border-radius: 10px; box-sizing: border-box; }
+        button, .btn { display: inline-block; padding: 10px 14px; border: 2px solid #111; border-radius: 12px; background: #fff; text-decoration: none; color: #111; font-weight: 700; cursor: pointer; }
+        table { width: 100%; border-collapse: collapse; }
+        th, td { border-bottom: 1px solid #ddd; padding: 10px; text-align: left; vertical-align: top; }
+        .note { color: #444; }
+        .msg { font-weight: 700; margin-bottom: 12px; }
+      </style>
+    </head>
+    <body>
+
+<style>
+.home-icon{
+    position:fixed;
+    top:60px;
+    right:22px;
+    font-size:22px;
+    text-decoration:none;
+    color:#111;
+    font-weight:600;
+}
+.home-icon:hover{
+    text-decoration:underline;
+}
+</style>
+
+
+<div style="background:#111;color:#fff;padding:10px;">
+
+<a href="/documents?tab=dashboard" style="color:#fff;margin-right:20px;">Dashboard</a>
+<a href="/participants" style="color:#fff;margin-right:20px;">Add / View Participants</a>
+<a href="/notes" style="color:#fff;">Incident / Status Documentation</a>
+</div>
+
+      <div class="card">
+        <h1>Add / View Participants</h1>
+        <p class="note">Create and view participant entry records here.</p>
+        <p><a class="btn" href="javascript:history.back()">Go Back</a></p>
+      </div>
+
+      <div class="card">
+        <h2>Add Participant</h2>
+        {% if message %}<p class="msg">{{ message }}</p>{% endif %}
+        <form method="post">
+          <div class="grid">
+            <div>
+              <label>Full Name</label>
+              <input type="text" name="full_name" required>
+            </div>
+            <div>
+              <label>Date of Birth</label>
+              <input type="date" name="dob" value="">
+            </div>
+            <div>
+              <label>Gender</label>
+              <input type="text" name="gender">
+            </div>
+            <div>
+              <label>Phone</label>
+              <input type="text" name="phone">
+            </div>
+            <div>
+              <label>Email</label>
+              <input type="text" name="email">
+            </div>
+            <div>
+              <label>Address</label>
+              <input type="text" name="address">
+            </div>
+            <div>
+              <label>City</label>
+              <input type="text" name="city">
+            </div>
+            <div>
+              <label>State</label>
+              <input type="text" name="state">
+            </div>
+            <div>
+              <label>Zip Code</label>
+              <input type="text" name="zip_code">
+            </div>
+            <div>
+              <label>Emergency Contact Name</label>
+              <input type="text" name="emergency_contact_name">
+            </div>
+            <div>
+              <label>Emergency Contact Phone</label>
+              <input type="text" name="emergency_contact_phone">
+            </div>
+            <div>
+              <label>Move In Date</label>
+              <input type="date" name="move_in_date" value="">
+            </div>
+            <div>
+              <label>Room / Unit</label>
+              <input type="text" name="room_unit">
+            </div>
+          </div>
+          <p style="margin-top:14px;"><button type="submit">Save Participant</button></p>
+        </form>
+      </div>
+
+      <div class="card">
+        <h2>Current Participants</h2>
+        {% if rows and select_cols %}
+          <table>
+            <thead>
+              <tr>
+                {% for c in select_cols %}
+                  <th>{{ c }}</th>
+                {% endfor %}
+                <th>Workflow Alert</th>
+              </tr>
+            </thead>
+            <tbody>
+              {% for row in rows %}
+                <tr>
+                  <td>
+                    <a href="/participant/{{ row[0] }}">
+                      {{ row[1] if row|length > 1 else row[0] }}
+                    </a>
+                    {% set note_count = notes_by_pid.get(row[0]|string, 0) %}
+                    {% if note_count > 0 %}
+                      <a href="/notes?participant_id={{ row[0] }}" title="View notes" style="text-decoration:none;margin-left:8px;font-size:18px;">📝</a>
+                    {% endif %}
+                  </td>
+                  {% for item in row[2:] %}
+                  <td>{{ item }}</td>
+                  {% endfor %}
+                  <td>
+                    {% set alert = alerts_by_pid.get(row[0]|string, {"total": 0, "incomplete": 0}) %}
+                    {% if alert.total == 0 %}
+                      <span class="note">No workflow forms</span>
+                    {% elif alert.incomplete == 0 %}
+                      <strong style="color:#2e8b57;">Complete</strong>
+                    {% else %}
+                      <strong style="color:#b22222;">{{ alert.incomplete }} incomplete</strong>
+                      <div class="note">{{ alert.total - alert.incomplete }} of {{ alert.total }} done</div>
+                    {% endif %}
+                  </td>
+                </tr>
+              {% endfor %}
+            </tbody>
+          </table>
+        {% else %}
+          <p class="note">No participants yet.</p>
+        {% endif %}
+      </div>
+    </body>
+    </html>
+    """, rows=rows, select_cols=select_cols, message=message, alerts_by_pid=alerts_by_pid, notes_by_pid=notes_by_pid)
+
+
+@bp.route("/participant/<int:pid>", methods=["GET", "POST"])
+def participant_detail(pid):
+    return redirect(f"/participant-workflow/{pid}")
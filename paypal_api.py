@@ -0,0 +1,104 @@
+"""
+PayPal REST calls and the process-wide access token.
+
+The settings are read from the environment when this module is imported.
+create_app() loads .env before it imports the route modules, which import
+this one.
+"""
+import os
+import threading
+import time
+
+import lazy_imports as lazy
+from instrumentation import timed
+from metrics import REGISTRY
+
+# -------------------------
+# PayPal Config
+# -------------------------
+DOMAIN_URL = os.environ.get("DOMAIN_URL", "http://127.0.0.1:10000").rstrip("/")
+
+PAYPAL_CLIENT_ID = os.getenv("PAYPAL_CLIENT_ID")
+PAYPAL_SECRET = os.getenv("PAYPAL_SECRET")
+PAYPAL_MODE = os.getenv("PAYPAL_MODE", "sandbox")
+PAYPAL_API_BASE = os.getenv("PAYPAL_API_BASE")
+
+if PAYPAL_API_BASE:
+    PAYPAL_BASE = PAYPAL_API_BASE.rstrip("/")
+elif PAYPAL_MODE == "live":
+    PAYPAL_BASE = "https://api-m.paypal.com"
+else:
+    PAYPAL_BASE = "https://api-m.sandbox.paypal.com"
+
+
+def paypal_post(op, path, **kwargs):
+    """
+    POST to the PayPal API. The call is timed as outbound HTTP for the current
+    request, and its latency and failures are counted under `op` in /metrics.
+    """
+    labels = (("op", op),)
+    started = time.perf_counter()
+    try:
+        with timed("http"):
+            resp = lazy.requests.post(f"{PAYPAL_BASE}{path}", **kwargs)
+    except lazy.requests.RequestException:
+        REGISTRY.inc("nilpf_paypal_errors_total", labels)
+        raise
+    finally:
+        REGISTRY.observe("nilpf_paypal_request_duration_seconds", labels, time.perf_counter() - started)
+    if resp.status_code >= 400:
+        REGISTRY.inc("nilpf_paypal_errors_total", labels)
+    return resp
+
+# OAuth token reused until shortly before PayPal says it expires; /ready reports its freshness.
+PAYPAL_TOKEN = {"token": None, "expires_at": 0.0, "fetched_at": 0.0, "error": None, "error_at": 0.0}
+PAYPAL_TOKEN_LOCK = threading.Lock()
+
+def get_paypal_access_token():
+    if not PAYPAL_CLIENT_ID or not PAYPAL_SECRET:
+        raise Exception("Missing PAYPAL_CLIENT_ID or PAYPAL_SECRET in environment.")
+
+    with PAYPAL_TOKEN_LOCK:
+        if PAYPAL_TOKEN["token"] and time.time() < PAYPAL_TOKEN["expires_at"] - 60:
+            return PAYPAL_TOKEN["token"]
+
+        headers = {"Accept": "application/json", "Accept-Language": "en_US"}
+        data = {"grant_type": "client_credentials"}
+
+        try:
+            r = paypal_post(
+                "token",
+                "/v1/oauth2/token",
+                headers=headers,
+                data=data,
+                auth=(PAYPAL_CLIENT_ID, PAYPAL_SECRET),
+                timeout=20,
+            )
+            r.raise_for_status()
+            body = r.json()
+        except Exception as e:
+            PAYPAL_TOKEN.update(error=repr(e), error_at=time.time())
+            raise
+
+        now = time.time()
+        PAYPAL_TOKEN.update(
+            token=body["access_token"],
+            expires_at=now + float(body.get("expires_in", 0)),
+            fetched_at=now,
+            error=None,
+        )
+        return PAYPAL_TOKEN["token"]
+
+def paypal_token_status() -> dict:
+    """Freshness of the cached PayPal token. Never calls PayPal."""
+    if not PAYPAL_CLIENT_ID or not PAYPAL_SECRET:
+        raise RuntimeError("PAYPAL_CLIENT_ID / PAYPAL_SECRET not set")
+    now = time.time()
+    if PAYPAL_TOKEN["error"]:
+        raise RuntimeError(f"last token fetch failed {now - PAYPAL_TOKEN['error_at']:.0f}s ago: {PAYPAL_TOKEN['error']}")
+    if not PAYPAL_TOKEN["token"]:
+        return {"token": "not fetched yet"}
+    return {
+        "token_age_s": round(now - PAYPAL_TOKEN["fetched_at"]),
+        "token_expires_in_s": round(PAYPAL_TOKEN["expires_at"] - now),
+    }
@@ -0,0 +1,230 @@
+"""
+Offline optimizer for the shipped PDFs (EF_v2.2, Core-v2.1, static/documents and
+the state doc store).
+
+Each source is rewritten next to, never over, the original:
+pdf_optimized/<sha[:2]>/<source sha256>.pdf. With pikepdf installed the rewrite
+uses compressed object streams, drops unreferenced resources and linearizes
+(fast web view); it is listed in requirements-optimize.txt and only this script
+needs it. Without it, pypdf merges duplicate objects and recompresses page
+streams. A variant is kept only if it is smaller or linearized. pdf_optimized/
+manifest.json records, per source hash, the size and first-page cost before and
+after. The app looks sources up there by hash and serves the variant when there
+is one.
+
+    pip install -r requirements-optimize.txt
+    python pdf_optimize.py [ROOT ...]     # incremental: known hashes are skipped
+
+Sources that fail to optimize are left out of the manifest and retried next run.
+"""
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+import lazy_imports as lazy
+from metrics import cache_result
+from pdf_response import file_digest
+
+OPTIMIZED_DIR = "pdf_optimized"
+MANIFEST_NAME = "manifest.json"
+DEFAULT_ROOTS = ("EF_v2.2", "Core-v2.1", "static/documents", "doc_store/blobs")
+
+
+def _optimize_pikepdf(src, dest) -> str:
+    import pikepdf
+
+    with pikepdf.open(src) as pdf:
+        pdf.remove_unreferenced_resources()
+        pdf.save(
+            dest,
+            linearize=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+            compress_streams=True,
+            recompress_flate=True,
+        )
+    return "pikepdf"
+
+
+def _optimize_pypdf(src, dest) -> str:
+    writer = lazy.PdfWriter(clone_from=src)
+    for page in writer.pages:
+        page.compress_content_streams(level=9)
+    writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+    with open(dest, "wb") as fh:
+        writer.write(fh)
+    return "pypdf"
+
+
+def optimize_pdf(src, dest) -> str:
+    """Writes the optimized copy of src to dest; returns the engine used."""
+    if importlib.util.find_spec("pikepdf") is None:
+        return _optimize_pypdf(src, dest)
+    return _optimize_pikepdf(src, dest)
+
+
+def is_linearized(path) -> bool:
+    with open(path, "rb") as fh:
+        return b"/Linearized" in fh.read(1024)
+
+
+def first_page_cost(path) -> tuple:
+    """
+    (bytes, ms) needed before page 1 can be drawn. A linearized file's first-page
+    section ends at the /E offset in its linearization dict. Any other file must
+    be read through its trailer, so the whole size counts. ms is pypdf opening
+    the file and pulling page 1's text, a proxy for the viewer's parse cost.
+    """
+    size = os.path.getsize(path)
+    first_bytes = size
+    with open(path, "rb") as fh:
+        head = fh.read(1024)
+    if b"/Linearized" in head:
+        marker = head.find(b"/E ")
+        if marker != -1:
+            digits = head[marker + 3:].split(maxsplit=1)[0].rstrip(b"/>")
+            if digits.isdigit():
+                first_bytes = int(digits)
+
+    with open(path, "rb") as fh:
+        data = fh.read()
+    start = time.perf_counter()
+    reader = lazy.PdfReader(BytesIO(data))
+    if reader.pages:
+        reader.pages[0].extract_text()
+    return first_bytes, round((time.perf_counter() - start) * 1000, 2)
+
+
+def _load_manifest(out_dir: Path) -> dict:
+    try:
+        return json.loads((out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_manifest(out_dir: Path, manifest: dict):
+    fd, tmp_name = tempfile.mkstemp(dir=out_dir, prefix=".tmp-", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(json.dumps(manifest, indent=1, sort_keys=True))
+    os.chmod(tmp_name, 0o644)
+    os.replace(tmp_name, out_dir / MANIFEST_NAME)
+
+
+def optimize_tree(roots=DEFAULT_ROOTS, out_dir=OPTIMIZED_DIR, log=print) -> dict:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(out_dir)
+
+    for root in roots:
+        root = Path(root)
+        if not root.is_dir():
+            continue
+        for src in sorted(root.rglob("*.pdf")):
+            if out_dir in src.parents:
+                continue
+            sha = file_digest(src)
+            entry = manifest.get(sha)
+            if entry is not None and "error" not in entry:
+                if src.as_posix() not in entry["sources"]:
+                    entry["sources"].append(src.as_posix())
+                continue
+
+            dest = out_dir / sha[:2] / f"{sha}.pdf"
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-", suffix=".pdf")
+            os.close(fd)
+            try:
+                engine = optimize_pdf(src, tmp_name)
+            except Exception as e:
+                os.unlink(tmp_name)
+                log(f"skip {src}: {e!r}")
+                # Not recorded, so the next run tries it again.
+                manifest.pop(sha, None)
+                continue
+
+            before_bytes, before_ms = first_page_cost(src)
+            after_bytes, after_ms = first_page_cost(tmp_name)
+            linearized = is_linearized(tmp_name)
+            size, optimized_size = os.path.getsize(src), os.path.getsize(tmp_name)
+            keep = optimized_size < size or linearized
+            if keep:
+                os.chmod(tmp_name, 0o644)
+                os.replace(tmp_name, dest)
+            else:
+                os.unlink(tmp_name)
+
+            manifest[sha] = {
+                "sources": [src.as_posix()],
+                "engine": engine,
+                "optimized": file_digest(dest) if keep else None,
+                "linearized": linearized,
+                "size": size,
+                "optimized_size": optimized_size,
+                "first_page_bytes": before_bytes,
+                "optimized_first_page_bytes": after_bytes,
+                "first_page_ms": before_ms,
+                "optimized_first_page_ms": after_ms,
+            }
+            log(f"{'kept' if keep else 'same'} {src}: {size} -> {optimized_size} bytes, "
+                f"first page {before_bytes} -> {after_bytes} bytes, {before_ms} -> {after_ms} ms")
+
+    _save_manifest(out_dir, manifest)
+    return manifest
+
+
+class OptimizedPdfs:
+    """Maps a source PDF to its optimized variant by content hash."""
+
+    def __init__(self, out_dir=OPTIMIZED_DIR):
+        self.out_dir = Path(out_dir)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._manifest = {}
+
+    def _current(self) -> dict:
+        try:
+            mtime = os.stat(self.out_dir / MANIFEST_NAME).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._manifest = _load_manifest(self.out_dir)
+                    self._mtime = mtime
+        return self._manifest
+
+    def load(self):
+        """Reads the manifest now; a missing one is read once it appears."""
+        self._current()
+
+    def variant(self, path, digest=None) -> tuple:
+        """(path to serve, its sha256): the optimized copy if there is one, else the source itself."""
+        digest = digest or file_digest(path)
+        entry = self._current().get(digest)
+        if entry and entry.get("optimized"):
+            optimized = self.out_dir / digest[:2] / f"{digest}.pdf"
+            if optimized.exists():
+                cache_result("pdf_optimized", True)
+                return optimized, entry["optimized"]
+        cache_result("pdf_optimized", False)
+        return Path(path), digest
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    manifest = optimize_tree(argv or DEFAULT_ROOTS)
+    done = [e for e in manifest.values() if "size" in e]
+    kept = [e for e in done if e.get("optimized")]
+    size = sum(e["size"] for e in done)
+    optimized = sum(e["optimized_size"] if e.get("optimized") else e["size"] for e in done)
+    print(f"{len(done)} PDFs, {len(kept)} optimized, {size} -> {optimized} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
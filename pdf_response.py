@@ -0,0 +1,119 @@
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from flask import Response, send_file
+
+from instrumentation import timed
+
+# Generated PDFs larger than this spill from memory to a temp file on disk.
+SPOOL_MAX_BYTES = 4 * 1024 * 1024
+
+# When the app sits behind nginx, set this to the internal location that maps
+# onto signed_docs/ (e.g. "/_signed_docs/") so nginx streams persisted PDFs.
+X_ACCEL_PREFIX = os.getenv("PDF_X_ACCEL_PREFIX", "")
+
+# Cache lifetime for URLs that carry the content hash (?v=...); the content at
+# such a URL can never change, so browsers may keep it for a year.
+VERSIONED_MAX_AGE = 365 * 24 * 60 * 60
+
+
+@lru_cache(maxsize=512)
+def _digest(path: str, mtime_ns: int, size: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_digest(path) -> str:
+    """sha256 of a file, recomputed only when its size or mtime changes."""
+    st = os.stat(path)
+    return _digest(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def spool_pdf(render):
+    """
+    Calls render(fh) once with a spooled temp file and returns it rewound.
+    Nothing is copied out of the buffer; send_pdf() streams from the handle.
+    """
+    fh = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+    try:
+        with timed("pdf"):
+            render(fh)
+    except Exception:
+        fh.close()
+        raise
+    fh.seek(0)
+    return fh
+
+
+def persist_pdf(render, dest) -> Path:
+    """
+    Calls render(fh) with a temp file next to dest, then renames it into place
+    with os.replace so readers never see a half-written PDF.
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-", suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as fh, timed("pdf"):
+            render(fh)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, dest)
+    except Exception:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return dest
+
+
+def send_pdf(source, download_name: str, as_attachment: bool = True, accel_root=None):
+    """
+    Sends a PDF from a path or an open binary handle without reading it into memory.
+
+    Paths are handed to send_file (which honours USE_X_SENDFILE); if X_ACCEL_PREFIX
+    is set and the path sits under accel_root, nginx is told to serve it instead.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = Path(source)
+        if X_ACCEL_PREFIX and accel_root is not None:
+            try:
+                rel = path.resolve().relative_to(Path(accel_root).resolve())
+            except ValueError:
+                rel = None
+            if rel is not None:
+                resp = Response(mimetype="application/pdf")
+                resp.headers["X-Accel-Redirect"] = X_ACCEL_PREFIX.rstrip("/") + "/" + rel.as_posix()
+                disposition = "attachment" if as_attachment else "inline"
+                resp.headers.set("Content-Disposition", disposition, filename=download_name)
+                return resp
+        return send_file(
+            os.path.abspath(path),
+            mimetype="application/pdf",
+            as_attachment=as_attachment,
+            download_name=download_name,
+        )
+
+    size = None
+    try:
+        source.seek(0, os.SEEK_END)
+        size = source.tell()
+        source.seek(0)
+    except Exception:
+        pass
+
+    resp = send_file(
+        source,
+        mimetype="application/pdf",
+        as_attachment=as_attachment,
+        download_name=download_name,
+    )
+    if size is not None:
+        resp.content_length = size
+    return resp
@@ -0,0 +1,210 @@
+"""
+Opt-in sampling profiler for production requests.
+
+A request is profiled when either:
+- PROFILE_SAMPLE_RATE (0..1) is set and the request is picked at that rate, or
+- PROFILE_SECRET is set and the request carries a valid X-Profile-Token header
+  (mint one with `python profiling.py token`; valid for PROFILE_TOKEN_MAX_AGE
+  seconds).
+
+While a profiled request runs, a sampler thread records the request thread's
+Python stack every PROFILE_INTERVAL_MS. The samples are written in collapsed
+("folded") format, one "frame;frame;frame count" line per distinct stack, to
+profiles/<endpoint>/<time>-<ms>ms.folded. That is the input flamegraph.pl and
+speedscope expect. Only the newest PROFILE_KEEP files per endpoint are kept.
+
+/admin/profiles (same X-Profile-Token header; a query-string token is not
+accepted) lists endpoints and their profiles; /admin/profiles/<endpoint> shows
+the top functions by self and total samples across that endpoint's profiles.
+Sampling without PROFILE_SECRET still records profiles, but nothing can read
+them over HTTP, so profile_app() logs a warning at startup.
+
+    python profiling.py token            # print a token for X-Profile-Token
+    python profiling.py top ENDPOINT     # top functions from the CLI
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0") or 0)
+PROFILE_SECRET = os.getenv("PROFILE_SECRET", "")
+PROFILE_TOKEN_MAX_AGE = int(os.getenv("PROFILE_TOKEN_MAX_AGE", "3600"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+TOKEN_SALT = "nilpf-profile"
+
+
+def _serializer():
+    from itsdangerous import URLSafeTimedSerializer
+
+    return URLSafeTimedSerializer(PROFILE_SECRET, salt=TOKEN_SALT)
+
+
+def make_token() -> str:
+    return _serializer().dumps("profile")
+
+
+def valid_token(token) -> bool:
+    if not PROFILE_SECRET or not token:
+        return False
+    from itsdangerous import BadSignature
+
+    try:
+        return _serializer().loads(token, max_age=PROFILE_TOKEN_MAX_AGE) == "profile"
+    except BadSignature:
+        return False
+
+
+def _label(code) -> str:
+    # package/module.py:function keeps same-named functions in different modules apart.
+    parent, name = os.path.split(code.co_filename)
+    return f"{os.path.basename(parent)}/{name}:{code.co_name}"
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a helper thread."""
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL_MS / 1000):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            # A sample taken after stop() would only show the request thread joining us.
+            if stack and not self._stop.is_set():
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+def _safe_name(endpoint) -> str:
+    return "".join(ch if ch.isalnum() or ch in "._-" else "_" for ch in (endpoint or "unmatched"))
+
+
+def write_profile(endpoint, stacks, elapsed_ms, profile_dir=PROFILE_DIR) -> Path:
+    out_dir = Path(profile_dir) / _safe_name(endpoint)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{elapsed_ms:.0f}ms.folded"
+    path.write_text("".join(f"{stack} {n}\n" for stack, n in stacks.most_common()), encoding="utf-8")
+
+    old = sorted(out_dir.glob("*.folded"), key=lambda p: p.stat().st_mtime)
+    for stale in old[:-PROFILE_KEEP]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+    return path
+
+
+def top_functions(endpoint, limit=30, profile_dir=PROFILE_DIR) -> dict:
+    """Self and total sample counts per function over every profile kept for endpoint."""
+    self_counts, total_counts = Counter(), Counter()
+    samples = 0
+    files = sorted((Path(profile_dir) / _safe_name(endpoint)).glob("*.folded"))
+    for path in files:
+        for line in path.read_text(encoding="utf-8").splitlines():
+            stack, _, n = line.rpartition(" ")
+            if not stack or not n.isdigit():
+                continue
+            n = int(n)
+            frames = stack.split(";")
+            samples += n
+            self_counts[frames[-1]] += n
+            for frame in set(frames):
+                total_counts[frame] += n
+
+    def rows(counts):
+        return [{"function": f, "samples": n, "pct": round(100.0 * n / samples, 1)} for f, n in counts.most_common(limit)]
+
+    return {
+        "endpoint": endpoint,
+        "profiles": len(files),
+        "samples": samples,
+        "self": rows(self_counts) if samples else [],
+        "total": rows(total_counts) if samples else [],
+    }
+
+
+def list_profiles(profile_dir=PROFILE_DIR) -> dict:
+    root = Path(profile_dir)
+    if not root.is_dir():
+        return {}
+    return {d.name: sorted(p.name for p in d.glob("*.folded")) for d in sorted(root.iterdir()) if d.is_dir()}
+
+
+def profile_app(app):
+    """Registers the request hooks; does nothing unless a sample rate or a secret is configured."""
+    if not PROFILE_SAMPLE_RATE and not PROFILE_SECRET:
+        return
+    from flask import g, request
+
+    if PROFILE_SAMPLE_RATE and not PROFILE_SECRET:
+        app.logger.warning(
+            "PROFILE_SAMPLE_RATE=%s but PROFILE_SECRET is not set: profiles are written to %s "
+            "and /admin/profiles stays disabled",
+            PROFILE_SAMPLE_RATE, PROFILE_DIR,
+        )
+
+    @app.before_request
+    def _start_profile():
+        picked = PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE
+        if picked or valid_token(request.headers.get("X-Profile-Token")):
+            g._profile = (StackSampler(threading.get_ident()).start(), time.perf_counter())
+
+    @app.teardown_request
+    def _finish_profile(exc):
+        # After the response body has been sent, so streamed pages are covered.
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return
+        sampler, started = profile
+        stacks = sampler.stop()
+        if stacks:
+            write_profile(request.endpoint, stacks, (time.perf_counter() - started) * 1000)
+
+
+def main(argv=None) -> int:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Request profiler tools.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("token", help="print an X-Profile-Token value (needs PROFILE_SECRET)")
+    p_top = sub.add_parser("top", help="top functions for an endpoint")
+    p_top.add_argument("endpoint")
+    p_top.add_argument("--limit", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "token":
+        if not PROFILE_SECRET:
+            print("PROFILE_SECRET is not set", file=sys.stderr)
+            return 1
+        print(make_token())
+    else:
+        print(json.dumps(top_functions(args.endpoint, args.limit), indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
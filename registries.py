@@ -0,0 +1,75 @@
+"""
+Process-wide registries and indexes the route modules share.
+
+Each one builds itself on first use and reloads when its files change on disk.
+warm() builds them all in the process that runs app.preload(). Under gunicorn
+that is the master (gunicorn.conf.py), so forked workers start with the layouts, the
+source PDF index, the doc store manifest and the source PDF digests already in
+memory.
+"""
+import time
+from pathlib import Path
+
+from doc_store import DocStore
+from event_log import EventLog
+from form_identity import candidate_form_keys
+from layout_registry import LayoutRegistry
+from license_stamps import LicenseStamps
+from pdf_optimize import OptimizedPdfs
+from pdf_response import file_digest
+from source_pdf_index import SourcePdfIndex
+from state_bundles import StateBundles
+
+# -------------------------
+# Participant PDF source lookup
+# -------------------------
+def get_source_pdf_relpath(form_name: str) -> str:
+    return SOURCE_PDFS.resolve(form_name)
+
+def get_source_pdf_url(form_name: str) -> str:
+    """/source-pdf URL for a form, versioned by content hash so it can be cached for good."""
+    from urllib.parse import quote
+    if not form_name:
+        return ""
+    url = f"/source-pdf/{quote(form_name)}"
+    rel = SOURCE_PDFS.resolve_any(Path(form_name).name)
+    if rel:
+        url += f"?v={file_digest(rel)[:16]}"
+    return url
+
+LAYOUT_DIR = "form_builder_layouts"
+LAYOUTS = LayoutRegistry(LAYOUT_DIR, candidate_form_keys)
+
+# Only the 2 real source folders are searched, plus static/documents as a last fallback
+SOURCE_PDFS = SourcePdfIndex(
+    search_roots=["EF_v2.2", "Core-v2.1"],
+    direct_roots=["EF_v2.2", "Core-v2.1", "static/documents"],
+    key_variants=candidate_form_keys,
+)
+
+# Optimized variants written by pdf_optimize.py, looked up by source content hash
+OPTIMIZED_PDFS = OptimizedPdfs("pdf_optimized")
+
+# Per-state core documents, deduplicated into content-addressed blobs (doc_store.py)
+DOC_STORE = DocStore("doc_store", "states")
+STATE_BUNDLES = StateBundles(DOC_STORE, "doc_store/bundles")
+
+# Stamped per-license copies (license_stamps.py); upsert_license() invalidates them.
+STAMPS = LicenseStamps("stamped_docs")
+
+# Kiosk idle-screen events; written in batches by a background thread (event_log.py).
+DIGNITY_LOG = EventLog("dignity_log.txt")
+
+
+def warm(form_names=()) -> dict:
+    """Loads every registry now; form_names are hashed so their /source-pdf URLs are ready. Returns counts and seconds."""
+    start = time.perf_counter()
+    SOURCE_PDFS.load()
+    OPTIMIZED_PDFS.load()
+    stats = {
+        "layouts": len(LAYOUTS),
+        "states": len(DOC_STORE.states()),
+        "source_pdfs": sum(1 for name in form_names if "?v=" in get_source_pdf_url(name)),
+    }
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    return stats
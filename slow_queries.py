@@ -0,0 +1,216 @@
+"""
+Slow-query log for SQLite connections opened with instrumentation.connect_db().
+
+Any statement whose execute() takes at least SLOW_QUERY_MS (default 50) is
+appended as one JSON line to SLOW_QUERY_LOG (default slow_queries.log) through
+an EventLog, so the request thread never waits on the file. Each line holds:
+- the normalized statement (literals replaced by ?, whitespace collapsed);
+- the shape of its parameters (types and string lengths, never the values);
+- the endpoint and the time taken.
+The first time a worker sees a normalized statement, it also runs EXPLAIN
+QUERY PLAN for it on the same connection with the same parameters and adds
+the plan to the line. A plan step that SCANs a table without an index is the
+usual sign of a WHERE clause that wraps the column in a function, such as
+TRIM(COALESCE(participant_id, '')) or lower(trim(payer_email)).
+
+For a SELECT, execute() covers the time to the first row. Rows fetched
+afterwards aren't counted, so a query that streams a large result can be slow
+without showing up here.
+
+report() aggregates the log per normalized statement. It is used by
+/admin/slow-queries and by:
+
+    python slow_queries.py report [--log slow_queries.log] [--limit 20]
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+
+from event_log import EventLog
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "50"))
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "slow_queries.log")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+
+def normalize(sql) -> str:
+    """One key per statement shape: literals become ?, IN (?, ?, ...) becomes IN (?...)."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = " ".join(sql.split())
+    return _IN_LIST.sub("(?...)", sql)
+
+
+def _shape(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return f"str[{len(value)}]"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"bytes[{len(value)}]"
+    return type(value).__name__
+
+
+def param_shape(params):
+    """Types (and lengths) of the bound parameters, so call sites can be told apart without logging data."""
+    if isinstance(params, dict):
+        return {k: _shape(v) for k, v in params.items()}
+    try:
+        return [_shape(v) for v in params]
+    except TypeError:
+        return _shape(params)
+
+
+def explain(conn, sql, params=()) -> list:
+    """EXPLAIN QUERY PLAN rows as indented strings."""
+    cur = sqlite3.Connection.cursor(conn, sqlite3.Cursor)
+    try:
+        rows = cur.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    finally:
+        cur.close()
+    depth = {0: 0}
+    plan = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, 0) + 1
+        plan.append("  " * (depth[node_id] - 1) + detail)
+    return plan
+
+
+def full_scans(plan) -> list:
+    # SCAN reads every row, including "SCAN t USING COVERING INDEX" (every index entry); SEARCH is a lookup.
+    return [step.strip() for step in plan if step.strip().startswith("SCAN ")]
+
+
+class SlowQueryLog:
+    def __init__(self, path=SLOW_QUERY_LOG, threshold_ms=SLOW_QUERY_MS):
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self._events = None
+        self._explained = set()
+        self._lock = threading.Lock()
+
+    def record(self, conn, sql, params, ms, endpoint=None, many=False):
+        if ms < self.threshold_ms:
+            return
+        statement = normalize(sql)
+        line = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "statement": statement,
+            "ms": round(ms, 2),
+            "endpoint": endpoint,
+            "params": None if many else param_shape(params),
+        }
+        with self._lock:
+            first = statement not in self._explained
+            self._explained.add(statement)
+        if first and not many and sql.lstrip().upper().startswith(_EXPLAINABLE):
+            try:
+                line["plan"] = explain(conn, sql, params)
+            except sqlite3.Error as e:
+                line["plan_error"] = str(e)
+        self._event_log().log(json.dumps(line))
+
+    def _event_log(self) -> EventLog:
+        # Created on the first slow query; the lock keeps concurrent requests from each making one.
+        if self._events is None:
+            with self._lock:
+                if self._events is None:
+                    self._events = EventLog(self.path)
+        return self._events
+
+    def flush(self):
+        if self._events is not None:
+            self._events.flush()
+
+
+SLOW_QUERIES = SlowQueryLog()
+
+
+def report(path=SLOW_QUERY_LOG, limit=50) -> list:
+    """Slow statements ordered by total time, with counts, latency, parameter shapes, endpoints and plan."""
+    stats = {}
+    try:
+        f = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    with f:
+        for raw in f:
+            try:
+                line = json.loads(raw)
+            except ValueError:
+                continue
+            entry = stats.get(line["statement"])
+            if entry is None:
+                entry = stats[line["statement"]] = {
+                    "statement": line["statement"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "last_seen": None,
+                    "endpoints": Counter(),
+                    "params": Counter(),
+                    "plan": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += line["ms"]
+            entry["max_ms"] = max(entry["max_ms"], line["ms"])
+            entry["last_seen"] = line["ts"]
+            entry["endpoints"][line.get("endpoint") or "-"] += 1
+            entry["params"][json.dumps(line.get("params"))] += 1
+            if line.get("plan") is not None:
+                entry["plan"] = line["plan"]
+
+    rows = sorted(stats.values(), key=lambda e: e["total_ms"], reverse=True)[:limit]
+    for entry in rows:
+        entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 2)
+        entry["total_ms"] = round(entry["total_ms"], 2)
+        entry["endpoints"] = dict(entry["endpoints"].most_common())
+        entry["params"] = [{"shape": json.loads(s), "count": n} for s, n in entry["params"].most_common(5)]
+        entry["full_scans"] = full_scans(entry["plan"] or [])
+    return rows
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Slow SQLite statements, aggregated.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_report = sub.add_parser("report", help="aggregate the slow-query log")
+    p_report.add_argument("--log", default=SLOW_QUERY_LOG)
+    p_report.add_argument("--limit", type=int, default=20)
+    p_report.add_argument("--json", action="store_true", help="print JSON instead of text")
+    args = parser.parse_args(argv)
+
+    rows = report(args.log, args.limit)
+    if args.json:
+        print(json.dumps(rows, indent=1))
+        return 0
+    if not rows:
+        print(f"no slow queries in {args.log}")
+        return 0
+    for entry in rows:
+        print(f"{entry['count']:>6}x  total {entry['total_ms']:>10.1f} ms  avg {entry['avg_ms']:>8.1f}  max {entry['max_ms']:>8.1f}")
+        print(f"        {entry['statement'][:400]}")
+        endpoints = ", ".join(f"{k} ({n})" for k, n in entry["endpoints"].items())
+        print(f"        endpoints: {endpoints}")
+        shapes = ", ".join(f"{p['shape']} ({p['count']})" for p in entry["params"])
+        print(f"        params: {shapes}")
+        for step in entry["plan"] or []:
+            print(f"        | {step}")
+        for scan in entry["full_scans"]:
+            print(f"        ! full scan: {scan}")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
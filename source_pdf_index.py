@@ -0,0 +1,162 @@
+"""
+Index of source PDFs under EF_v2.2, Core-v2.1 and static/documents.
+
+get_source_pdf_relpath() used to stat several candidates and then rglob both
+source trees on every miss; /source-pdf repeated that for each name variant.
+This index walks the trees once and answers hits and misses with dict lookups.
+It re-stats the indexed directories at most every REFRESH_INTERVAL seconds and
+rebuilds when any of their mtimes change (a file added, removed or renamed).
+"""
+import os
+import threading
+import time
+from pathlib import Path
+
+REFRESH_INTERVAL = 5.0
+
+SOURCE_HINTS = {
+    "EF": "EF_v2.2",
+    "EF_v2.2": "EF_v2.2",
+    "CORE": "Core-v2.1",
+    "Core": "Core-v2.1",
+    "Core-v2.1": "Core-v2.1",
+}
+
+
+class SourcePdfIndex:
+    def __init__(self, search_roots, direct_roots, key_variants):
+        # search_roots are walked recursively; direct_roots only at the top level.
+        self.search_roots = [Path(p) for p in search_roots]
+        self.direct_roots = [Path(p) for p in direct_roots]
+        self.key_variants = key_variants
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._dir_mtimes = None
+        self._hinted = {}
+        self._direct = {}
+        self._nested = {}
+        self._variants = {}
+
+    def _snapshot(self):
+        mtimes = {}
+        for root in self.search_roots + self.direct_roots:
+            try:
+                mtimes[root.as_posix()] = os.stat(root).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[root.as_posix()] = None
+                continue
+            if root in self.search_roots:
+                for dirpath, dirnames, _ in os.walk(root):
+                    for d in dirnames:
+                        p = os.path.join(dirpath, d)
+                        try:
+                            mtimes[p] = os.stat(p).st_mtime_ns
+                        except FileNotFoundError:
+                            pass
+        return mtimes
+
+    def _build(self):
+        hinted = {}
+        direct = {}
+        nested = {}
+
+        for root in self.direct_roots:
+            if not root.is_dir():
+                continue
+            for entry in sorted(os.scandir(root), key=lambda e: e.name):
+                if entry.is_file():
+                    rel = (root / entry.name).as_posix()
+                    hinted[(root.as_posix(), entry.name)] = rel
+                    direct.setdefault(entry.name, rel)
+
+        for root in self.search_roots:
+            if not root.is_dir():
+                continue
+            for path in sorted(root.rglob("*")):
+                if path.is_file():
+                    nested.setdefault(path.name, path.as_posix())
+
+        by_name = dict(nested)
+        by_name.update(direct)
+        variants = {}
+        for name, rel in by_name.items():
+            for key in self.key_variants(name):
+                variants.setdefault(key, rel)
+
+        self._hinted = hinted
+        self._direct = direct
+        self._nested = nested
+        self._variants = variants
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._dir_mtimes is not None and now - self._checked_at < REFRESH_INTERVAL:
+            return
+        with self._lock:
+            if self._dir_mtimes is not None and now - self._checked_at < REFRESH_INTERVAL:
+                return
+            mtimes = self._snapshot()
+            if mtimes != self._dir_mtimes:
+                self._build()
+                self._dir_mtimes = mtimes
+            self._checked_at = now
+
+    def invalidate(self):
+        with self._lock:
+            self._dir_mtimes = None
+
+    def load(self):
+        """Walks the source trees now instead of on the first resolve()."""
+        self._refresh()
+
+    def pdf_counts(self) -> dict:
+        """Number of PDFs indexed under each search and direct root."""
+        self._refresh()
+        paths = {p for p in (*self._hinted.values(), *self._nested.values()) if p.lower().endswith(".pdf")}
+        counts = {}
+        for root in dict.fromkeys(self.search_roots + self.direct_roots):
+            prefix = root.as_posix() + "/"
+            counts[root.as_posix()] = sum(1 for p in paths if p.startswith(prefix))
+        return counts
+
+    def resolve(self, form_name: str) -> str:
+        """Same answer get_source_pdf_relpath() gave by probing the filesystem."""
+        raw = Path(form_name).name if form_name else ""
+        if not raw:
+            return ""
+        self._refresh()
+
+        source_hint = ""
+        fname = raw
+        if "|" in raw:
+            source_hint, fname = raw.split("|", 1)
+            source_hint = Path(source_hint).name.strip()
+        fname = Path(fname).name.strip()
+
+        if source_hint in SOURCE_HINTS:
+            hit = self._hinted.get((SOURCE_HINTS[source_hint], fname))
+            if hit:
+                return hit
+
+        return self._direct.get(fname) or self._nested.get(fname) or ""
+
+    def resolve_any(self, form_name: str) -> str:
+        """resolve(), falling back to every &/AND and number-padding variant."""
+        rel = self.resolve(form_name)
+        if rel:
+            return rel
+        raw = Path(form_name).name if form_name else ""
+        if not raw:
+            return ""
+        keys = self.key_variants(raw)
+        for key in keys:
+            hit = self.resolve(key)
+            if hit:
+                return hit
+        # A file whose own variants include the requested name (e.g. the request
+        # is padded "07_..." but the file on disk is "7_...").
+        for key in (raw, *keys):
+            hit = self._variants.get(key)
+            if hit:
+                return hit
+        return ""
@@ -0,0 +1,123 @@
+"""
+Per-state document bundle ZIPs, built on demand from the doc store.
+
+A bundle is assembled from one state's manifest the first time it is asked for
+and cached at doc_store/bundles/<STATE_FOLDER>-<manifest hash>.zip, so it is
+rebuilt only when that state's documents change. Concurrent requests for the same
+bundle coalesce: threads share an in-process lock and gunicorn workers an flock on
+a lock file, so one caller builds and the rest wait and reuse the result.
+
+Entries get a fixed timestamp and mode, so a manifest always builds to the same
+bytes and its hash is a valid ETag across rebuilds and Range requests. A
+superseded bundle is kept for BUNDLE_GRACE seconds, since a worker may already
+hold its path, and is swept by a later build.
+"""
+import fcntl
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+from metrics import cache_result
+
+BUNDLE_DIR = "doc_store/bundles"
+BUNDLE_GRACE = 300
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class MissingBlobError(LookupError):
+    """A state's manifest names a blob the doc store doesn't have; no bundle is written."""
+
+
+class StateBundles:
+    def __init__(self, store, bundle_dir=BUNDLE_DIR):
+        self.store = store
+        self.bundle_dir = Path(bundle_dir)
+        self._guard = threading.Lock()
+        self._locks = {}
+
+    def _lock_for(self, key) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def bundle_name(self, state) -> str:
+        folder = self.store.state_key(state)
+        name = folder.split("_", 1)[1] if "_" in folder else folder
+        return f"{name}_Core_Documents.zip"
+
+    def path_for(self, state):
+        """(cache path, manifest hash) for a state's bundle, or (None, "") if the state is unknown."""
+        folder = self.store.state_key(state)
+        if not folder:
+            return None, ""
+        digest = self.store.manifest_digest(folder)
+        return self.bundle_dir / f"{folder}-{digest[:16]}.zip", digest
+
+    def _build(self, folder, dest: Path):
+        prefix = dest.name.split("-", 1)[0]
+        fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-", suffix=".zip")
+        try:
+            with os.fdopen(fd, "wb") as fh, zipfile.ZipFile(fh, "w", zipfile.ZIP_DEFLATED) as zf:
+                for logical, sha in sorted(self.store.manifest(folder).items()):
+                    blob = self.store.blob_path(sha)
+                    if blob is None or not blob.is_file():
+                        raise MissingBlobError(f"{folder}/{logical}: blob {sha[:16]} is missing from the doc store")
+                    info = zipfile.ZipInfo(f"{prefix}/{logical}", date_time=ZIP_DATE_TIME)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    info.external_attr = 0o644 << 16
+                    with open(blob, "rb") as src, zf.open(info, "w") as out:
+                        shutil.copyfileobj(src, out)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, dest)
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        self._sweep(folder, dest)
+
+    def _sweep(self, folder, dest: Path):
+        """Deletes this state's bundles that were superseded more than BUNDLE_GRACE seconds ago."""
+        bundles = []
+        for path in self.bundle_dir.glob(f"{folder}-*.zip"):
+            try:
+                bundles.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                pass
+        bundles.sort()
+        cutoff = time.time() - BUNDLE_GRACE
+        # A bundle was superseded when the next newer one was written.
+        for (_, old), (superseded_at, _) in zip(bundles, bundles[1:]):
+            if old != dest and superseded_at < cutoff:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+
+    def get(self, state):
+        """Returns (path, manifest hash) of the state's bundle, building it if needed."""
+        path, digest = self.path_for(state)
+        if path is None:
+            return path, digest
+        if path.exists():
+            cache_result("state_bundles", True)
+            return path, digest
+        cache_result("state_bundles", False)
+
+        folder = self.store.state_key(state)
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock_for(path.name):
+            if path.exists():
+                return path, digest
+            with open(self.bundle_dir / f".{folder}.lock", "w") as lock_fh:
+                fcntl.flock(lock_fh, fcntl.LOCK_EX)
+                try:
+                    if not path.exists():
+                        self._build(folder, path)
+                finally:
+                    fcntl.flock(lock_fh, fcntl.LOCK_UN)
+        return path, digest
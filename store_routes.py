@@ -0,0 +1,1559 @@
+"""
+Store and checkout: the landing page, activation, PayPal checkout and the
+licensee's documents (/documents, the certificate, state documents and the
+stamped MLA / Master Lease).
+
+The 400/404/500 handlers registered here apply to the whole app.
+"""
+import time
+from pathlib import Path
+
+from flask import Blueprint, abort, jsonify, redirect, render_template_string, request, send_file, session
+
+from certificate_render import CERTIFICATE_VERSION, certificate_renderer
+from database import DB_PATH, get_license_by_business_address, get_license_by_session, get_license_session_by_email_address, upsert_license
+from doc_search import search as search_documents
+from instrumentation import connect_db
+from license_stamps import license_fields, stamp_pdf
+from participant_forms import framework_groups
+from paypal_api import get_paypal_access_token, paypal_post
+from pdf_response import file_digest, send_pdf
+from registries import DOC_STORE, OPTIMIZED_PDFS, SOURCE_PDFS, STAMPS, STATE_BUNDLES
+from state_bundles import MissingBlobError
+
+bp = Blueprint("store", __name__)
+
+
+def _safe_redirect(e=None):
+    path = (request.path or "").lower()
+
+    # PayPal checkout flow
+    if path.startswith("/buy") or path.startswith("/success") or path.startswith("/cancel"):
+        if session.get("licensed_location"):
+            return redirect("/buy")
+        return redirect("/address")
+
+    # Product page should stay product page
+    if path.startswith("/product"):
+        return redirect("/product")
+
+    # Documents or upgrade should not redirect away
+    if path.startswith("/documents") or path.startswith("/upgrade"):
+        return e if e is not None else ("Documents/upgrade request failed. Check session_id or purchase record.", 400)
+
+    # Default: return the actual error instead of bouncing to /address
+    return e if e is not None else ("Bad Request", 400)
+
+@bp.app_errorhandler(400)
+def handle_400(e):
+    return _safe_redirect(e)
+
+@bp.app_errorhandler(404)
+def handle_404(e):
+    return _safe_redirect(e)
+
+@bp.app_errorhandler(500)
+def handle_500(e):
+    return _safe_redirect(e)
+
+# Product catalog (edit prices + file paths as you wish)
+
+PRODUCTS = {
+    "FIRST_PROPERTY": {
+        "label": "NILPF First Property Access",
+        "price": "1.00",
+        "file": "",
+        "kind": "one_time",
+    },
+    "ADDITIONAL_PROPERTY": {
+        "label": "NILPF Additional Property Access",
+        "price": "1.00",
+        "file": "",
+        "kind": "one_time",
+    },
+    "PROPERTY_MONTHLY": {
+        "label": "NILPF Monthly Property Subscription",
+        "price": "1.00",
+        "file": "",
+        "kind": "subscription",
+        "plan_id": "P-93D65823U4853871NNGWD7NQ",
+    }
+}
+
+@bp.route("/state-documents/<path:name>")
+def state_document(name):
+    session_id = session.get("licensed_session_id") or request.args.get("session_id")
+    if not session_id:
+        return redirect("/")
+
+    session["licensed_session_id"] = session_id
+
+    lic = get_license_by_session(session_id)
+    if not lic:
+        abort(404, "License not found.")
+
+    # Licensees get their own property state's copy; the blob is shared by every state.
+    prop_state = lic[3]
+    sha, blob = DOC_STORE.resolve(request.args.get("state") or prop_state, name)
+    if not sha or not blob or not blob.exists():
+        abort(404)
+
+    served, etag = OPTIMIZED_PDFS.variant(blob, sha)
+    resp = send_file(
+        served.resolve(),
+        mimetype="application/pdf",
+        download_name=Path(name).name,
+        etag=etag,
+        conditional=True,
+        max_age=0,
+    )
+    resp.cache_control.no_cache = True
+    resp.headers.setdefault("Accept-Ranges", "bytes")
+    return resp
+
+@bp.route("/documents/state-bundle.zip")
+def state_bundle():
+    session_id = session.get("licensed_session_id") or request.args.get("session_id")
+    if not session_id:
+        return redirect("/")
+
+    session["licensed_session_id"] = session_id
+
+    lic = get_license_by_session(session_id)
+    if not lic:
+        abort(404, "License not found.")
+
+    state = request.args.get("state") or lic[3]
+    try:
+        path, digest = STATE_BUNDLES.get(state)
+    except MissingBlobError as e:
+        print("STATE BUNDLE ERROR:", e)
+        abort(404, "Some documents for this state are missing.")
+    if path is None:
+        abort(404, "No documents for this state.")
+
+    # Streamed from the cached file; conditional=True handles If-None-Match and Range.
+    resp = send_file(
+        path.resolve(),
+        mimetype="application/zip",
+        as_attachment=True,
+        download_name=STATE_BUNDLES.bundle_name(state),
+        etag=digest,
+        conditional=True,
+        max_age=0,
+    )
+    resp.cache_control.no_cache = True
+    resp.headers.setdefault("Accept-Ranges", "bytes")
+    return resp
+
+@bp.route("/search")
+def search():
+    # Full-text search over the indexed source PDFs; build the index with `python doc_search.py`.
+    session_id = session.get("licensed_session_id") or request.args.get("session_id")
+    if not session_id or not get_license_by_session(session_id):
+        return jsonify(error="License session required."), 401
+
+    session["licensed_session_id"] = session_id
+
+    q = (request.args.get("q") or "").strip()
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 50))
+    except ValueError:
+        limit = 20
+
+    started = time.perf_counter()
+    conn = connect_db(DB_PATH)
+    results = search_documents(conn, q, limit)
+    conn.close()
+
+    return jsonify(
+        query=q,
+        took_ms=round((time.perf_counter() - started) * 1000, 2),
+        results=results,
+    )
+
+@bp.route("/home")
+def app_home():
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>NILPF Home</title>
+        <style>
+          body {
+            font-family: Arial, sans-serif;
+            margin: 0;
+            background: #f6f7fb;
+            color: #111;
+          }
+          .topbar {
+            background: #111;
+            color: #fff;
+            padding: 10px 16px;
+          }
+          .topbar a {
+            color: #fff;
+            margin-right: 20px;
+            text-decoration: none;
+            font-weight: 700;
+          }
+          .wrap {
+            max-width: 1000px;
+            margin: 0 auto;
+            padding: 28px;
+          }
+          .hero {
+            background: #fff;
+            border: 2px solid #111;
+            border-radius: 20px;
+            padding: 24px;
+            margin-bottom: 20px;
+          }
+          .hero h1 {
+            margin: 0 0 10px 0;
+            font-size: 34px;
+          }
+          .hero p {
+            margin: 0;
+            color: #444;
+            font-size: 18px;
+          }
+          .grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
+            gap: 16px;
+          }
+          .card {
+            background: #fff;
+            border: 2px solid #111;
+            border-radius: 18px;
+            padding: 20px;
+          }
+          .card h2 {
+            margin: 0 0 8px 0;
+            font-size: 22px;
+          }
+          .card p {
+            margin: 0 0 14px 0;
+            color: #444;
+          }
+          .btn {
+            display: inline-block;
+            text-decoration: none;
+            border: 2px solid #111;
+            background: #111;
+            color: #fff;
+            padding: 10px 14px;
+            border-radius: 999px;
+            font-weight: 700;
+          }
+          .footer-note {
+            margin-top: 20px;
+            color: #555;
+            font-size: 14px;
+          }
+          .home-float {
+            position: fixed;
+            right: 22px;
+            bottom: 22px;
+            z-index: 9999;
+            display: inline-block;
+            text-decoration: none;
+            border: 2px solid #111;
+            background: #fff;
+            color: #111;
+            padding: 10px 14px;
+            border-radius: 999px;
+            font-weight: 700;
+            box-shadow: 0 2px 8px rgba(0,0,0,.15);
+          }
+        </style>
+      </head>
+      <body>
+
+        
+
+        <div class="topbar">
+          <a href="/documents?tab=dashboard">Dashboard</a>
+          <a href="/participants">Participants</a>
+          <a href="/notes">Notes</a>
+          <a href="/logout">Logout</a>
+        </div>
+
+        <div class="wrap">
+          <div class="hero">
+            <h1>NILPF Home</h1>
+            <p>This is the face of the app. Return here anytime to safely leave participant material and navigate the system.</p>
+          </div>
+
+          <div class="grid">
+            <div class="card">
+              <h2>Add / View Participants</h2>
+              <p>Open the participant manager and access participant workflow records.</p>
+              <a class="btn" href="/participants">Open Participants</a>
+            </div>
+
+            <div class="card">
+              <h2>Operational Framework</h2>
+              <p>Return to the main framework and document workspace.</p>
+              <a class="btn" href="/documents?tab=dashboard">Open Framework</a>
+            </div>
+
+            <div class="card">
+              <h2>Incident / Status Documentation</h2>
+              <p>Record participant decline, incidents, concerns, and follow-up notes.</p>
+              <a class="btn" href="/notes">Open Notes</a>
+            </div>
+
+            <div class="card">
+              <h2>Program Essentials</h2>
+              <p>Quick access reminder for the core operator documents and licensed property details: Master License Agreement, Master Lease, property address, license key, buyer/operator, program standards, and Charter / Bill of Rights.</p>
+              <a class="btn" href="/documents?tab=dashboard">View Essentials</a>
+            </div>
+          </div>
+
+          <div class="footer-note">
+            Protected workspace for licensed NILPF operators.
+          </div>
+        </div>
+      </body>
+    </html>
+    """)
+
+# -------------------------
+# Routes
+# -------------------------
+
+
+@bp.route("/login", methods=["GET","POST"])
+def login():
+    error = None
+
+    if request.method == "POST":
+        email = request.form.get("email","").strip()
+        address = request.form.get("address","").strip()
+
+        if not email or not address:
+            error = "Email and Business Address are required."
+        else:
+            session_id = get_license_session_by_email_address(email, address)
+
+            if session_id:
+                lic = get_license_by_session(session_id)
+                if lic:
+                    payer_email, payer_name, prop_addr, prop_state, license_key, created_at, product_sku = lic
+                    session["licensed_session_id"] = session_id
+                    session["license_key"] = license_key
+                    session["payer_email"] = payer_email or email
+                    session["payer_name"] = payer_name or ""
+                    session["licensed_location"] = {
+                        "email": payer_email or email,
+                        "business_name": payer_name or "",
+                        "street": prop_addr or address,
+                        "city": "",
+                        "state": prop_state or "",
+                        "zip": "",
+                    }
+                    session["property_state"] = prop_state or ""
+                    session["product_sku"] = product_sku or ""
+                    return redirect(f"/documents?session_id={db_session_id}")
+                else:
+                    error = "License found, but record could not be opened."
+            else:
+                error = "No license found for that email and business address."
+
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <title>NILPF Access</title>
+        <style>
+          body { font-family: Arial; max-width: 420px; margin: 80px auto; }
+          input { width:100%; padding:10px; margin:6px 0; }
+          button { padding:10px 18px; background:#111; color:#fff; border:none; }
+          .error { color:red; margin-top:10px; }
+        </style>
+      </head>
+      <body>
+
+<style>
+.home-icon{
+    position:fixed;
+    top:60px;
+    right:22px;
+    font-size:22px;
+    text-decoration:none;
+    color:#111;
+    font-weight:600;
+}
+.home-icon:hover{
+    text-decoration:underline;
+}
+</style>
+
+
+<div style="background:#111;color:#fff;padding:10px;">
+
+<a href="/documents?tab=dashboard" style="color:#fff;margin-right:20px;">Dashboard</a>
+<a href="/participants" style="color:#fff;margin-right:20px;">Add / View Participants</a>
+<a href="/notes" style="color:#fff;">Incident / Status Documentation</a>
+</div>
+
+
+        <h2>Access Your Operational Framework</h2>
+        <p>Enter the email and business address used during purchase.</p>
+
+        <form method="post">
+          <input name="email" placeholder="Email address">
+          <input name="address" placeholder="Business address">
+          <button type="submit">Access Framework</button>
+        </form>
+
+        {% if error %}
+        <div class="error">{{ error }}</div>
+        {% endif %}
+
+      </body>
+    </html>
+    """, error=error)
+
+@bp.route("/certificate")
+def certificate():
+    session_id = session.get("licensed_session_id") or request.args.get("session_id")
+    if not session_id:
+        return redirect("/")
+
+    session["licensed_session_id"] = session_id
+
+    lic = get_license_by_session(session_id)
+    if not lic:
+        abort(404, "License not found.")
+
+    fields = license_fields(lic)
+    path = STAMPS.get(session_id, "certificate", fields, CERTIFICATE_VERSION, certificate_renderer(fields, session_id))
+
+    filename = f"certificate_{session_id}.pdf"
+    return send_pdf(path, filename, as_attachment=False)
+
+
+@bp.route("/")
+def home():
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>NILPF Operational Framework</title>
+        <style>
+          body {
+            font-family: Arial, sans-serif;
+            margin: 0;
+            background: #f6f7fb;
+            color: #111;
+          }
+          .wrap {
+            max-width: 920px;
+            margin: 0 auto;
+            padding: 24px 18px 40px;
+          }
+          .card {
+            background: #fff;
+            border: 2px solid #111;
+            border-radius: 16px;
+            padding: 24px;
+            box-shadow: 0 10px 30px rgba(0,0,0,.06);
+          }
+          h1 {
+            margin-top: 0;
+            font-size: 32px;
+          }
+          .sub {
+            font-size: 16px;
+            margin-bottom: 12px;
+          }
+          .note {
+            background: #f2f4f8;
+            border-left: 5px solid #111;
+            padding: 10px 12px;
+            border-radius: 10px;
+            margin: 12px 0 16px;
+          }
+          ul {
+            line-height: 1.7;
+            padding-left: 22px;
+          }
+          .actions {
+            margin-top: 16px;
+            display: flex;
+            gap: 12px;
+            flex-wrap: wrap;
+          }
+          .btn {
+            display: inline-block;
+            padding: 10px 14px;
+            border: 2px solid #111;
+            border-radius: 12px;
+            text-decoration: none;
+            color: #111;
+            font-weight: bold;
+            background: #fff;
+          }
+          .btn.primary {
+            background: #111;
+            color: #fff;
+          }
+        </style>
+      </head>
+      <body>
+
+<style>
+.home-icon{
+    position:fixed;
+    top:60px;
+    right:22px;
+    font-size:22px;
+    text-decoration:none;
+    color:#111;
+    font-weight:600;
+}
+.home-icon:hover{
+    text-decoration:underline;
+}
+</style>
+
+
+<div style="background:#111;color:#fff;padding:10px;">
+
+<a href="/documents?tab=dashboard" style="color:#fff;margin-right:20px;">Dashboard</a>
+<a href="/participants" style="color:#fff;margin-right:20px;">Add / View Participants</a>
+<a href="/notes" style="color:#fff;">Incident / Status Documentation</a>
+</div>
+
+        <div class="wrap">
+          <div class="card">
+            <h1>NILPF Operational Framework</h1>
+            <p class="sub">One product. One licensed address. One app-first workflow.</p>
+
+            <div class="note">
+              Activate this framework for one licensed address, complete payment, and return directly into the app.
+            </div>
+
+            <ul>
+              <li>Operational Framework access</li>
+              <li>Framework forms and internal documents</li>
+              <li>Download tools inside the app</li>
+              <li>Address-based activation flow</li>
+            </ul>
+
+            <div class="actions">
+              {% if session.get("licensed_location") %}
+                <a class="btn primary" href="/activate">Add New Location</a>
+              {% else %}
+                <a class="btn primary" href="/activate">Activate Primary Location</a>
+              {% endif %}
+            </div>
+
+            <div style="margin-top:16px;padding:14px;border:2px solid #111;border-radius:14px;">
+              <h3 style="margin-top:0;margin-bottom:8px;">Business Address Login</h3>
+              <p class="note">Enter your licensed business address to restore access.</p>
+              <form method="POST" action="/restore-access">
+                <input
+                  name="business_address"
+                  placeholder="Licensed Business Address"
+                  required
+                  style="width:100%;padding:10px;border:2px solid #111;border-radius:10px;box-sizing:border-box;margin-bottom:10px;"
+                >
+                <button class="btn primary" type="submit">Restore Access</button>
+              </form>
+            </div>
+
+            <div style="margin-top:12px;padding:14px;border:2px solid #111;border-radius:14px;">
+              <h3 style="margin-top:0;margin-bottom:8px;">Custom Form App</h3>
+              <p class="note">Bonus operator tool for preparing your own PDFs with checkbox, date, time, and signature fields.</p>
+              <a class="btn primary" href="/form-builder">Open Form App</a>
+            </div>
+          </div>
+        </div>
+      </body>
+    </html>
+    """)
+
+
+@bp.route("/restore-access", methods=["POST"])
+def restore_access():
+    business_address = (request.form.get("business_address") or "").strip()
+    if not business_address:
+        abort(400, "Business address is required.")
+
+    lic = get_license_by_business_address(business_address)
+    if not lic:
+        return render_template_string("""
+        <!doctype html>
+        <html>
+          <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1">
+            <title>Business Address Login</title>
+            <style>
+              body{font-family:Arial,sans-serif;max-width:760px;margin:40px auto;padding:0 16px;background:#f6f7fb}
+              .card{background:#fff;border:2px solid #111;border-radius:16px;padding:24px}
+              .btn{display:inline-block;padding:12px 16px;border:2px solid #111;border-radius:12px;background:#111;color:#fff;text-decoration:none;font-weight:bold}
+            </style>
+          </head>
+          <body>
+
+<style>
+.home-icon{
+    position:fixed;
+    top:60px;
+    right:22px;
+    font-size:22px;
+    text-decoration:none;
+    color:#111;
+    font-weight:600;
+}
+.home-icon:hover{
+    text-decoration:underline;
+}
+</style>
+
+
+            <div class="card">
+              <h1>Business Address Login</h1>
+              <p>No paid record was found for that address.</p>
+              <p>Please try the exact licensed business address used during activation.</p>
+              <p><a class="btn" href="/">Return Home</a></p>
+            </div>
+          </body>
+        </html>
+        """), 404
+
+    db_session_id, payer_email, payer_name, prop_addr, prop_state, license_key, created_at, product_sku = lic
+
+    session["licensed_session_id"] = db_session_id
+    session["product_sku"] = product_sku or "FIRST_PROPERTY"
+    session["license_key"] = license_key
+    session["licensed_location"] = {
+        "business_name": (payer_name or "").strip(),
+        "email": (payer_email or "").strip(),
+        "street": (prop_addr or "").strip(),
+        "city": "",
+        "state": (prop_state or "").strip().upper(),
+        "zip": "",
+    }
+
+    return redirect(f"/documents?session_id={db_session_id}")
+
+
+@bp.route("/activate", methods=["GET", "POST"])
+def activate():
+    if request.method == "POST":
+        session["product_sku"] = "FIRST_PROPERTY"
+        session["licensed_location"] = {
+            "business_name": (request.form.get("business_name") or "").strip(),
+            "email": (request.form.get("email") or "").strip(),
+            "street": (request.form.get("street") or "").strip(),
+            "city": (request.form.get("city") or "").strip(),
+            "state": (request.form.get("state") or "").strip().upper(),
+            "zip": (request.form.get("zip") or "").strip(),
+        }
+        loc = session["licensed_location"]
+        required = ["business_name", "email", "street", "city", "state", "zip"]
+        if any(not loc.get(k) for k in required):
+            abort(400, "All address fields are required.")
+        return redirect("/buy")
+
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>Activate Operational Framework</title>
+        <style>
+          body{font-family:Arial,sans-serif;max-width:1200px;margin:40px auto;padding:0 16px;background:#f6f7fb}
+          .card{background:#fff;border:2px solid #111;border-radius:16px;padding:24px}
+          .activate-grid{display:flex;flex-wrap:wrap;gap:12px;align-items:end}
+          .field{display:flex;flex-direction:column;min-width:260px;flex:1}
+          .field.street{min-width:260px;flex:2}
+          label{display:block;margin:0 0 6px;font-weight:bold}
+          input{width:100%;padding:12px;border:2px solid #111;border-radius:10px;box-sizing:border-box}
+          .btn{display:inline-block;padding:14px 18px;border:2px solid #111;border-radius:12px;background:#111;color:#fff;text-decoration:none;font-weight:bold;white-space:nowrap}
+        </style>
+      </head>
+      <body>
+
+<style>
+.home-icon{
+    position:fixed;
+    top:60px;
+    right:22px;
+    font-size:22px;
+    text-decoration:none;
+    color:#111;
+    font-weight:600;
+}
+.home-icon:hover{
+    text-decoration:underline;
+}
+</style>
+
+
+<div style="background:#111;color:#fff;padding:10px;">
+
+<a href="/documents?tab=dashboard" style="color:#fff;margin-right:20px;">Dashboard</a>
+<a href="/participants" style="color:#fff;margin-right:20px;">Add / View Participants</a>
+<a href="/notes" style="color:#fff;">Incident / Status Documentation</a>
+</div>
+
+        <div class="card">
+          <h1>Activate Operational Framework</h1>
+          <form method="post">
+            <div class="activate-grid">
+              <div class="field">
+                <label>Business Name</label>
+                <input name="business_name">
+              </div>
+              <div class="field">
+                <label>Email</label>
+                <input name="email" type="email">
+              </div>
+              <div class="field street">
+                <label>Street</label>
+                <input name="street">
+              </div>
+              <div class="field">
+                <label>City</label>
+                <input name="city">
+              </div>
+              <div class="field" style="max-width:110px;">
+                <label>State</label>
+                <input name="state">
+              </div>
+              <div class="field" style="max-width:130px;">
+                <label>ZIP</label>
+                <input name="zip">
+              </div>
+              <div class="field" style="flex:0 0 auto;min-width:auto;">
+                <button class="btn" type="submit">Continue to Payment</button>
+              </div>
+            </div>
+          </form>
+        </div>
+      </body>
+    </html>
+    """)
+
+@bp.route("/product", methods=["GET", "POST"])
+def product():
+    sku = (request.values.get("sku") or request.args.get("sku") or "FIRST_PROPERTY").strip()
+    if sku not in PRODUCTS:
+        abort(400, f"Unknown product sku: {sku}")
+
+    session["product_sku"] = sku
+
+    if sku == "ADDITIONAL_PROPERTY":
+        return redirect("/add-property")
+
+    return redirect(f"/buy?sku={sku}")
+
+
+@bp.route("/add-property", methods=["GET", "POST"])
+def add_property():
+    if request.method == "POST":
+        session["product_sku"] = "ADDITIONAL_PROPERTY"
+        session["pending_required_monthly_for"] = "ADDITIONAL_PROPERTY"
+        session["licensed_location"] = {
+            "business_name": (request.form.get("business_name") or "").strip(),
+            "email": (request.form.get("email") or "").strip(),
+            "street": (request.form.get("street") or "").strip(),
+            "city": (request.form.get("city") or "").strip(),
+            "state": (request.form.get("state") or "").strip().upper(),
+            "zip": (request.form.get("zip") or "").strip(),
+        }
+
+        loc = session["licensed_location"]
+        required = ["business_name", "email", "street", "city", "state", "zip"]
+        if any(not loc.get(k) for k in required):
+            abort(400, "All address fields are required.")
+
+        return redirect("/buy?sku=ADDITIONAL_PROPERTY")
+
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>Add Another Property</title>
+        <style>
+          body{font-family:Arial,sans-serif;max-width:1200px;margin:40px auto;padding:0 16px;background:#f6f7fb}
+          .card{background:#fff;border:2px solid #111;border-radius:16px;padding:24px}
+          .activate-grid{display:flex;flex-wrap:wrap;gap:12px;align-items:end}
+          .field{display:flex;flex-direction:column;min-width:260px;flex:1}
+          .field.street{min-width:260px;flex:2}
+          label{display:block;margin:0 0 6px;font-weight:bold}
+          input{width:100%;padding:12px;border:2px solid #111;border-radius:10px;box-sizing:border-box}
+          .btn{display:inline-block;padding:14px 18px;border:2px solid #111;border-radius:12px;background:#111;color:#fff;text-decoration:none;font-weight:bold;white-space:nowrap}
+          .note{background:#f2f4f8;border-left:5px solid #111;padding:14px;border-radius:10px;margin:16px 0 22px;line-height:1.6}
+        </style>
+      </head>
+      <body>
+        <div class="card">
+          <h1>Add Another Property</h1>
+          <div class="note">
+            Each added property requires two parts together: the Additional Property Access purchase and the active Monthly Plan.
+            These are not sold separately. Both are required for the property to use the system.
+          </div>
+
+          <form method="POST" action="/add-property">
+            <div class="activate-grid">
+              <div class="field">
+                <label>Business Name</label>
+                <input name="business_name" required>
+              </div>
+              <div class="field">
+                <label>Email</label>
+                <input name="email" type="email" required>
+              </div>
+              <div class="field street">
+                <label>Street</label>
+                <input name="street" required>
+              </div>
+              <div class="field">
+                <label>City</label>
+                <input name="city" required>
+              </div>
+              <div class="field" style="max-width:110px;">
+                <label>State</label>
+                <input name="state" required>
+              </div>
+              <div class="field" style="max-width:130px;">
+                <label>ZIP</label>
+                <input name="zip" required>
+              </div>
+              <div class="field" style="flex:0 0 auto;min-width:auto;">
+                <button class="btn" type="submit">Continue to Payment</button>
+              </div>
+            </div>
+          </form>
+        </div>
+      </body>
+    </html>
+    """)
+
+@bp.route("/buy")
+def buy():
+    sku = (request.args.get("sku") or session.get("product_sku") or "FIRST_PROPERTY").strip()
+    if sku not in PRODUCTS:
+        abort(400, f"Unknown product sku: {sku}")
+
+    session["product_sku"] = sku
+    product = PRODUCTS.get(sku)
+    if not product:
+        abort(500, f"{sku} product is missing.")
+
+    if not session.get("licensed_location"):
+        return redirect("/activate")
+
+    if sku in ("FIRST_PROPERTY", "ADDITIONAL_PROPERTY") and request.args.get("confirm") != "1":
+        loc = session.get("licensed_location", {}) or {}
+        return render_template_string("""
+        <!doctype html>
+        <html>
+          <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1">
+            <title>Review Before Payment</title>
+            <style>
+              body{font-family:Arial,sans-serif;max-width:900px;margin:40px auto;padding:0 16px;background:#f6f7fb}
+              .card{background:#fff;border:2px solid #111;border-radius:16px;padding:24px}
+              .note{background:#f2f4f8;border-left:5px solid #111;padding:14px;border-radius:10px;margin:16px 0 22px;line-height:1.6}
+              .mini{margin:10px 0;padding:12px;border:1px solid #ddd;border-radius:12px;background:#fafafa}
+              .btn{display:inline-block;padding:14px 18px;border:2px solid #111;border-radius:12px;background:#111;color:#fff;text-decoration:none;font-weight:bold}
+              .btn.alt{background:#fff;color:#111}
+            </style>
+          </head>
+          <body>
+            <div class="card">
+              <h1>Review Before Payment</h1>
+
+              <div class="note">
+                <strong>Important:</strong> This system is sold as two required parts together:
+                <br>1. One-time Property Access
+                <br>2. Active Monthly Plan
+                <br><br>
+                Neither part is sold separately. Completing this payment is only the first part.
+                The monthly plan is also required for full system access.
+              </div>
+
+              <div class="mini"><strong>Selected product:</strong> {{ product_label }}</div>
+              <div class="mini"><strong>Price now:</strong> ${{ product_price }}</div>
+              <div class="mini"><strong>Property:</strong> {{ street }}, {{ city }}, {{ state }} {{ zip }}</div>
+
+              <div style="margin-top:20px;display:flex;gap:12px;flex-wrap:wrap;">
+                <a class="btn" href="/buy?sku={{ sku }}&confirm=1">Continue to First Payment</a>
+                <a class="btn alt" href="/">Go Back</a>
+              </div>
+            </div>
+          </body>
+        </html>
+        """,
+        sku=sku,
+        product_label=product.get("label", sku),
+        product_price=product.get("price", ""),
+        street=loc.get("street", ""),
+        city=loc.get("city", ""),
+        state=loc.get("state", ""),
+        zip=loc.get("zip", ""))
+    access_token = get_paypal_access_token()
+
+    from urllib.parse import urlencode
+    loc = session.get("licensed_location", {}) or {}
+    return_params = urlencode({
+        "email": loc.get("email", ""),
+        "business_name": loc.get("business_name", ""),
+        "street": loc.get("street", ""),
+        "city": loc.get("city", ""),
+        "state": loc.get("state", ""),
+        "zip": loc.get("zip", ""),
+    })
+
+    if product.get("kind") == "subscription":
+        if sku == "PROPERTY_MONTHLY" and not session.get("pending_required_monthly_for"):
+            return render_template_string("""
+            <!doctype html>
+            <html>
+              <head>
+                <meta charset="utf-8">
+                <meta name="viewport" content="width=device-width, initial-scale=1">
+                <title>Monthly Subscription Required</title>
+                <style>
+                  body { font-family: Arial, sans-serif; background:#f7f7f7; padding:40px; }
+                  .card { max-width:700px; margin:0 auto; background:#fff; border:1px solid #ddd; border-radius:16px; padding:28px; }
+                  h1 { margin-top:0; }
+                  .btn {
+                    display:inline-block; margin-top:14px; padding:12px 18px; border-radius:12px;
+                    background:#111; color:#fff; text-decoration:none; font-weight:700;
+                  }
+                  .note { color:#444; line-height:1.6; }
+                </style>
+              </head>
+              <body>
+                <div class="card">
+                  <h1>Two required parts for activation</h1>
+                  <p class="note">Activation includes two required parts: a one-time Property Access purchase and an active Monthly Plan. Neither is sold separately. Both are required for access.</p>
+                  <a class="btn" href="/activate">Start Activation</a>
+                </div>
+              </body>
+            </html>
+            """)
+
+        if not product.get("plan_id"):
+            abort(500, f"Missing PayPal plan_id for {sku}.")
+
+        return_url = request.host_url.rstrip("/") + "/subscribe-success"
+        if return_params:
+            return_url = return_url + "?" + return_params
+        cancel_url = request.host_url.rstrip("/") + "/cancel"
+
+        sub_data = {
+            "plan_id": product["plan_id"],
+            "custom_id": sku,
+            "application_context": {
+                "brand_name": "NILPF",
+                "user_action": "SUBSCRIBE_NOW",
+                "return_url": return_url,
+                "cancel_url": cancel_url,
+            }
+        }
+
+        resp = paypal_post(
+            "create_subscription",
+            "/v1/billing/subscriptions",
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/json",
+            },
+            json=sub_data,
+            timeout=30,
+        )
+        resp.raise_for_status()
+        sub = resp.json()
+
+        for link in sub.get("links", []):
+            if link.get("rel") == "approve":
+                return redirect(link["href"])
+
+        abort(500, "No PayPal subscription approval link found")
+
+    return_url = request.host_url.rstrip("/") + "/success"
+    if return_params:
+        return_url = return_url + "?" + return_params
+    cancel_url = request.host_url.rstrip("/") + "/cancel"
+
+    order_data = {
+        "intent": "CAPTURE",
+        "purchase_units": [
+            {
+                "amount": {"currency_code": "USD", "value": product["price"]},
+                "custom_id": sku,
+                "description": product.get("label", sku),
+            }
+        ],
+        "application_context": {
+            "return_url": return_url,
+            "cancel_url": cancel_url,
+        },
+    }
+
+    resp = paypal_post(
+        "create_order",
+        "/v2/checkout/orders",
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+        },
+        json=order_data,
+        timeout=30,
+    )
+    resp.raise_for_status()
+    order = resp.json()
+
+    for link in order.get("links", []):
+        if link.get("rel") == "approve":
+            return redirect(link["href"])
+
+    abort(500, "No PayPal approval link found")
+
+@bp.route("/success")
+def success():
+    order_id = request.args.get("token")
+    if not order_id:
+        abort(400, "Missing PayPal order token.")
+
+    access_token = get_paypal_access_token()
+    capture_resp = paypal_post(
+        "capture_order",
+        f"/v2/checkout/orders/{order_id}/capture",
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+        },
+        timeout=30,
+    )
+    capture_resp.raise_for_status()
+    capture_data = capture_resp.json()
+
+    if capture_data.get("status") != "COMPLETED":
+        abort(400, "Payment not completed.")
+
+    location = session.get("licensed_location") or {
+        "email": request.args.get("email", ""),
+        "business_name": request.args.get("business_name", ""),
+        "street": request.args.get("street", ""),
+        "city": request.args.get("city", ""),
+        "state": request.args.get("state", ""),
+        "zip": request.args.get("zip", ""),
+    }
+    if not location.get("street") or not location.get("city") or not location.get("state"):
+        abort(400, "Missing licensed location in session and return data.")
+
+    full_address = f"{location['street']}, {location['city']}, {location['state']} {location.get('zip','')}".strip()
+
+    purchase_unit = (capture_data.get("purchase_units") or [{}])[0]
+    custom_id = purchase_unit.get("custom_id") or session.get("product_sku") or "FIRST_PROPERTY"
+    payments = purchase_unit.get("payments") or {}
+    captures = payments.get("captures") or []
+    capture = captures[0] if captures else {}
+
+    capture_id = capture.get("id") or order_id
+    amount_info = capture.get("amount") or {}
+    price_paid = amount_info.get("value") or ""
+
+    upsert_license(
+        order_id,
+        location.get("email"),
+        location.get("business_name"),
+        full_address,
+        location.get("state"),
+        custom_id,
+        capture_id,
+        price_paid,
+    )
+
+    session["licensed_session_id"] = order_id
+    session["licensed_location"] = {
+        "email": location.get("email", ""),
+        "business_name": location.get("business_name", ""),
+        "street": location.get("street", ""),
+        "city": location.get("city", ""),
+        "state": location.get("state", ""),
+        "zip": location.get("zip", ""),
+    }
+    session["product_sku"] = custom_id
+
+    if custom_id in ("FIRST_PROPERTY", "ADDITIONAL_PROPERTY"):
+        session["pending_required_monthly_for"] = custom_id
+        return redirect("/buy?sku=PROPERTY_MONTHLY")
+
+    return redirect(f"/documents?session_id={order_id}")
+
+@bp.route("/subscribe-success")
+def subscribe_success():
+    subscription_id = request.args.get("subscription_id") or request.args.get("token")
+    if not subscription_id:
+        abort(400, "Missing PayPal subscription id.")
+
+    sku = session.get("product_sku") or "PROPERTY_MONTHLY"
+    product = PRODUCTS.get(sku) or PRODUCTS.get("PROPERTY_MONTHLY") or {}
+
+    location = session.get("licensed_location") or {
+        "email": request.args.get("email", ""),
+        "business_name": request.args.get("business_name", ""),
+        "street": request.args.get("street", ""),
+        "city": request.args.get("city", ""),
+        "state": request.args.get("state", ""),
+        "zip": request.args.get("zip", ""),
+    }
+    if not location.get("street") or not location.get("city") or not location.get("state"):
+        abort(400, "Missing licensed location in session and return data.")
+
+    full_address = f"{location['street']}, {location['city']}, {location['state']} {location.get('zip','')}".strip()
+
+    upsert_license(
+        subscription_id,
+        location.get("email"),
+        location.get("business_name"),
+        full_address,
+        location.get("state"),
+        sku,
+        subscription_id,
+        product.get("price", ""),
+    )
+
+    parent_sku = session.pop("pending_required_monthly_for", None)
+
+    session["licensed_session_id"] = subscription_id
+    session["licensed_location"] = {
+        "email": location.get("email", ""),
+        "business_name": location.get("business_name", ""),
+        "street": location.get("street", ""),
+        "city": location.get("city", ""),
+        "state": location.get("state", ""),
+        "zip": location.get("zip", ""),
+    }
+    session["product_sku"] = parent_sku or sku
+    return redirect(f"/documents?session_id={subscription_id}")
+
+@bp.route("/cancel")
+def cancel():
+    return redirect("/activate")
+
+@bp.route("/documents")
+def documents():
+    # SaaS access gate
+    session_id = session.get("licensed_session_id") or request.args.get("session_id") or session.get("licensed_session_id") or request.args.get("session_id")
+    if not session_id:
+        return redirect("/")
+
+    session["licensed_session_id"] = session_id
+
+    lic = get_license_by_session(session_id)
+    if not lic:
+        abort(404, "License not found.")
+
+    session["licensed_session_id"] = session_id
+
+    payer_email, payer_name, prop_addr, prop_state, license_key, created_at, product_sku = lic
+    active_tab = request.args.get("tab", "dashboard")
+
+    return render_template_string("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>NILPF Operational Framework</title>
+        <style>
+          * { box-sizing: border-box; }
+          body {
+            margin: 0;
+            font-family: Arial, sans-serif;
+            background: #f4f6f8;
+            color: #111;
+          }
+          .topbar {
+            background: #111;
+            color: #fff;
+            padding: 18px 20px;
+          }
+          .topbar h1 {
+            margin: 0;
+            font-size: 24px;
+          }
+          .topbar p {
+            margin: 6px 0 0;
+            font-size: 14px;
+            color: #ddd;
+          }
+          .layout {
+            display: grid;
+            grid-template-columns: 1fr;
+            min-height: calc(100vh - 82px);
+          }
+          .sidebar {
+            background: #fff;
+            border-right: 1px solid #ddd;
+            padding: 18px 14px;
+          }
+          .tablink {
+            display: block;
+            width: 100%;
+            text-decoration: none;
+            color: #111;
+            background: #fff;
+            border: 2px solid #111;
+            border-radius: 12px;
+            padding: 12px 14px;
+            margin: 0 0 12px 0;
+            font-weight: 700;
+          }
+          .tablink.active {
+            background: #111;
+            color: #fff;
+          }
+          .main {
+            padding: 22px;
+          }
+          .card {
+            background: #fff;
+            border: 2px solid #111;
+            border-radius: 18px;
+            padding: 18px;
+            margin-bottom: 18px;
+          }
+          .grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
+            gap: 14px;
+          }
+          .mini {
+            background: #fafafa;
+            border: 1px solid #ddd;
+            border-radius: 14px;
+            padding: 14px;
+          }
+          .mini h3 {
+            margin: 0 0 8px 0;
+            font-size: 16px;
+          }
+          .viewer {
+            width: 100%;
+            height: 78vh;
+            border: 1px solid #ccc;
+            border-radius: 14px;
+            background: #fff;
+          }
+          .note {
+            font-size: 14px;
+            color: #444;
+          }
+          .btnrow a {
+            display: inline-block;
+            text-decoration: none;
+            color: #111;
+            border: 2px solid #111;
+            border-radius: 12px;
+            padding: 10px 14px;
+            margin: 8px 10px 0 0;
+            font-weight: 700;
+            background: #fff;
+          }
+          @media (max-width: 900px) {
+            .layout { grid-template-columns: 1fr; }
+            .sidebar { border-right: 0; border-bottom: 1px solid #ddd; }
+          }
+        </style>
+      </head>
+      <body>
+
+<style>
+.home-icon{
+    position:fixed;
+    top:60px;
+    right:22px;
+    font-size:22px;
+    text-decoration:none;
+    color:#111;
+    font-weight:600;
+}
+.home-icon:hover{
+    text-decoration:underline;
+}
+</style>
+
+
+<div style="background:#111;color:#fff;padding:10px;">
+
+<a href="/documents?tab=dashboard" style="color:#fff;margin-right:20px;">Dashboard</a>
+<a href="/participants" style="color:#fff;margin-right:20px;">Add / View Participants</a>
+<a href="/notes" style="color:#fff;">Incident / Status Documentation</a>
+</div>
+
+      <div class="box">
+        <div class="topbar">
+          <h1>Operational Framework</h1>
+          <p>{{ prop_addr }} · License Key {{ license_key }}</p>
+
+
+        </div>
+
+        <div style="padding:18px 20px 0 20px;">
+  <a href="/form-builder" style="display:inline-block;padding:10px 16px;background:#111;color:#fff;text-decoration:none;border-radius:10px;font-weight:bold;">⬅ Return to Form Builder</a>
+</div>
+<div class="layout">
+          <main class="main">
+            {% if active_tab == 'dashboard' %}
+              <div class="card">
+                <h2>Dashboard</h2>
+                <div class="grid">
+                  <div class="mini">
+                    <h3>Licensed Address</h3>
+                    <div>{{ prop_addr }}</div>
+                  </div>
+                  <div class="mini">
+                    <h3>License Key</h3>
+                    <div>{{ license_key }}</div>
+                  </div>
+                  <div class="mini">
+                    <h3>Buyer</h3>
+                    <div>{{ payer_name or 'N/A' }}</div>
+                    <div style="margin-top:10px;">
+                      <a class="btn" href="/product?sku=ADDITIONAL_PROPERTY">Add Another Property</a>
+                    </div>
+                  </div>
+                  <div class="mini">
+                    <h3>Email</h3>
+                    <div>{{ payer_email or 'N/A' }}</div>
+                  </div>
+                </div>
+                <p class="note">This is now the NILPF web app workspace. Use the tabs on the left to open the correct section inside the app.</p>
+              </div>
+            {% elif active_tab == 'participants' %}
+              <div class="card">
+                <h2>Add / View Participants</h2>
+                <p class="note">Create and manage participant ENTRY records here. This area controls ENTRY SCREENING, participant notes, and completion tracking.</p>
+                <div class="btnrow" style="margin-bottom:12px;gap:8px;flex-wrap:wrap;">
+                  
+                </div>
+              </div>
+
+              <div class="card">
+                <h3>Participant Forms</h3>
+                <p class="note">Open each section below to work through participant ENTRY and ongoing documentation without leaving the workspace.</p>
+
+                <details style="margin-top:12px;">
+                  <summary style="cursor:pointer; font-weight:700;">ENTRY</summary>
+                  <div style="padding:10px 0 0 14px;">
+                    <p><a class="btn" href="/static/documents/18_Entry_Screening_v2.2.pdf" target="participant_viewer">ENTRY SCREENING</a></p>
+                  </div>
+                </details>
+
+                <details style="margin-top:12px;">
+                  <summary style="cursor:pointer; font-weight:700;">RIGHTS AND RESPONSIBILITIES</summary>
+                  <div style="padding:10px 0 0 14px;">
+                    <p><a class="btn" href="/static/documents/Member_Bill_of_Dignity_Independence_v2.1.pdf" target="participant_viewer">Member Bill of Rights</a></p>
+                    <p><a class="btn" href="/static/documents/16_Participant_Financial_Responsibility_Agreement.pdf" target="participant_viewer">Participant Financial Responsibility Agreement</a></p>
+                    <p><a class="btn" href="/static/documents/15_IMPORTANT_NOTICE_AND_DISCLAIMER_v2.1.pdf" target="participant_viewer">Important Notice & Disclaimer</a></p>
+                    <p><a class="btn" href="/static/documents/13-Communication_and_Consent_Form.pdf" target="participant_viewer">Communication and Consent</a></p>
+                  </div>
+                </details>
+
+                <details style="margin-top:12px;">
+                  <summary style="cursor:pointer; font-weight:700;">MOVEMENT AND PROPERTY</summary>
+                  <div style="padding:10px 0 0 14px;">
+                    <p><a class="btn" href="/static/documents/12-Transfer_Form.pdf" target="participant_viewer">Transfer Form</a></p>
+                    <p><a class="btn" href="/static/documents/11-Vehicle_Parking_Information_Form.pdf" target="participant_viewer">Vehicle Form</a></p>
+                    <p><a class="btn" href="/static/documents/10-Pet_Animal_Information_Sheet.pdf" target="participant_viewer">Pet Form</a></p>
+                  </div>
+                </details>
+
+                <details style="margin-top:12px;">
+                  <summary style="cursor:pointer; font-weight:700;">NOTES</summary>
+                  <div style="padding:10px 0 0 14px;">
+                    <p><a class="btn" href="/participants">Notes and Irregularities</a></p>
+                  </div>
+                </details>
+
+                <iframe class="viewer" name="participant_viewer" src="/static/documents/18_Entry_Screening_v2.2.pdf" style="margin-top:16px;"></iframe>
+              </div>
+                        {% elif active_tab == 'operational' %}
+              <div class="card">
+                <h2>Operational Framework</h2>
+                <p class="note">Open a form directly in the browser. This layout is organized for first-time users.</p>
+
+                {% for group_name, items in framework_groups.items() %}
+                  <div style="margin-top:20px;">
+                    <h3>{{ group_name }}</h3>
+                    <ul style="line-height:1.9;">
+                      {% for label, filename in items %}
+                        <li><a href="/static/documents/{{ filename }}" >{{ label }}</a></li>
+                      {% endfor %}
+                    </ul>
+                  </div>
+                {% endfor %}
+              </div>
+            
+              <div class="card">
+                <h2>Master Lease</h2>
+                <p class="note">Master Lease opens inside the workspace below.</p>
+                <iframe class="viewer" src="/static/documents/Master_Lease_v2.1.pdf"></iframe>
+              </div>
+            {% endif %}
+          </main>
+        </div>
+      
+
+
+
+
+
+<!-- Dignity Idle Screen -->
+<div id="dignityScreen" onclick="hideDignityScreen()" style="
+display:none;
+position:fixed;
+inset:0;
+background:rgba(17,17,17,.96);
+color:#fff;
+z-index:99999;
+align-items:center;
+justify-content:center;
+text-align:center;
+padding:30px;
+font-family:Arial,sans-serif;
+">
+  <div>
+    <div style="font-size:34px;font-weight:700;margin-bottom:14px;">Dignity & Privacy Protected</div>
+    <div style="font-size:18px;max-width:700px;line-height:1.5;">
+      Participant information has been hidden due to inactivity.
+      Tap or click anywhere to continue.
+    </div>
+  </div>
+</div>
+
+<style>
+.home-icon{
+    position:fixed;
+    top:60px;
+    right:22px;
+    font-size:22px;
+    text-decoration:none;
+    color:#111;
+    font-weight:600;
+}
+.home-icon:hover{
+    text-decoration:underline;
+}
+</style>
+
+<a href="/home" class="home-icon">🏠</a>
+
+<script>
+let idleTimer;
+let logoutTimer;
+const idleTimeLimit = 60000;
+const logoutTimeLimit = 300000;
+
+function resetIdleTimer() {
+    clearTimeout(idleTimer);
+    clearTimeout(logoutTimer);
+    idleTimer = setTimeout(showDignityScreen, idleTimeLimit);
+    logoutTimer = setTimeout(() => { window.location = "/logout"; }, logoutTimeLimit);
+}
+
+function showDignityScreen() {
+    const el = document.getElementById("dignityScreen");
+    if (el) el.style.display = "flex";
+    fetch('/log-dignity-screen', {method:'POST'});
+}
+
+function hideDignityScreen() {
+    const el = document.getElementById("dignityScreen");
+    if (el) el.style.display = "none";
+    resetIdleTimer();
+}
+
+window.addEventListener("load", resetIdleTimer);
+document.addEventListener("mousemove", resetIdleTimer);
+document.addEventListener("keypress", resetIdleTimer);
+document.addEventListener("click", resetIdleTimer);
+document.addEventListener("touchstart", resetIdleTimer);
+</script>
+
+      </body>
+    </html>
+    """,
+    active_tab=active_tab,
+    prop_addr=prop_addr,
+    license_key=license_key,
+    payer_name=payer_name,
+    payer_email=payer_email,
+    framework_groups=framework_groups
+    )
+
+
+# Source candidates per stamped document: the licensee's state copy in the doc
+# store first, then the shared source trees / static/documents.
+STAMPED_SOURCES = {
+    "mla": ("Master_License_AGREEMENT.pdf", "MASTER_LICENSE_AGREEMENT_MLA_v2.1.pdf"),
+    "master-lease": ("Master_Lease_v2.1.pdf", "Master_Lease_v2.1.pdf"),
+}
+
+def send_stamped_document(doc: str, download_name: str):
+    session_id = session.get("licensed_session_id") or request.args.get("session_id")
+    if not session_id:
+        return redirect("/")
+
+    session["licensed_session_id"] = session_id
+
+    lic = get_license_by_session(session_id)
+    if not lic:
+        abort(404, "License not found.")
+
+    state_name, source_name = STAMPED_SOURCES[doc]
+    sha, source = DOC_STORE.resolve(lic[3], state_name)
+    if not source or not source.exists():
+        source = SOURCE_PDFS.resolve_any(source_name)
+        if not source:
+            abort(404)
+        sha = file_digest(source)
+
+    fields = license_fields(lic)
+    path = STAMPS.get(session_id, doc, fields, sha, stamp_pdf(source, fields))
+    return send_pdf(path, download_name, as_attachment=False)
+
+
+@bp.route("/documents/master-lease.pdf")
+def stamped_master_lease():
+    return send_stamped_document("master-lease", "Master_Lease.pdf")
+
+
+@bp.route("/documents/master-license-agreement.pdf")
+def stamped_master_license_agreement():
+    return send_stamped_document("mla", "Master_License_Agreement.pdf")
+
+
+# -------------------------
+# Electronic Documents (ML / MLA)
+# -------------------------
+
+
+@bp.route("/logout")
+def logout():
+    session.clear()
+    return redirect("/")
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """An empty working directory; the app's relative paths (licenses.db, EF_v2.2, ...) resolve inside it."""
+    from registries import SOURCE_PDFS
+
+    monkeypatch.chdir(tmp_path)
+    SOURCE_PDFS.invalidate()
+    yield tmp_path
+    SOURCE_PDFS.invalidate()
+
+
+@pytest.fixture
+def client(workdir):
+    from app import create_app
+
+    app = create_app()
+    # send_file() resolves relative paths against root_path, which is the cwd in production.
+    app.root_path = str(workdir)
+    return app.test_client()
@@ -0,0 +1,97 @@
+import os
+import sqlite3
+from io import BytesIO
+
+from lazy_imports import PdfReader, PdfWriter, canvas
+
+from acroform_fill import fill_acroform, has_acroform, plan_fill, scan_widgets
+from benchmarks.seed import SCHEMA
+
+
+def _pdf(path, with_field=True, radio=False, name="legal_name"):
+    c = canvas.Canvas(str(path), pagesize=(612, 792))
+    c.drawString(72, 700, "Legal name")
+    if with_field:
+        c.acroForm.textfield(name=name, x=200, y=690, width=240, height=18)
+    if radio:
+        for i, option in enumerate(("Option A", "Option B")):
+            c.acroForm.radio(name="choice", value=option, selected=False, x=200 + i * 60, y=640, size=14)
+    c.showPage()
+    c.save()
+
+
+def _widgets(path):
+    return scan_widgets(PdfWriter(clone_from=PdfReader(str(path))))
+
+
+def test_has_acroform_follows_the_file(tmp_path):
+    path = tmp_path / "form.pdf"
+    _pdf(path, with_field=False)
+    assert not has_acroform(path)
+
+    _pdf(path, with_field=True)
+    os.utime(path, ns=(1, 1))
+    assert has_acroform(path)
+
+
+def test_named_field_is_filled_with_an_appearance(tmp_path):
+    path = tmp_path / "form.pdf"
+    _pdf(path)
+
+    writer, overlay = fill_acroform(PdfReader(str(path)), {"legal_name": "Ada Lovelace"}, {}, [])
+    assert overlay == []
+    field = writer.get_fields()["legal_name"]
+    assert field["/V"] == "Ada Lovelace"
+    # Viewers that ignore NeedAppearances draw /AP /N, so it must hold the value.
+    widget = writer.pages[0]["/Annots"][0].get_object()
+    assert b"Ada Lovelace" in widget["/AP"]["/N"].get_object().get_data()
+
+
+def test_radio_group_selects_only_the_matching_option(tmp_path):
+    path = tmp_path / "form.pdf"
+    _pdf(path, with_field=False, radio=True)
+
+    writer, _ = fill_acroform(PdfReader(str(path)), {"choice": "Option B"}, {}, [])
+    kids = [a.get_object() for a in writer.pages[0]["/Annots"]]
+    assert [kid["/AS"] for kid in kids] == ["/Off", "/Option B"]
+    assert kids[0]["/Parent"].get_object()["/V"] == "/Option B"
+
+
+def test_plan_fill_matches_by_position_then_name(tmp_path):
+    path = tmp_path / "form.pdf"
+    _pdf(path, name="field_1")
+    widgets = _widgets(path)
+    (w,) = widgets
+    on_widget = {"page": 1, "type": "text", "field_name": "preferred_name",
+                 "x": (w["x0"] + w["x1"]) / 2, "y": (w["y0"] + w["y1"]) / 2}
+    off_widget = {"page": 1, "type": "text", "field_name": "phone", "x": 0.1, "y": 0.9}
+    signature = {"page": 1, "type": "signature", "field_name": "signature_data", "x": w["x0"], "y": w["y0"]}
+
+    assigned, leftover = plan_fill(widgets, {}, {}, [on_widget, off_widget, signature])
+    assert assigned == {"field_1": ("preferred_name", "legal_name")}
+    assert leftover == [off_widget, signature]
+
+    # With no layout, the widget name is matched against the form definition's labels.
+    form_def = {"fields": [{"name": "phone", "label": "Field 1"}]}
+    assigned, leftover = plan_fill(widgets, {}, form_def, [])
+    assert assigned == {"field_1": ("phone",)}
+    assert leftover == []
+
+
+def test_print_fills_an_acroform_source_from_ef(client, workdir):
+    conn = sqlite3.connect(workdir / "licenses.db")
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO participants (id, legal_name, created_at) VALUES (1, 'Ada Lovelace', '2026-01-01')")
+    conn.execute(
+        "INSERT INTO participant_form_data (participant_id, form_name, field_name, field_value, updated_at) "
+        "VALUES ('1', '7_Emergency_Contact_Form.pdf', 'primary_contact_name', 'Charles Babbage', '2026-01-01')"
+    )
+    conn.commit()
+    conn.close()
+    (workdir / "EF_v2.2").mkdir()
+    _pdf(workdir / "EF_v2.2" / "7_Emergency_Contact_Form.pdf", name="primary_contact_name")
+
+    resp = client.get("/participant-form-print/1/7_Emergency_Contact_Form.pdf")
+    assert resp.status_code == 200
+    fields = PdfReader(BytesIO(resp.get_data())).get_fields()
+    assert fields["primary_contact_name"]["/V"] == "Charles Babbage"
@@ -0,0 +1,24 @@
+from lazy_imports import canvas
+
+from doc_search import index_documents
+
+
+def test_unreadable_files_are_counted_as_skipped(tmp_path):
+    root = tmp_path / "EF_v2.2"
+    root.mkdir()
+    c = canvas.Canvas(str(root / "house_rules.pdf"))
+    c.drawString(72, 720, "Quiet hours start at ten.")
+    c.showPage()
+    c.save()
+    (root / "broken.pdf").write_bytes(b"not a pdf")
+    db = tmp_path / "licenses.db"
+
+    logged = []
+    counts = index_documents(db, roots=[root], log=logged.append)
+    assert counts == {"indexed": 1, "unchanged": 0, "removed": 0, "skipped": 1}
+    assert any("broken.pdf" in line for line in logged)
+
+    # The broken file is retried, and still not reported as unchanged.
+    assert index_documents(db, roots=[root], log=logged.append) == {
+        "indexed": 0, "unchanged": 1, "removed": 0, "skipped": 1,
+    }
@@ -0,0 +1,24 @@
+import pytest
+
+from event_log import EventLog
+
+
+def test_failed_write_is_retried_not_dropped(tmp_path):
+    path = tmp_path / "logs" / "events.txt"
+    # Fewer lines than batch_size and a long interval: only the explicit flushes write.
+    events = EventLog(str(path), capacity=5, batch_size=5, flush_interval=60)
+    for i in range(3):
+        events.log(f"event {i}")
+
+    with pytest.raises(OSError):
+        events.flush()
+    events.log("event 3")
+    with pytest.raises(OSError):
+        events.flush()
+    assert events.stats()["pending"] == 4
+    assert events.stats()["dropped"] == 0
+
+    path.parent.mkdir()
+    events.close()
+    assert path.read_text(encoding="utf-8").splitlines() == [f"event {i}" for i in range(4)]
+    assert events.stats()["written"] == 4
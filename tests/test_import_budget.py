@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+from lazy_imports import HEAVY, IMPORT_BUDGET_MS, import_times
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_app_within_budget():
+    # Best of three: one slow run on a busy machine shouldn't fail the build.
+    runs = [import_times("app") for _ in range(3)]
+    best_ms = min(next(us for name, _, us in rows if name == "app") for rows in runs) / 1000
+    assert best_ms <= IMPORT_BUDGET_MS, f"import app took {best_ms:.1f} ms, budget {IMPORT_BUDGET_MS:.0f} ms"
+
+
+def test_import_app_skips_heavy_packages():
+    imported = {name.strip().split(".")[0] for name, _, _ in import_times("app")}
+    assert not imported & set(HEAVY), f"imported at startup: {sorted(imported & set(HEAVY))}"
+
+
+def test_import_app_writes_nothing(tmp_path):
+    # The schema and the registries wait for preload(), so a bare import leaves the cwd alone.
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, PYTHONDONTWRITEBYTECODE="1")
+    subprocess.run([sys.executable, "-c", "import app"], cwd=tmp_path, env=env, check=True)
+    assert list(tmp_path.iterdir()) == []
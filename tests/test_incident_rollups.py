@@ -0,0 +1,51 @@
+import sqlite3
+
+from benchmarks.seed import SCHEMA
+from incident_rollups import backfill, ensure_rollup_schema
+
+
+def _rollups(conn):
+    return (
+        sorted(conn.execute("SELECT day, participant_id, incident_type, count FROM incident_rollups WHERE count > 0")),
+        sorted(conn.execute("SELECT day, incident_type, count FROM incident_daily_counts WHERE count > 0")),
+    )
+
+
+def _aggregate(conn):
+    return (
+        sorted(conn.execute("""
+            SELECT substr(created_at, 1, 10), COALESCE(participant_id, ''), COALESCE(incident_type, ''), COUNT(*)
+            FROM participant_notes GROUP BY 1, 2, 3
+        """)),
+        sorted(conn.execute("""
+            SELECT substr(created_at, 1, 10), COALESCE(incident_type, ''), COUNT(*)
+            FROM participant_notes GROUP BY 1, 2
+        """)),
+    )
+
+
+def test_triggers_and_backfill_match_a_group_by():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    ensure_rollup_schema(conn)
+    conn.executemany(
+        "INSERT INTO participant_notes (participant_name, note_text, created_at, participant_id, incident_type) "
+        "VALUES ('Ada', 'note', ?, ?, ?)",
+        [
+            ("2026-01-05 09:00:00", "1", "Fall / Found Down"),
+            ("2026-01-05 17:30:00", "1", "Fall / Found Down"),
+            ("2026-01-05 18:00:00", "2", "General Status"),
+            ("2026-01-06 08:00:00", "2", None),
+            ("2026-01-07 08:00:00", None, "Verbal Conflict"),
+        ],
+    )
+    assert _rollups(conn) == _aggregate(conn)
+
+    conn.execute("UPDATE participant_notes SET incident_type = 'Verbal Conflict' WHERE id = 1")
+    conn.execute("UPDATE participant_notes SET created_at = '2026-01-08 10:00:00', participant_id = '3' WHERE id = 3")
+    conn.execute("UPDATE participant_notes SET note_text = 'edited' WHERE id = 2")
+    conn.execute("DELETE FROM participant_notes WHERE id IN (4, 5)")
+    assert _rollups(conn) == _aggregate(conn)
+
+    backfill(conn)
+    assert _rollups(conn) == _aggregate(conn)
@@ -0,0 +1,27 @@
+from form_identity import candidate_form_keys
+from layout_registry import LayoutRegistry
+
+
+def test_get_returns_a_copy(tmp_path):
+    registry = LayoutRegistry(tmp_path, candidate_form_keys)
+    registry.save("7_Emergency_Contact_Form.pdf", [{"page": 1, "type": "text", "field_name": "legal_name", "x": 0.1, "y": 0.2}])
+
+    fields = registry.get("7_Emergency_Contact_Form.pdf")
+    fields[0]["x"] = 0.9
+    fields.append({})
+
+    again = registry.get("7_Emergency_Contact_Form.pdf")
+    assert len(again) == 1
+    assert again[0]["x"] == 0.1
+
+
+def test_rebuild_swaps_layouts_and_index_together(tmp_path):
+    registry = LayoutRegistry(tmp_path, candidate_form_keys)
+    registry.save("a.pdf", [{"field_name": "one"}])
+    before = registry._current()
+    registry.save("b.pdf", [{"field_name": "two"}])
+    layouts, index = registry._current()
+
+    assert (layouts, index) != before
+    assert all(stem in layouts for stem in index.values())
+    assert registry.get("b.pdf")[0]["field_name"] == "two"
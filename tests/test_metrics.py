@@ -0,0 +1,43 @@
+import json
+import socket
+import subprocess
+import sys
+import time
+
+import metrics
+from metrics import RETIRED, Registry
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_exited_workers_fold_into_retired(tmp_path):
+    registry = Registry(tmp_path / "metrics.db")
+    registry.enable()
+    stale = time.time() - metrics.RETIRE_AFTER - 1
+    conn = registry._connect()
+    with conn:
+        for run in range(2):
+            worker = f"{socket.gethostname()}:{_dead_pid()}:{run}"
+            conn.executemany(
+                "INSERT INTO metric_series (worker, name, labels, value, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (worker, "nilpf_sqlite_locked_total", "[]", json.dumps(2), stale),
+                    (worker, "nilpf_pdf_duration_seconds", "[]", json.dumps([1] + [0] * 11 + [0.5]), stale),
+                ],
+            )
+    conn.close()
+    registry.inc("nilpf_sqlite_locked_total")
+
+    totals = registry.collect()
+    assert totals[("nilpf_sqlite_locked_total", ())] == 5
+    assert totals[("nilpf_pdf_duration_seconds", ())][0] == 2
+
+    conn = registry._connect()
+    workers = {row[0] for row in conn.execute("SELECT worker FROM metric_series")}
+    conn.close()
+    assert workers == {RETIRED, registry.worker}
+    assert registry.collect() == totals
@@ -0,0 +1,39 @@
+import sqlite3
+
+from benchmarks.seed import SCHEMA
+from notes_store import ensure_notes_schema, query_notes
+
+
+def _walk(conn, limit, **filters) -> list:
+    pages, before_id = [], None
+    while True:
+        page = query_notes(conn, before_id=before_id, limit=limit, **filters)
+        pages.append([row[0] for row in page])
+        before_id = page.next_before_id
+        if before_id is None:
+            return pages
+
+
+def test_pages_do_not_skip_or_repeat_rows_with_equal_timestamps():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    ensure_notes_schema(conn)
+    texts = ["resident had a fall", "routine check", "second fall today", "routine check",
+             "fall near stairs", "routine check", "fall in shower"]
+    # Every note shares one created_at, so only the id can order them.
+    conn.executemany(
+        "INSERT INTO participant_notes (participant_name, staff_name, note_text, created_at, participant_id, incident_type) "
+        "VALUES ('Ada', 'K. Lee', ?, '2026-01-05 09:00:00', '1', 'General Status')",
+        [(t,) for t in texts],
+    )
+    all_ids = [row[0] for row in conn.execute("SELECT id FROM participant_notes ORDER BY id DESC")]
+    fall_ids = [row[0] for row in conn.execute(
+        "SELECT id FROM participant_notes WHERE note_text LIKE '%fall%' ORDER BY id DESC")]
+
+    pages = _walk(conn, limit=4)
+    assert [len(p) for p in pages] == [4, 3]
+    assert sum(pages, []) == all_ids
+
+    pages = _walk(conn, limit=2, q="fall", participant_id="1", date_from="2026-01-05", date_to="2026-01-05")
+    assert [len(p) for p in pages] == [2, 2]
+    assert sum(pages, []) == fall_ids
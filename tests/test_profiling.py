@@ -0,0 +1,11 @@
+import profiling
+
+
+def test_profile_token_is_accepted_only_as_a_header(client, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SECRET", "test-secret")
+    token = profiling.make_token()
+
+    assert client.get("/admin/profiles", query_string={"token": token}).status_code == 404
+    resp = client.get("/admin/profiles", headers={"X-Profile-Token": token})
+    assert resp.status_code == 200
+    assert resp.get_json() == {"profiles": {}}
@@ -0,0 +1,17 @@
+from registries import SOURCE_PDFS
+
+
+def test_ready_does_not_require_pdfs_in_static_documents(client, workdir):
+    for root, name in (("EF_v2.2", "7_Emergency_Contact_Form.pdf"), ("Core-v2.1", "Master_Lease_v2.1.pdf")):
+        (workdir / root).mkdir()
+        (workdir / root / name).write_bytes(b"%PDF-1.4\n%%EOF\n")
+    (workdir / "static" / "documents").mkdir(parents=True)
+    (workdir / "static" / "documents" / "charter.txt").write_text("charter", encoding="utf-8")
+    (workdir / "form_builder_layouts").mkdir()
+    SOURCE_PDFS.invalidate()
+
+    resp = client.get("/ready")
+    check = resp.get_json()["checks"]["source_pdfs"]
+    assert check["status"] == "ok"
+    assert check["pdfs"] == {"EF_v2.2": 1, "Core-v2.1": 1, "static/documents": 0}
+    assert resp.status_code == 200
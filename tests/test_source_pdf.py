@@ -0,0 +1,40 @@
+from pdf_response import file_digest
+from registries import SOURCE_PDFS
+
+PDF_BODY = b"%PDF-1.4\n" + b"0123456789" * 50 + b"\n%%EOF\n"
+
+
+def _write_source(workdir, name="7_Emergency_Contact_Form.pdf"):
+    (workdir / "EF_v2.2").mkdir()
+    (workdir / "EF_v2.2" / name).write_bytes(PDF_BODY)
+    # The app indexed the (then empty) directory when it was created.
+    SOURCE_PDFS.invalidate()
+    return name
+
+
+def test_repeat_open_transfers_no_body(client, workdir):
+    name = _write_source(workdir)
+    url = f"/source-pdf/{name}?v={file_digest(f'EF_v2.2/{name}')[:16]}"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.data == PDF_BODY
+    assert "immutable" in first.headers["Cache-Control"]
+    etag = first.headers["ETag"]
+
+    again = client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+
+def test_range_request_returns_partial_content(client, workdir):
+    name = _write_source(workdir)
+
+    resp = client.get(f"/source-pdf/{name}", headers={"Range": "bytes=0-99"})
+    assert resp.status_code == 206
+    assert resp.data == PDF_BODY[:100]
+    assert resp.headers["Content-Range"] == f"bytes 0-99/{len(PDF_BODY)}"
+
+
+def test_unknown_form_is_404(client, workdir):
+    assert client.get("/source-pdf/missing.pdf").status_code == 404
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+
+from state_bundles import MissingBlobError, StateBundles
+
+
+class _Store:
+    def __init__(self, root):
+        self.root = root
+
+    def state_key(self, state):
+        return "01_Alabama"
+
+    def manifest(self, folder):
+        return {"lease.pdf": "a" * 64, "rules.pdf": "b" * 64}
+
+    def manifest_digest(self, folder):
+        return "d" * 64
+
+    def blob_path(self, sha):
+        # Only the first blob is in the store.
+        return self.root / "lease.pdf" if sha.startswith("a") else None
+
+
+def test_missing_blob_raises_and_writes_no_bundle(tmp_path):
+    (tmp_path / "lease.pdf").write_bytes(b"%PDF-1.4\n%%EOF\n")
+    bundles = StateBundles(_Store(tmp_path), tmp_path / "bundles")
+
+    with pytest.raises(MissingBlobError, match="rules.pdf"):
+        bundles.get("AL")
+    assert [p.name for p in Path(tmp_path / "bundles").glob("*.zip")] == []